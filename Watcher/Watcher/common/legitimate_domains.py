@@ -0,0 +1,86 @@
+import logging
+import threading
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import LegitimateDomain
+
+logger = logging.getLogger('watcher.common')
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def normalize_domain(domain):
+    """
+    Lowercase domain and remove its trailing dot.
+    """
+    return domain.strip().lower().rstrip('.')
+
+
+class LegitimateDomainIndex:
+    """
+    Hashed set of the :model:`common.LegitimateDomain` names.
+    A domain is looked up by testing each of its parent suffixes, so a check costs O(labels) whatever the number of
+    legitimate domains.
+    """
+
+    def __init__(self, domain_names):
+        """
+        :param domain_names: Iterable of legitimate domain names.
+        """
+        self.domains = frozenset(normalize_domain(name) for name in domain_names if name)
+
+    def __len__(self):
+        return len(self.domains)
+
+    def __contains__(self, domain):
+        return normalize_domain(domain) in self.domains
+
+    def get_parent(self, domain):
+        """
+        Return the legitimate domain equal to domain or parent of domain, or None.
+
+        :param domain: Domain to check (Str).
+        """
+        domain = normalize_domain(domain)
+        while domain:
+            if domain in self.domains:
+                return domain
+            _, _, domain = domain.partition('.')
+        return None
+
+
+def get_legitimate_domain_index():
+    """
+    Return the process-wide LegitimateDomainIndex, building it on first use or after a LegitimateDomain change.
+    """
+    global _index
+    index = _index
+    if index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LegitimateDomainIndex(LegitimateDomain.objects.values_list('domain_name', flat=True))
+                logger.debug(f"Legitimate domain index built with {len(_index)} domains")
+            index = _index
+    return index
+
+
+def is_legitimate_domain(domain):
+    """
+    Check if domain or one of its parent domains is in the Legitimate Domains list.
+
+    :param domain: Domain to check (Str).
+    :rtype: bool
+    """
+    return get_legitimate_domain_index().get_parent(domain) is not None
+
+
+@receiver(post_save, sender=LegitimateDomain)
+@receiver(post_delete, sender=LegitimateDomain)
+def invalidate_legitimate_domain_index(sender, **kwargs):
+    """
+    Drop the cached LegitimateDomainIndex when a :model:`common.LegitimateDomain` is created, updated or deleted.
+    """
+    global _index
+    _index = None
@@ -62,6 +62,31 @@ class CoreFunctionsTest(TestCase):
             self.assertGreater(len(ref), 5)
 
 
+class LegitimateDomainIndexTest(TestCase):
+    """Test the legitimate domain suffix lookup."""
+
+    def setUp(self):
+        from common.legitimate_domains import invalidate_legitimate_domain_index
+        invalidate_legitimate_domain_index(sender=None)
+
+    def test_parent_suffix_lookup(self):
+        from common.legitimate_domains import LegitimateDomainIndex
+        index = LegitimateDomainIndex(["corp.com", "Shop.CO.UK"])
+        self.assertEqual(index.get_parent("corp.com"), "corp.com")
+        self.assertEqual(index.get_parent("mail.eu.corp.com."), "corp.com")
+        self.assertEqual(index.get_parent("www.shop.co.uk"), "shop.co.uk")
+        self.assertIsNone(index.get_parent("evilcorp.com"))
+        self.assertIsNone(index.get_parent("co.uk"))
+
+    def test_index_invalidated_on_change(self):
+        from common.legitimate_domains import is_legitimate_domain
+        self.assertFalse(is_legitimate_domain("login.legit-index.com"))
+        domain = LegitimateDomain.objects.create(domain_name="legit-index.com")
+        self.assertTrue(is_legitimate_domain("login.legit-index.com"))
+        domain.delete()
+        self.assertFalse(is_legitimate_domain("login.legit-index.com"))
+
+
 class MISPIntegrationTest(TestCase):
     """Test MISP UUID management functions."""
     
@@ -0,0 +1,82 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton finding every occurrence of a set of patterns in one pass over a text,
+    whatever the number of patterns.
+
+    Patterns and texts can be str or bytes, as long as both are of the same type::
+
+        automaton = AhoCorasick(["paypal", "pal"])
+        list(automaton.iter_matches("paypal-login.com"))  # [(0, 'paypal'), (3, 'pal')]
+    """
+
+    def __init__(self, patterns):
+        """
+        :param patterns: Iterable of str or bytes patterns, empty patterns are ignored.
+        """
+        self.patterns = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto = [dict()]
+        self._fail = [0]
+        self._out = [()]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for symbol in pattern:
+                next_state = self._goto[state].get(symbol)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][symbol] = next_state
+                    self._goto.append(dict())
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (index,)
+
+        # Breadth-first computation of the failure links, outputs of the failure state are merged
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and symbol not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(symbol, 0)
+                self._fail[next_state] = fail if fail != next_state else 0
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def iter_matches(self, text):
+        """
+        Yield (start offset, pattern) for every occurrence of a pattern in text, ordered by end offset.
+
+        :param text: str or bytes, same type as the patterns.
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        state = 0
+        for position, symbol in enumerate(text):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for index in out[state]:
+                yield position - len(patterns[index]) + 1, patterns[index]
+
+    def search(self, text):
+        """
+        Return the first pattern found in text (by end offset), or None.
+
+        :param text: str or bytes, same type as the patterns.
+        """
+        return next((pattern for _, pattern in self.iter_matches(text)), None)
+
+    def matched_patterns(self, text):
+        """
+        Return the set of patterns found in text.
+
+        :param text: str or bytes, same type as the patterns.
+        """
+        return {pattern for _, pattern in self.iter_matches(text)}
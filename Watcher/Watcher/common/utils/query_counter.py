@@ -0,0 +1,35 @@
+import time
+from django.db import connection
+
+
+class QueryCounter:
+    """
+    Context manager counting the SQL queries run on the current thread's default connection and the wall time spent
+    inside the block.
+
+    Works whatever the DEBUG setting, by installing a database execute wrapper::
+
+        with QueryCounter() as counter:
+            focus_on_top(5)
+        logger.info(f"{counter.count} queries in {counter.elapsed:.2f}s")
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+        self._start = None
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed = time.perf_counter() - self._start
+        return self._wrapper.__exit__(exc_type, exc_value, traceback)
@@ -1,8 +1,16 @@
 # coding=utf-8
+import json
 import logging
 import re
-from .models import Keyword, Alert, PasteId, Subscriber
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from .models import Keyword, Alert, PasteId, Subscriber, hash_url
+from .scanner import get_paste_scanner
 import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
 from django.db import close_old_connections
 from django.utils import timezone
 from datetime import timedelta
@@ -10,7 +18,6 @@ from apscheduler.schedulers.background import BackgroundScheduler
 import tzlocal
 from connectors.core import get_searxng_config
 from django.db.models.functions import Length
-from json.decoder import JSONDecodeError
 from common.core import send_app_specific_notifications
 from common.core import send_app_specific_notifications_group
 from common.core import send_only_thehive_notifications
@@ -19,6 +26,17 @@ from django.db.models import Q
 # Configure logger
 logger = logging.getLogger('watcher.data_leak')
 
+SEARX_ENGINES = 'gitlab,github,bitbucket,apkmirror,gentoo,npm,stackoverflow'
+PASTEBIN_SCRAPING_URL = "https://scrape.pastebin.com/api_scraping.php?limit=250"
+
+_searx_session = None
+_searx_session_lock = threading.Lock()
+_pastebin_session = None
+_pastebin_session_lock = threading.Lock()
+# Held while a main_data_leak cycle runs, so that cycles never overlap
+_cycle_lock = threading.Lock()
+
+
 def start_scheduler():
     """
     Launch multiple planning tasks in background:
@@ -27,7 +45,7 @@ def start_scheduler():
     """
     scheduler = BackgroundScheduler(timezone=str(tzlocal.get_localzone()))
 
-    scheduler.add_job(main_data_leak, 'cron', day_of_week='mon-sun', minute='*/5', id='week_job', max_instances=10,
+    scheduler.add_job(main_data_leak, 'cron', day_of_week='mon-sun', minute='*/5', id='week_job', max_instances=1,
                       replace_existing=True)
     scheduler.add_job(cleanup, 'cron', day_of_week='mon-sun', hour='*/2', id='clean', replace_existing=True)
     scheduler.start()
@@ -39,15 +57,10 @@ def cleanup():
     """
     close_old_connections()
     logger.info("CRON TASK : Remove 2 hours old pasteIDs.")
-    count = 0
-
-    paste_ids = PasteId.objects.all()
-    for paste_id in paste_ids:
-        # A paste stay approximately 20-25 minutes in the same API 250 pastes request, if the paste is 2 hours old,
-        # we can delete it.
-        if (timezone.now() - paste_id.created_at) >= timedelta(hours=2):
-            count += 1
-            paste_id.delete()
+
+    # A paste stay approximately 20-25 minutes in the same API 250 pastes request, if the paste is 2 hours old,
+    # we can delete it. One range DELETE on the indexed created_at.
+    count, _ = PasteId.objects.filter(created_at__lte=timezone.now() - timedelta(hours=2)).delete()
     logger.info(f"Deleted {count} useless pasties ID.")
 
 
@@ -57,13 +70,37 @@ def main_data_leak():
             - close_old_connections()
             - read in our list of keywords
             - check_keywords(keywords)
+        A cycle is skipped when the previous one is still running.
     """
-    close_old_connections()
-    logger.info("CRON TASK : Fetch searx & pastebin")
-    # read in our list of keywords
-    keywords = Keyword.objects.all().order_by(Length('name').desc())
+    if not _cycle_lock.acquire(blocking=False):
+        logger.warning("CRON TASK : Previous searx & pastebin cycle still running, skipping this one.")
+        return
+    try:
+        close_old_connections()
+        logger.info("CRON TASK : Fetch searx & pastebin")
+        # read in our list of keywords
+        keywords = list(Keyword.objects.all().order_by(Length('name').desc()))
+
+        check_keywords(keywords)
+    finally:
+        _cycle_lock.release()
+
+
+def get_new_urls(urls):
+    """
+    Return the urls which are not in an alert yet.
+    Stored alerts are looked up by the indexed hash of the urls, only the matching hashes are fetched.
 
-    check_keywords(keywords)
+    :param urls: Urls to check.
+    :rtype: list
+    """
+    url_hashes = {url: hash_url(url) for url in urls}
+    hashes = list(set(url_hashes.values()))
+    stored_hashes = set()
+    for start in range(0, len(hashes), 1000):
+        stored_hashes.update(Alert.objects.filter(url_hash__in=hashes[start:start + 1000])
+                             .values_list('url_hash', flat=True))
+    return [url for url in urls if url_hashes[url] not in stored_hashes]
 
 
 def check_urls(keyword, urls):
@@ -75,37 +112,35 @@ def check_urls(keyword, urls):
     :return: Urls not already in alert database column.
     :rtype: list
     """
-    new_urls = []
-    stored_urls = list()
-
-    if Alert.objects.all():
-
-        for alerts in Alert.objects.all():
-            stored_urls.append(alerts.url)
-
-        for url in urls:
-
-            if url not in stored_urls:
-                logger.info(f"New URL for {keyword} discovered: {url}")
-
-                new_urls.append(url)
-    else:
-        new_urls = urls
-
+    new_urls = get_new_urls(urls)
+    for url in new_urls:
+        logger.info(f"New URL for {keyword} discovered: {url}")
     return new_urls
 
 
-def check_searx(keyword):
+def get_searx_session():
     """
-    Pull Searx instance for keyword.
+    Return the process-wide requests Session used to query SearxNG, keeping connections alive between searches.
+    """
+    global _searx_session
+    if _searx_session is None:
+        with _searx_session_lock:
+            if _searx_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.DATA_LEAK_SEARX_WORKERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _searx_session = session
+    return _searx_session
+
+
+def get_search_term(keyword):
+    """
+    Return the SearxNG query of keyword.
 
     :param keyword: Keyword stored in database.
-    :return: Matched urls.
-    :rtype: list
+    :rtype: str
     """
-    hits = []
-    urls = []
-
     # For non-regex keywords, use double quotes for exact match
     # For regex keywords or keywords with special characters, don't add quotes
     if keyword.is_regex:
@@ -117,52 +152,204 @@ def check_searx(keyword):
         # Only add quotes for simple keywords without special characters
         if not any(char in search_term for char in ['%', '@', '&', '+', '=']):
             search_term = '"' + search_term + '"'
-    
-    params = {'q': search_term, 'engines': 'gitlab,github,bitbucket,apkmirror,gentoo,npm,stackoverflow',
-              'format': 'json'}
+    return search_term
+
+
+def search_searx(keyword, searx_url=None):
+    """
+    Query the SearxNG instance for keyword, within DATA_LEAK_SEARX_DEADLINE seconds.
+    The deadline is checked between the chunks of the response: a stalled read is only interrupted by the read
+    timeout, so a query lasts at most DATA_LEAK_SEARX_DEADLINE + min(DATA_LEAK_SEARX_TIMEOUT,
+    DATA_LEAK_SEARX_DEADLINE) seconds.
+
+    :param keyword: Keyword stored in database.
+    :param searx_url: SearxNG URL (default: the configured one).
+    :return: Unique result urls, in SearxNG order.
+    :rtype: list
+    """
+    search_term = get_search_term(keyword)
+    params = {'q': search_term, 'engines': SEARX_ENGINES, 'format': 'json'}
+    deadline = time.monotonic() + settings.DATA_LEAK_SEARX_DEADLINE
+    # A single read never waits longer than the whole query may last
+    read_timeout = min(settings.DATA_LEAK_SEARX_TIMEOUT, settings.DATA_LEAK_SEARX_DEADLINE)
 
     logger.info(f"Querying Searx for: {search_term}")
 
     # send the request off to searx
     try:
-        response = requests.get(get_searxng_config()['url'], params=params)
+        with get_searx_session().get(searx_url or get_searxng_config()['url'], params=params, stream=True,
+                                     timeout=(5, read_timeout)) as response:
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=65536):
+                body += chunk
+                if time.monotonic() > deadline:
+                    raise requests.exceptions.Timeout()
     except requests.exceptions.ProxyError as e:
         detail = re.search(r'(\d{3}\s+\w[\w ]*)', str(e))
         code_str = f" [{detail.group(1).strip()}]" if detail else ""
         logger.error("SearxNG unreachable through proxy%s (keyword: %s)", code_str, search_term)
-        return hits
+        return []
     except requests.exceptions.ConnectionError:
         logger.error("SearxNG connection failed (keyword: %s)", search_term)
-        return hits
+        return []
     except requests.exceptions.Timeout:
         logger.error("SearxNG request timed out (keyword: %s)", search_term)
-        return hits
+        return []
     except requests.exceptions.RequestException as e:
         logger.error("SearxNG request error for '%s': %s", search_term, type(e).__name__)
-        return hits
+        return []
 
     try:
-        results = response.json()
-        # if we have results we want to check them against our stored URLs
-        if len(results['results']):
+        results = json.loads(body)
+    except ValueError as e:
+        # no JSON returned
+        logger.error(str(e))
+        return []
+    return list(dict.fromkeys(result['url'] for result in results.get('results', [])))
 
-            for result in results['results']:
 
-                if result['url'] not in urls:
-                    urls.append(result['url'])
+def search_searx_keywords(keywords):
+    """
+    Query SearxNG for every keyword, DATA_LEAK_SEARX_WORKERS keywords at a time.
+
+    :param keywords: Keywords stored in database.
+    :return: List of (keyword, urls), in the keywords order.
+    :rtype: list
+    """
+    searx_url = get_searxng_config()['url']
+    with ThreadPoolExecutor(max_workers=settings.DATA_LEAK_SEARX_WORKERS, thread_name_prefix='searx') as executor:
+        urls = executor.map(lambda keyword: search_searx(keyword, searx_url), keywords)
+        return list(zip(keywords, urls))
+
+
+def check_searx(keyword):
+    """
+    Pull Searx instance for keyword.
+
+    :param keyword: Keyword stored in database.
+    :return: Matched urls.
+    :rtype: list
+    """
+    urls = search_searx(keyword)
+    if not urls:
+        return []
+    return check_urls(keyword, urls)
 
-            hits = check_urls(keyword, urls)
-    except JSONDecodeError as e:
-        # no JSON returned
-        logger.error(str(e))
-        return hits
 
-    return hits
+def persist_searx_hits(keyword_urls):
+    """
+    Create the alerts of the new urls found by SearxNG and send the notifications.
+    A url found for several keywords is attributed to the first one. Stored urls are looked up once for all the
+    keywords, the alerts are bulk created.
+
+    :param keyword_urls: List of (keyword, urls).
+    """
+    owner = dict()
+    for keyword, urls in keyword_urls:
+        for url in urls:
+            owner.setdefault(url, keyword)
+    if not owner:
+        return
+
+    new_urls = get_new_urls(list(owner))
+    if not new_urls:
+        return
+    for url in new_urls:
+        logger.info(f"New URL for {owner[url]} discovered: {url}")
+    Alert.objects.bulk_create([Alert(keyword=owner[url], url=url, url_hash=hash_url(url)) for url in new_urls],
+                              batch_size=500)
+    # Primary keys are not returned by bulk_create on MySQL
+    alerts = Alert.objects.filter(url_hash__in=[hash_url(url) for url in new_urls]).select_related('keyword')
+    alerts_by_keyword = dict()
+    for alert in alerts:
+        alerts_by_keyword.setdefault(alert.keyword, []).append(alert)
+
+    for keyword, keyword_alerts in alerts_by_keyword.items():
+        for alert in keyword_alerts:
+            logger.info(f"Create alert for: {keyword} url: {alert.url}")
+        # limiting the number of specific email per alert
+        if len(keyword_alerts) < 6:
+            for alert in keyword_alerts:
+                send_data_leak_notifications(alert)
+        # if there is too many alerts, we send a group email
+        else:
+            send_data_leak_notifications_group(keyword, len(keyword_alerts), keyword_alerts)
+
+
+def get_pastebin_session():
+    """
+    Return the process-wide requests Session used to download pastes, keeping connections alive between pastes.
+    """
+    global _pastebin_session
+    if _pastebin_session is None:
+        with _pastebin_session_lock:
+            if _pastebin_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.DATA_LEAK_PASTE_WORKERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({
+                    'Referer': 'https://scrape.pastebin.com',
+                    'User-Agent': 'Chrome/75.0.3770.142'
+                })
+                _pastebin_session = session
+    return _pastebin_session
+
+
+class HostRateLimiter:
+    """
+    Spaces the requests sent to a same host by at least 1 / rate seconds, whatever the number of threads.
+    """
+
+    def __init__(self, rate):
+        """
+        :param rate: Maximum number of requests per second and per host (0: no limit).
+        """
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_slot = dict()
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        """
+        Block until a request to the host of url may be sent.
+        """
+        if not self.interval:
+            return
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def fetch_and_scan_paste(paste, scanner, rate_limiter):
+    """
+    Download a paste, streaming its body, and scan it for the keywords.
+
+    :param paste: Paste dict of the Pastebin scraping API.
+    :param scanner: PasteScanner of the keywords.
+    :param rate_limiter: HostRateLimiter shared by the downloads.
+    :return: (matches, body) where body is None when there is no match.
+    """
+    rate_limiter.wait(paste['scrape_url'])
+    body = bytearray()
+    with get_pastebin_session().get(paste['scrape_url'], stream=True,
+                                    timeout=settings.DATA_LEAK_PASTE_TIMEOUT) as paste_response:
+        for chunk in paste_response.iter_content(chunk_size=65536):
+            body += chunk
+    body = bytes(body)
+    # All the keywords are searched in one pass over the raw body
+    matches = scanner.scan(body)
+    return matches, body if matches else None
 
 
 def check_pastebin(keywords):
     """
     Check Pastebin for keyword list.
+    New pastes are downloaded by DATA_LEAK_PASTE_WORKERS threads, at most DATA_LEAK_PASTE_RATE requests per second,
+    and scanned as soon as they are downloaded.
 
     :param keywords: Keywords stored in database.
     :return: Matched urls & Corresponding keyword.
@@ -170,13 +357,12 @@ def check_pastebin(keywords):
     """
     global paste_content_hits
     paste_content_hits = {}
-    new_ids = []
-    pastebin_ids = list()
     paste_hits = {}
+    scanner = get_paste_scanner(keywords)
 
     # Fetch the Pastebin API
     try:
-        response = requests.get("https://scrape.pastebin.com/api_scraping.php?limit=250")
+        response = get_pastebin_session().get(PASTEBIN_SCRAPING_URL, timeout=settings.DATA_LEAK_PASTE_TIMEOUT)
     except requests.exceptions.RequestException as e:
         logger.error(str(e))
         return paste_hits
@@ -187,58 +373,39 @@ def check_pastebin(keywords):
             # parse the JSON
             result = response.json()
 
-            # load up our list of stored paste ID's and only check the new ones
-            pastebin = PasteId.objects.all()
-            for paste in pastebin:
-                pastebin_ids.append(paste.paste_id)
-
-            for paste in result:
-
-                if paste['key'] not in pastebin_ids:
-
-                    new_ids.append(paste['key'])
-
-                    # this is a new paste so send a secondary request to retrieve
-                    # it and then check it for our keywords
+            # only look up the paste ID's of this batch and check the new ones
+            batch = {paste['key']: paste for paste in result}
+            pastebin_ids = set(PasteId.objects.filter(paste_id__in=list(batch)).values_list('paste_id', flat=True))
+            new_pastes = [paste for key, paste in batch.items() if key not in pastebin_ids]
+
+            # these are new pastes so send secondary requests to retrieve them and then check them for our keywords
+            rate_limiter = HostRateLimiter(settings.DATA_LEAK_PASTE_RATE)
+            with ThreadPoolExecutor(max_workers=settings.DATA_LEAK_PASTE_WORKERS,
+                                    thread_name_prefix='pastebin') as executor:
+                futures = {executor.submit(fetch_and_scan_paste, paste, scanner, rate_limiter): paste
+                           for paste in new_pastes}
+                for future in as_completed(futures):
+                    paste = futures[future]
                     try:
-                        headers = {
-                            'Referer': 'https://scrape.pastebin.com',
-                            'User-Agent': 'Chrome/75.0.3770.142'
-                        }
-
-                        paste_response = requests.get(paste['scrape_url'], headers)
-                        paste_body_lower = paste_response.content.lower()
-
-                        keyword_hits = []
-
-                        for keyword in keywords:
-                            if keyword.is_regex:
-                                # Use regex pattern matching
-                                try:
-                                    pattern = re.compile(str(keyword.name).encode('utf8'), re.IGNORECASE)
-                                    if pattern.search(paste_body_lower):
-                                        keyword_hits.append(keyword)
-                                except re.error as e:
-                                    logger.error(f"Invalid regex pattern for keyword '{keyword.name}': {str(e)}")
-                            else:
-                                # Use exact string matching (case insensitive)
-                                if bytes(str(keyword).lower(), 'utf8') in paste_body_lower:
-                                    keyword_hits.append(keyword)
-
-                        if len(keyword_hits):
-                            # We stored the first matched keyword, others are pointless
-                            paste_hits[paste['full_url']] = keyword_hits[0]
-                            paste_content_hits[paste['full_url']] = str(paste_body_lower.decode("utf-8"))
-
-                            logger.info(f"Hit on Pastebin for {str(keyword_hits)}: {paste['full_url']}")
+                        matches, body = future.result()
                     except requests.exceptions.RequestException as e:
                         logger.error(str(e))
+                        continue
+
+                    if len(matches):
+                        keyword_hits = scanner.matched_keywords(matches)
+                        # We stored the first matched keyword, others are pointless
+                        paste_hits[paste['full_url']] = keyword_hits[0]
+                        paste_content_hits[paste['full_url']] = body.lower().decode("utf-8", errors="replace")
+
+                        logger.info(f"Hit on Pastebin for {str(keyword_hits)}: {paste['full_url']} "
+                                    f"(first at offset {matches[0][1]})")
 
             # store the newly checked IDs
-            for pastebin_id in new_ids:
-                PasteId.objects.create(paste_id=pastebin_id)
+            PasteId.objects.bulk_create([PasteId(paste_id=paste['key']) for paste in new_pastes], batch_size=500,
+                                        ignore_conflicts=True)
 
-            logger.info(f"Successfully processed {len(new_ids)} Pastebin posts.")
+            logger.info(f"Successfully processed {len(new_pastes)} Pastebin posts.")
         else:
             logger.warning("Cannot Pull https://scrape.pastebin.com API. You need a Pastebin Pro Account. "
                                   "Please verify that the software IP is whitelisted: https://pastebin.com/doc_scraping_api")
@@ -254,21 +421,8 @@ def check_keywords(keywords):
 
     :param keywords: Keywords stored in database.
     """
-    # use the list of keywords and check each against searx
-    for keyword in keywords:
-        # query searx for the keyword
-        results = check_searx(keyword)
-
-        if len(results):
-            for result in results:
-                logger.info(f"Create alert for: {keyword} url: {result}")
-                alert = Alert.objects.create(keyword=Keyword.objects.get(name=keyword), url=result)
-                # limiting the number of specific email per alert
-                if len(results) < 6:
-                    send_data_leak_notifications(alert)
-            # if there is too many alerts, we send a group email
-            if len(results) >= 6:
-                send_data_leak_notifications_group(keyword, len(results), results)
+    # query searx for the keywords, then dedupe and store all the results at once
+    persist_searx_hits(search_searx_keywords(keywords))
 
     # now we check Pastebin for new pastes
     result = check_pastebin(keywords)
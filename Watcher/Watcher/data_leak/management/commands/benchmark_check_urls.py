@@ -0,0 +1,61 @@
+from abc import ABC
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from data_leak.core import check_urls
+from data_leak.models import Alert, Keyword, hash_url
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand, ABC):
+    help = 'Compare the full Alert scan previously done by check_urls with the indexed url_hash lookup, over ' \
+           'generated alerts. The generated alerts are rolled back at the end.'
+    # System checks import the urls, which start the schedulers during the benchmark
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alerts', type=int, default=100000, help='Number of stored alerts to generate.')
+        parser.add_argument('--urls', type=int, default=50, help='Number of fresh Searx urls to check.')
+        parser.add_argument('--content-size', type=int, default=2000, help='Size of the content of each alert.')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.benchmark(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def benchmark(self, options):
+        keyword, _ = Keyword.objects.get_or_create(name='benchmark-check-urls')
+        content = 'x' * options['content_size']
+        start = time.perf_counter()
+        for offset in range(0, options['alerts'], 5000):
+            urls = [f"https://example.com/leak/{i}" for i in range(offset, min(offset + 5000, options['alerts']))]
+            Alert.objects.bulk_create([Alert(keyword=keyword, url=url, url_hash=hash_url(url), content=content)
+                                       for url in urls])
+        self.stdout.write(f"{options['alerts']} alerts generated in {time.perf_counter() - start:.1f} s")
+
+        # Half of the urls are already stored
+        stored = options['urls'] // 2
+        step = max(1, options['alerts'] // max(stored, 1))
+        urls = [f"https://example.com/leak/{i}" for i in range(0, options['alerts'], step)][:stored]
+        urls += [f"https://example.com/new/{i}" for i in range(options['urls'] - len(urls))]
+
+        start = time.perf_counter()
+        stored_urls = [alert.url for alert in Alert.objects.all()]
+        full_scan_new = [url for url in urls if url not in stored_urls]
+        full_scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed_new = check_urls(keyword, urls)
+        indexed = time.perf_counter() - start
+
+        if full_scan_new != indexed_new:
+            self.stderr.write("The indexed lookup and the full scan disagree")
+        self.stdout.write(f"Full scan: {full_scan * 1000:.1f} ms, indexed lookup: {indexed * 1000:.1f} ms "
+                          f"(x{full_scan / indexed:.0f}) for {len(urls)} urls, {len(indexed_new)} new")
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.5 on 2026-10-17 15:10
+
+import hashlib
+from django.db import migrations, models
+
+
+def fill_url_hash(apps, schema_editor):
+    Alert = apps.get_model('data_leak', 'Alert')
+    alerts = []
+    for alert in Alert.objects.only('id', 'url').iterator(chunk_size=2000):
+        alert.url_hash = hashlib.sha256(alert.url.encode('utf-8')).hexdigest()
+        alerts.append(alert)
+        if len(alerts) >= 2000:
+            Alert.objects.bulk_update(alerts, ['url_hash'])
+            alerts = []
+    Alert.objects.bulk_update(alerts, ['url_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_leak', '0013_alter_keyword_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='url_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(fill_url_hash, migrations.RunPython.noop),
+    ]
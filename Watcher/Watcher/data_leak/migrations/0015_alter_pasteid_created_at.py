@@ -0,0 +1,19 @@
+# Generated by Django 6.0.5 on 2026-10-17 16:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_leak', '0014_alert_url_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pasteid',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,10 +1,18 @@
 # coding=utf-8
+import hashlib
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericRelation
 
 
+def hash_url(url):
+    """
+    Return the SHA-256 hex digest of url, used to look alerts up by URL through an index.
+    """
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
 class Keyword(models.Model):
     """
     Stores a word which will be use to search data_leaks.
@@ -28,6 +36,7 @@ class Alert(models.Model):
     """
     keyword = models.ForeignKey(Keyword, on_delete=models.CASCADE)
     url = models.URLField(max_length=250, default="")
+    url_hash = models.CharField(max_length=64, default="", editable=False, db_index=True)
     status = models.BooleanField(default=True)
     content = models.TextField(default="")
     created_at = models.DateTimeField(default=timezone.now)
@@ -38,13 +47,18 @@ class Alert(models.Model):
     def __str__(self):
         return self.keyword.name
 
+    def save(self, *args, **kwargs):
+        # Not called by bulk_create: set url_hash with hash_url() beforehand
+        self.url_hash = hash_url(self.url)
+        super().save(*args, **kwargs)
+
 
 class PasteId(models.Model):
     """
     List of the past ids already pulled from pastebin.com.
     """
     paste_id = models.CharField(max_length=100, unique=True)
-    created_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     def __str__(self):
         return self.paste_id
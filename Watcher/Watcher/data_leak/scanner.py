@@ -0,0 +1,109 @@
+import logging
+import re
+import threading
+
+from common.utils.aho_corasick import AhoCorasick
+
+logger = logging.getLogger('watcher.data_leak')
+
+_scanner = None
+_scanner_lock = threading.Lock()
+
+
+class PasteScanner:
+    """
+    Compiled view of the data_leak keywords, scanning a paste body (bytes) for all of them at once, case
+    insensitively (ASCII), as check_pastebin did by lowercasing the body:
+        - literal keywords are matched by one Aho-Corasick automaton.
+        - regex keywords are compiled once, and the ones without groups are combined in one alternation used to skip
+          the pastes matching none of them.
+    """
+
+    def __init__(self, keywords):
+        """
+        :param keywords: Iterable of (name, is_regex) of :model:`data_leak.Keyword`, in priority order.
+        """
+        self.version = tuple(keywords)
+        self.priority = dict()
+        literals = list()
+        self.regexes = list()
+        for name, is_regex in self.version:
+            name = str(name)
+            if not name or name in self.priority:
+                continue
+            if is_regex:
+                try:
+                    self.regexes.append((name, re.compile(name.encode('utf8'), re.IGNORECASE)))
+                except re.error as e:
+                    logger.error(f"Invalid regex pattern for keyword '{name}': {str(e)}")
+                    continue
+            else:
+                literals.append(name)
+            self.priority[name] = len(self.priority)
+
+        self.literal_names = dict()
+        for name in literals:
+            self.literal_names.setdefault(name.lower().encode('utf8'), name)
+        self.literals = AhoCorasick(self.literal_names)
+        # Cheap check in C of the presence of any literal, the automaton only runs on the pastes which have one
+        self.literal_prefilter = re.compile(b'|'.join(re.escape(pattern) for pattern in self.literal_names),
+                                            re.IGNORECASE) if self.literal_names else None
+        # Regexes with groups may use back-references, whose numbers would change once combined
+        self.combined_regexes = [(name, regex) for name, regex in self.regexes if not regex.groups]
+        self.other_regexes = [(name, regex) for name, regex in self.regexes if regex.groups]
+        self.regex_prefilter = None
+        if self.combined_regexes:
+            try:
+                combined = b'|'.join(b'(?:' + regex.pattern + b')' for _, regex in self.combined_regexes)
+                self.regex_prefilter = re.compile(combined, re.IGNORECASE)
+            except re.error:
+                # Inline flags can not be combined, the regexes are then run one by one
+                self.other_regexes = self.regexes
+                self.combined_regexes = []
+
+    def scan(self, body):
+        """
+        Return every occurrence of a keyword in body.
+
+        :param body: Paste content (bytes).
+        :return: List of (keyword name, start offset, end offset), ordered by start offset then keyword priority.
+        """
+        matches = list()
+        if self.literal_prefilter is not None and self.literal_prefilter.search(body):
+            for start, pattern in self.literals.iter_matches(body.lower()):
+                matches.append((self.literal_names[pattern], start, start + len(pattern)))
+        regexes = self.other_regexes
+        if self.regex_prefilter is not None and self.regex_prefilter.search(body):
+            regexes = self.regexes
+        for name, regex in regexes:
+            for match in regex.finditer(body):
+                matches.append((name, match.start(), match.end()))
+        matches.sort(key=lambda match: (match[1], self.priority[match[0]]))
+        return matches
+
+    def matched_keywords(self, matches):
+        """
+        Return the names of the keywords of matches, in priority order.
+
+        :param matches: List returned by scan().
+        """
+        return sorted({name for name, _, _ in matches}, key=self.priority.__getitem__)
+
+
+def get_paste_scanner(keywords):
+    """
+    Return the PasteScanner of keywords, rebuilt only when the keyword set changed.
+
+    :param keywords: Iterable of :model:`data_leak.Keyword`, in priority order.
+    """
+    global _scanner
+    version = tuple((str(keyword.name), keyword.is_regex) for keyword in keywords)
+    scanner = _scanner
+    if scanner is None or scanner.version != version:
+        with _scanner_lock:
+            if _scanner is None or _scanner.version != version:
+                _scanner = PasteScanner(version)
+                logger.debug(f"Paste scanner built with {len(_scanner.literal_names)} literal and "
+                             f"{len(_scanner.regexes)} regex keywords")
+            scanner = _scanner
+    return scanner
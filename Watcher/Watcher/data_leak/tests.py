@@ -79,6 +79,21 @@ class CoreFunctionsTest(TransactionTestCase):
         
         self.assertEqual(len(new_urls), 1)
         self.assertIn("https://new.com", new_urls)
+
+    def test_check_urls_fetches_matching_hashes_only(self):
+        """Stored alerts are looked up with one indexed query per 1000 urls."""
+        from data_leak.core import check_urls
+        from data_leak.models import hash_url
+
+        keyword = Keyword.objects.create(name="hashed")
+        Alert.objects.bulk_create([Alert(keyword=keyword, url=f"https://stored{i}.com",
+                                         url_hash=hash_url(f"https://stored{i}.com")) for i in range(50)])
+        Alert.objects.create(keyword=keyword, url="https://saved.com")
+
+        urls = ["https://stored7.com", "https://saved.com", "https://fresh.com"]
+        with self.assertNumQueries(1):
+            new_urls = check_urls(keyword, urls)
+        self.assertEqual(new_urls, ["https://fresh.com"])
     
     def test_cleanup_functionality(self):
         """Test cleanup of old paste IDs."""
@@ -92,7 +107,8 @@ class CoreFunctionsTest(TransactionTestCase):
         # Create recent paste
         PasteId.objects.create(paste_id="RECENT456")
         
-        cleanup()
+        with self.assertNumQueries(1):
+            cleanup()
         
         self.assertFalse(PasteId.objects.filter(paste_id="OLD123").exists())
         self.assertTrue(PasteId.objects.filter(paste_id="RECENT456").exists())
@@ -110,6 +126,70 @@ class CoreFunctionsTest(TransactionTestCase):
         mock_notifications.assert_called_once()
 
 
+class PasteScannerTest(TestCase):
+    """Test the multi-pattern scan of the pastes."""
+
+    def test_scan(self):
+        from data_leak.scanner import PasteScanner
+
+        scanner = PasteScanner([("PayPal", False), ("pal", False), (r"acme-\d+", True), ("(a)\\1", True),
+                                ("bad[", True)])
+        matches = scanner.scan(b"Login PAYPAL account acme-42 and aa")
+        self.assertEqual(matches, [("PayPal", 6, 12), ("pal", 9, 12), (r"acme-\d+", 21, 28), ("(a)\\1", 33, 35)])
+        self.assertEqual(scanner.matched_keywords(matches), ["PayPal", "pal", r"acme-\d+", "(a)\\1"])
+        self.assertEqual(scanner.scan(b"nothing to see"), [])
+
+    def test_rebuilt_on_keyword_change(self):
+        from data_leak.scanner import get_paste_scanner
+
+        keywords = [Keyword.objects.create(name="secret"), Keyword.objects.create(name="token")]
+        scanner = get_paste_scanner(keywords)
+        self.assertIs(get_paste_scanner(keywords), scanner)
+        keywords[1].is_regex = True
+        self.assertIsNot(get_paste_scanner(keywords), scanner)
+
+
+class PastebinDownloadTest(TestCase):
+    """Test the parallel, rate limited download of the pastes."""
+
+    @patch('data_leak.core.get_pastebin_session')
+    def test_check_pastebin_first_keyword(self, mock_session):
+        from data_leak.core import check_pastebin
+
+        keywords = [Keyword.objects.create(name="password"), Keyword.objects.create(name="pass")]
+        PasteId.objects.create(paste_id="old")
+        pastes = [{"key": key, "scrape_url": f"https://scrape.pastebin.com/{key}",
+                   "full_url": f"https://pastebin.com/{key}"} for key in ("old", "abc", "def")]
+        listing = MagicMock(text='[{"key": "abc"}]')
+        listing.json.return_value = pastes
+        bodies = {"https://scrape.pastebin.com/abc": [b"root PASSWORD", b"=hunter2"],
+                  "https://scrape.pastebin.com/def": [b"nothing"]}
+
+        def get(url, **kwargs):
+            if url not in bodies:
+                return listing
+            response = MagicMock()
+            response.__enter__.return_value.iter_content.return_value = bodies[url]
+            return response
+
+        mock_session.return_value.get.side_effect = get
+
+        self.assertEqual(check_pastebin(keywords), {"https://pastebin.com/abc": "password"})
+        self.assertEqual(sorted(PasteId.objects.values_list('paste_id', flat=True)), ["abc", "def", "old"])
+        self.assertEqual(mock_session.return_value.get.call_count, 3)
+
+    def test_host_rate_limiter(self):
+        from data_leak.core import HostRateLimiter
+
+        limiter = HostRateLimiter(rate=2)
+        with patch('data_leak.core.time.sleep') as mock_sleep, \
+                patch('data_leak.core.time.monotonic', return_value=100.0):
+            for _ in range(3):
+                limiter.wait("https://scrape.pastebin.com/a")
+            limiter.wait("https://other.com/a")
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [0.5, 1.0])
+
+
 class APITest(APITestCase):
     """Test REST API endpoints."""
     
@@ -180,9 +260,10 @@ class IntegrationTest(TransactionTestCase):
         self.assertEqual(Alert.objects.count(), 1)
         self.assertEqual(alert.keyword, self.keyword)
     
-    @patch('data_leak.core.check_searx')
+    @patch('data_leak.core.get_searxng_config', return_value={'url': 'http://searxng:8080/'})
+    @patch('data_leak.core.search_searx')
     @patch('data_leak.core.check_pastebin')
-    def test_monitoring_integration(self, mock_pastebin, mock_searx):
+    def test_monitoring_integration(self, mock_pastebin, mock_searx, mock_config):
         """Test monitoring system integration."""
         from data_leak.core import check_keywords
         import data_leak.core
@@ -191,12 +272,44 @@ class IntegrationTest(TransactionTestCase):
         mock_pastebin.return_value = {"https://pastebin.com/test": self.keyword.name}
         data_leak.core.paste_content_hits = {"https://pastebin.com/test": "Mock content"}
         
-        with patch('data_leak.core.check_urls') as mock_check_urls:
-            mock_check_urls.return_value = ["https://searx-test.com"]
-            check_keywords([self.keyword])
+        check_keywords([self.keyword])
             
         mock_searx.assert_called_once()
         mock_pastebin.assert_called_once()
+        self.assertTrue(Alert.objects.filter(keyword=self.keyword, url="https://searx-test.com").exists())
+
+    @patch('data_leak.core.send_data_leak_notifications')
+    @patch('data_leak.core.get_searxng_config', return_value={'url': 'http://searxng:8080/'})
+    @patch('data_leak.core.search_searx')
+    def test_searx_results_merged(self, mock_searx, mock_config, mock_notifications):
+        """Urls found by several keywords, or already stored, create a single alert."""
+        from data_leak.core import persist_searx_hits, search_searx_keywords
+
+        other = Keyword.objects.create(name="integration")
+        Alert.objects.create(keyword=other, url="https://stored.com")
+        results = {self.keyword.name: ["https://shared.com", "https://stored.com"],
+                   other.name: ["https://shared.com", "https://other.com"]}
+        mock_searx.side_effect = lambda keyword, searx_url: results[keyword.name]
+
+        persist_searx_hits(search_searx_keywords([self.keyword, other]))
+
+        self.assertEqual(sorted(Alert.objects.values_list('keyword__name', 'url')), [
+            ("integration", "https://other.com"),
+            ("integration", "https://stored.com"),
+            ("integration-test", "https://shared.com"),
+        ])
+        self.assertEqual(mock_notifications.call_count, 2)
+
+    @patch('data_leak.core.check_keywords')
+    def test_overlapping_cycles_skipped(self, mock_check_keywords):
+        """A cycle started while the previous one runs is skipped."""
+        from data_leak.core import main_data_leak, _cycle_lock
+
+        with _cycle_lock:
+            main_data_leak()
+        mock_check_keywords.assert_not_called()
+        main_data_leak()
+        mock_check_keywords.assert_called_once()
 
 
 class PerformanceTest(TestCase):
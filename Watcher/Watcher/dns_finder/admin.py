@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DnsMonitored, DnsTwisted, Alert, Subscriber, KeywordMonitored
+from .models import DnsMonitored, DnsTwisted, DnsPermutation, Alert, Subscriber, KeywordMonitored
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin, ExportMixin
 from common.misp import get_misp_uuid
@@ -111,6 +111,16 @@ class DnsTwisted(ExportMixin, admin.ModelAdmin):
     display_misp_uuid.short_description = "MISP Event UUID"
 
 
+@admin.register(DnsPermutation)
+class DnsPermutation(admin.ModelAdmin):
+    list_display = ['domain_name', 'fuzzer', 'dns_monitored', 'registered', 'last_resolved_at', 'next_resolve_at']
+    list_filter = ['registered', 'dns_monitored', 'fuzzer']
+    search_fields = ['domain_name']
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(Subscriber)
 class Subscriber(admin.ModelAdmin):
     list_display = ('user_rec', 'created_at', 'email', 'thehive', 'slack', 'citadel')
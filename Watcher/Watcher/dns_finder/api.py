@@ -55,6 +55,47 @@ class DnsMonitoredViewSet(viewsets.ModelViewSet):
             logger.exception("Error computing DNS Finder statistics")
             return Response({'error': 'An internal error occurred.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @staticmethod
+    def certstream_status_response(response_status=status.HTTP_200_OK):
+        """Return a Response with the health, connection and ingestion counters of the CertStream listener."""
+        from .certstream_client import get_active_client, listener_health
+        healthy, reason = listener_health()
+        client = get_active_client()
+        if client is None:
+            return Response({'running': False, 'healthy': healthy, 'reason': reason}, status=response_status)
+        return Response({'running': client.is_running(), 'healthy': healthy, 'reason': reason, **client.stats()},
+                        status=response_status)
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated], url_path='certstream')
+    def get_certstream_stats(self, request):
+        """Return the health, connection and ingestion counters of the CertStream listener."""
+        return self.certstream_status_response()
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated, permissions.IsAdminUser],
+            url_path='certstream/start')
+    def start_certstream(self, request):
+        """Start the CertStream listener, unless it is already running. Admin only."""
+        from .core import start_certificate_transparency
+        try:
+            start_certificate_transparency()
+        except RuntimeError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        except Exception:
+            logger.exception("Error starting the CertStream listener")
+            return Response({'error': 'An internal error occurred.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info(f"CertStream listener started by {request.user}")
+        return self.certstream_status_response()
+
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated, permissions.IsAdminUser],
+            url_path='certstream/stop')
+    def stop_certstream(self, request):
+        """Stop the CertStream listener until it is started again through the API. Admin only."""
+        from .certstream_client import stop_listener
+        stopped = stop_listener(disable=True)
+        logger.info(f"CertStream listener stopped by {request.user}")
+        # The connection thread is still exiting
+        return self.certstream_status_response(status.HTTP_200_OK if stopped else status.HTTP_202_ACCEPTED)
+
 
 # KeywordMonitored Viewset
 class KeywordMonitoredViewSet(viewsets.ModelViewSet):
@@ -11,14 +11,32 @@ Compatible with Docker networking and enterprise proxy configurations.
 import os
 import json
 import time
+import queue
+import random
 import logging
 import threading
 from urllib.parse import urlparse
 import websocket
+from django.db import close_old_connections
 from connectors.core import get_certstream_config
 
+try:
+    import orjson
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 logger = logging.getLogger('watcher.dns_finder')
 
+# What to do with a frame received while the queue is full
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+_active_client = None
+_listener_lock = threading.Lock()
+# Set when the listener was stopped on purpose, the health check then does not restart it
+_listener_disabled = False
+
 
 class CertStreamClient:
     """
@@ -27,26 +45,64 @@ class CertStreamClient:
     Features:
     - Automatic proxy detection and bypass for internal URLs
     - Periodic ping to keep connection alive
-    - Automatic reconnection on failures
+    - Automatic reconnection on failures, with jittered exponential backoff
     - Thread-safe operation
+    - Optional bounded queue between the websocket and a pool of callback workers
     """
     
-    def __init__(self, url=None, callback=None, ping_interval=30, reconnect_delay=5):
+    def __init__(self, url=None, callback=None, ping_interval=30, reconnect_delay=5, workers=0, queue_size=10000,
+                 overflow='drop_oldest', prefilter=None, max_reconnect_delay=300):
         """
         Initialize CertStream client.
         
         :param url: WebSocket URL (default: from settings.CERT_STREAM_URL)
         :param callback: Callback function to handle messages
         :param ping_interval: Seconds between ping messages (0 to disable)
-        :param reconnect_delay: Seconds to wait before reconnection attempt
+        :param reconnect_delay: Seconds to wait before the first reconnection attempt, doubled after each failure
+        :param workers: Number of threads running the callback (0 runs it on the websocket thread)
+        :param queue_size: Maximum number of frames waiting for a worker
+        :param overflow: Policy when the queue is full, one of OVERFLOW_POLICIES
+        :param prefilter: Function called with each raw frame, frames for which it returns False are not decoded
+        :param max_reconnect_delay: Upper bound of the reconnection backoff, in seconds
         """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected one of {OVERFLOW_POLICIES}")
         self.url = url or get_certstream_config()['url']
         self.callback = callback
+        self.prefilter = prefilter
         self.ping_interval = ping_interval
         self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
         self.ws = None
         self.should_reconnect = True
+        self.stop_event = threading.Event()
         self.connection_thread = None
+
+        # Connection lifecycle, as monotonic timestamps
+        self.connected = False
+        self.connections = 0
+        self.failures = 0
+        self.started_at = None
+        self.connected_at = None
+        self.disconnected_at = None
+        self.last_message_at = None
+        self.last_resume_seconds = None
+        self.max_resume_seconds = 0.0
+        self.downtime_seconds = 0.0
+        self.received_at_open = 0
+
+        self.workers = workers
+        self.overflow = overflow
+        self.queue = queue.Queue(maxsize=queue_size) if workers > 0 else None
+        self.worker_threads = []
+        self.counters_lock = threading.Lock()
+        self.received = 0
+        self.filtered = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
         
         # Configure proxy settings
         self._setup_proxy()
@@ -123,30 +179,161 @@ class CertStreamClient:
     
     def _on_message(self, ws, message):
         """Handle incoming WebSocket messages."""
+        self.feed(message)
+
+    def feed(self, message):
+        """
+        Submit a raw CertStream frame, received from the WebSocket or replayed from a recording: drop it when rejected
+        by the prefilter, then queue it for the workers, or process it inline without workers.
+        """
+        received_at = time.monotonic()
+        with self.counters_lock:
+            self.received += 1
+            self.last_message_at = received_at
+        if self.prefilter is not None:
+            try:
+                candidate = self.prefilter(message)
+            except Exception as e:
+                logger.error(f"Error in CertStream prefilter: {e}")
+                candidate = True
+            if not candidate:
+                with self.counters_lock:
+                    self.filtered += 1
+                return
+        if self.queue is None:
+            self._process(message, received_at)
+        else:
+            self._enqueue(message, received_at)
+
+    def _enqueue(self, message, received_at):
+        """Put a frame in the queue, applying the overflow policy when it is full."""
+        if self.overflow == 'block':
+            self.queue.put((message, received_at))
+            return
+        try:
+            self.queue.put_nowait((message, received_at))
+            return
+        except queue.Full:
+            pass
+        if self.overflow == 'drop_oldest':
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait((message, received_at))
+            except queue.Full:
+                pass
+        with self.counters_lock:
+            self.dropped += 1
+
+    def _process(self, message, received_at):
+        """Decode a frame and run the callback on certificate updates."""
+        lag = time.monotonic() - received_at
         try:
-            data = json.loads(message)
+            data = _loads(message)
             if self.callback and data.get('message_type') == 'certificate_update':
                 self.callback(data, None)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode CertStream message: {e}")
+            with self.counters_lock:
+                self.errors += 1
         except Exception as e:
             logger.error(f"Error in CertStream callback: {e}")
+            with self.counters_lock:
+                self.errors += 1
+        with self.counters_lock:
+            self.processed += 1
+            self.lag = lag
+            self.max_lag = max(self.max_lag, lag)
+
+    def _worker_loop(self):
+        """Run the callback on queued frames until a None sentinel is received."""
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+                close_old_connections()
+                self._process(*item)
+            finally:
+                self.queue.task_done()
+
+    def start_workers(self):
+        """Start the callback workers, if the client has a queue and they are not running yet."""
+        if self.queue is None or any(thread.is_alive() for thread in self.worker_threads):
+            return
+        self.worker_threads = [
+            threading.Thread(target=self._worker_loop, name=f"certstream-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self.worker_threads:
+            thread.start()
+        logger.info(f"Started {self.workers} CertStream workers (queue size {self.queue.maxsize}, "
+                    f"overflow {self.overflow})")
+
+    def stop_workers(self):
+        """Ask the callback workers to exit once the frames already queued are processed."""
+        for thread in self.worker_threads:
+            if thread.is_alive():
+                self.queue.put(None)
+
+    def stats(self):
+        """
+        Return the connection and ingestion counters: connection state, reconnections, time to resume the stream after
+        a disconnection (last and maximum), frames received, rejected by the prefilter, processed and dropped, callback
+        errors, current queue depth and lag in seconds between the reception and the processing of a frame (last and
+        maximum).
+        """
+        now = time.monotonic()
+        with self.counters_lock:
+            return {
+                'connected': self.connected,
+                'connections': self.connections,
+                'reconnects': max(self.connections - 1, 0),
+                'consecutive_failures': self.failures,
+                'uptime_seconds': round(now - self.started_at, 3) if self.started_at is not None else None,
+                'idle_seconds': round(now - self.last_message_at, 3) if self.last_message_at is not None else None,
+                'downtime_seconds': round(self.downtime_seconds, 3),
+                'last_resume_seconds': (round(self.last_resume_seconds, 3)
+                                        if self.last_resume_seconds is not None else None),
+                'max_resume_seconds': round(self.max_resume_seconds, 3),
+                'received': self.received,
+                'filtered': self.filtered,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'queued': self.queue.qsize() if self.queue is not None else 0,
+                'queue_size': self.queue.maxsize if self.queue is not None else 0,
+                'workers': sum(1 for thread in self.worker_threads if thread.is_alive()),
+                'overflow': self.overflow,
+                'lag_seconds': round(self.lag, 3),
+                'max_lag_seconds': round(self.max_lag, 3),
+            }
     
     def _on_error(self, ws, error):
         """Handle WebSocket errors."""
         logger.error(f"CertStream WebSocket error: {error}")
     
     def _on_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket connection close."""
+        """Handle WebSocket connection close, the reconnection is done by the _run loop."""
         logger.warning(f"CertStream connection closed: {close_status_code} - {close_msg}")
-        if self.should_reconnect:
-            logger.info(f"Reconnecting in {self.reconnect_delay} seconds...")
-            time.sleep(self.reconnect_delay)
-            self._connect()
-    
+
     def _on_open(self, ws):
         """Handle WebSocket connection open."""
         logger.info(f"CertStream connection established to {self.url}")
+        now = time.monotonic()
+        with self.counters_lock:
+            self.connected = True
+            self.connections += 1
+            self.connected_at = now
+            self.received_at_open = self.received
+            if self.disconnected_at is not None:
+                self.last_resume_seconds = now - self.disconnected_at
+                self.max_resume_seconds = max(self.max_resume_seconds, self.last_resume_seconds)
+                self.downtime_seconds += self.last_resume_seconds
+                logger.info(f"CertStream stream resumed after {self.last_resume_seconds:.1f} seconds")
         
         # Start ping thread if enabled
         if self.ping_interval > 0:
@@ -163,70 +350,218 @@ class CertStreamClient:
             ping_thread.start()
     
     def _connect(self):
-        """Establish WebSocket connection with proxy support."""
-        try:
-            # Prepare proxy configuration
-            proxy_kwargs = {}
-            if not self.is_internal_url(self.url):
-                if self.http_proxy:
-                    proxy_kwargs['http_proxy_host'] = urlparse(self.http_proxy).hostname
-                    proxy_kwargs['http_proxy_port'] = urlparse(self.http_proxy).port or 8080
-            
-            # Create WebSocket connection
-            self.ws = websocket.WebSocketApp(
-                self.url,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close,
-                on_open=self._on_open
-            )
-            
-            # Run WebSocket connection (blocking)
-            self.ws.run_forever(**proxy_kwargs)
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to CertStream: {e}")
-            if self.should_reconnect:
-                time.sleep(self.reconnect_delay)
+        """Open one WebSocket connection with proxy support, blocking until it is closed."""
+        # Prepare proxy configuration
+        proxy_kwargs = {}
+        if not self.is_internal_url(self.url):
+            if self.http_proxy:
+                proxy_kwargs['http_proxy_host'] = urlparse(self.http_proxy).hostname
+                proxy_kwargs['http_proxy_port'] = urlparse(self.http_proxy).port or 8080
+
+        # Create WebSocket connection
+        self.ws = websocket.WebSocketApp(
+            self.url,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close,
+            on_open=self._on_open
+        )
+
+        # Run WebSocket connection (blocking)
+        self.ws.run_forever(**proxy_kwargs)
+
+    def backoff_delay(self):
+        """
+        Return the seconds to wait before the next reconnection attempt: reconnect_delay doubled for each consecutive
+        failure, bounded by max_reconnect_delay, with full jitter on the upper half so that restarted listeners do not
+        reconnect in lockstep.
+        """
+        delay = min(self.max_reconnect_delay, self.reconnect_delay * 2 ** min(self.failures, 16))
+        return random.uniform(delay / 2, delay)
+
+    def _run(self):
+        """Connect, and reconnect with backoff each time the connection ends, until stop() is called."""
+        self.started_at = time.monotonic()
+        while self.should_reconnect:
+            try:
                 self._connect()
-    
+            except Exception as e:
+                logger.error(f"Failed to connect to CertStream: {e}")
+
+            now = time.monotonic()
+            with self.counters_lock:
+                # A connection which delivered frames resets the backoff
+                if self.connected and self.received > self.received_at_open:
+                    self.failures = 0
+                else:
+                    self.failures += 1
+                if self.connected or self.disconnected_at is None:
+                    self.disconnected_at = now
+                self.connected = False
+
+            if not self.should_reconnect:
+                break
+            delay = self.backoff_delay()
+            logger.info(f"Reconnecting to CertStream in {delay:.1f} seconds "
+                        f"({self.failures} consecutive failures)...")
+            self.stop_event.wait(delay)
+
+    def is_running(self):
+        """Return True while the connection loop is running."""
+        return self.connection_thread is not None and self.connection_thread.is_alive()
+
+    def health(self, stale_after):
+        """
+        Return (healthy, reason). The listener is healthy when its connection loop is running and a frame was
+        received in the last stale_after seconds (or since it was started).
+
+        :param stale_after: Seconds without frame after which the stream is considered stalled.
+        """
+        if not self.is_running():
+            return False, "listener is not running"
+        now = time.monotonic()
+        with self.counters_lock:
+            last_activity = self.last_message_at if self.last_message_at is not None else self.started_at
+        if last_activity is not None and now - last_activity > stale_after:
+            return False, f"no frame received for {now - last_activity:.0f} seconds"
+        return True, "ok"
+
     def start(self):
         """Start CertStream client in background thread."""
-        if self.connection_thread and self.connection_thread.is_alive():
+        if self.is_running():
             logger.warning("CertStream client already running")
             return
-        
+
         self.should_reconnect = True
-        self.connection_thread = threading.Thread(target=self._connect, daemon=True)
+        self.stop_event.clear()
+        self.start_workers()
+        self.connection_thread = threading.Thread(target=self._run, name="certstream-listener", daemon=True)
         self.connection_thread.start()
         logger.info("CertStream client started in background")
-    
-    def stop(self):
-        """Stop CertStream client."""
+
+    def stop(self, timeout=None):
+        """
+        Stop CertStream client.
+
+        :param timeout: Seconds to wait for the connection thread to exit (None: do not wait).
+        """
         self.should_reconnect = False
+        self.stop_event.set()
         if self.ws:
             self.ws.close()
+        self.stop_workers()
+        if timeout is not None and self.connection_thread is not None:
+            self.connection_thread.join(timeout)
         logger.info("CertStream client stopped")
 
 
-def listen_for_events(callback, url=None):
+def get_active_client():
     """
-    Listen for CertStream events (blocking function).
-    
-    This is a compatibility function that matches the certstream library API.
-    
-    :param callback: Function to call for each certificate event
-    :param url: WebSocket URL (default: from settings.CERT_STREAM_URL)
+    Return the CertStreamClient started by start_listener, or None.
     """
-    client = CertStreamClient(url=url, callback=callback)
-    
-    # Configure NO_PROXY environment to ensure internal connections work
+    return _active_client
+
+
+def _configure_no_proxy():
+    """Configure NO_PROXY environment to ensure internal connections work."""
     no_proxy = os.environ.get('NO_PROXY', '')
     if 'certstream' not in no_proxy:
         os.environ['NO_PROXY'] = f"{no_proxy},certstream,10.10.10.7" if no_proxy else "certstream,10.10.10.7"
         logger.info(f"Updated NO_PROXY: {os.environ['NO_PROXY']}")
-    
-    logger.info(f"Starting CertStream listener on {client.url}")
-    
-    # Start client (blocking call)
-    client._connect()
+
+
+def start_listener(callback, url=None, prefilter=None):
+    """
+    Start the process-wide CertStream listener in background, unless it is already running.
+    Frames are processed by DNS_FINDER_CERTSTREAM_WORKERS threads through a bounded queue.
+
+    :param callback: Function to call for each certificate event
+    :param url: WebSocket URL (default: from settings.CERT_STREAM_URL)
+    :param prefilter: Function called with each raw frame, frames for which it returns False are not decoded
+    :return: The running CertStreamClient.
+    """
+    global _active_client, _listener_disabled
+    from django.conf import settings
+
+    with _listener_lock:
+        _listener_disabled = False
+        if _active_client is not None and _active_client.is_running():
+            if _active_client.stop_event.is_set():
+                raise RuntimeError("The previous CertStream listener is still stopping")
+            return _active_client
+
+        _configure_no_proxy()
+        client = CertStreamClient(
+            url=url,
+            callback=callback,
+            workers=settings.DNS_FINDER_CERTSTREAM_WORKERS,
+            queue_size=settings.DNS_FINDER_CERTSTREAM_QUEUE_SIZE,
+            overflow=settings.DNS_FINDER_CERTSTREAM_OVERFLOW,
+            prefilter=prefilter,
+            reconnect_delay=settings.DNS_FINDER_CERTSTREAM_RECONNECT_DELAY,
+            max_reconnect_delay=settings.DNS_FINDER_CERTSTREAM_MAX_RECONNECT_DELAY,
+        )
+        logger.info(f"Starting CertStream listener on {client.url}")
+        client.start()
+        _active_client = client
+        return client
+
+
+def stop_listener(timeout=10, disable=False):
+    """
+    Stop the process-wide CertStream listener, if any.
+    The listener is only forgotten once its connection thread exited, so that a new one is never started next to it.
+
+    :param timeout: Seconds to wait for the connection thread to exit.
+    :param disable: Keep the listener stopped until the next start_listener() call.
+    :return: False when the connection thread is still running after timeout.
+    """
+    global _active_client, _listener_disabled
+    with _listener_lock:
+        if disable:
+            _listener_disabled = True
+        client = _active_client
+        if client is None:
+            return True
+        client.stop(timeout=timeout)
+        if client.is_running():
+            logger.warning(f"CertStream listener still running {timeout} seconds after being stopped")
+            return False
+        _active_client = None
+        return True
+
+
+def is_listener_disabled():
+    """
+    Return True when the listener was stopped with stop_listener(disable=True) and not started since.
+    """
+    return _listener_disabled
+
+
+def listener_health():
+    """
+    Return (healthy, reason) for the process-wide CertStream listener.
+    """
+    from django.conf import settings
+
+    client = _active_client
+    if client is None:
+        return False, "listener is disabled" if _listener_disabled else "listener is not started"
+    if client.stop_event.is_set():
+        return False, "listener is stopping"
+    return client.health(settings.DNS_FINDER_CERTSTREAM_STALE_TIMEOUT)
+
+
+def listen_for_events(callback, url=None, prefilter=None):
+    """
+    Listen for CertStream events (blocking function).
+
+    This is a compatibility function that matches the certstream library API: it starts the process-wide listener,
+    or reuses the running one, and waits for it to be stopped.
+
+    :param callback: Function to call for each certificate event
+    :param url: WebSocket URL (default: from settings.CERT_STREAM_URL)
+    :param prefilter: Function called with each raw frame, frames for which it returns False are not decoded
+    """
+    client = start_listener(callback, url=url, prefilter=prefilter)
+    client.connection_thread.join()
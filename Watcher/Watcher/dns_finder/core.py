@@ -1,16 +1,20 @@
 # coding=utf-8
-import os
-import six
-import subprocess
-import json
 import logging
+import queue
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
 from django.utils import timezone
 from connectors.core import get_certstream_config
 from apscheduler.schedulers.background import BackgroundScheduler
 import tzlocal
-from .models import Alert, DnsMonitored, DnsTwisted, Subscriber, KeywordMonitored
-from common.models import LegitimateDomain
+from .models import Alert, DnsMonitored, DnsTwisted, Subscriber
+from common.legitimate_domains import get_legitimate_domain_index
 from . import certstream_client
+from .matcher import get_certificate_matcher, add_twisted_domains
+from .dnstwist_scanner import generate_permutations, iter_resolved_permutations, load_tld_dictionary
+from .permutation_store import select_due_permutations, record_resolutions
 from common.core import send_app_specific_notifications
 from common.core import send_app_specific_notifications_group
 from common.core import send_only_thehive_notifications
@@ -23,15 +27,16 @@ def start_scheduler():
     """
     Launch multiple planning tasks in background:
         - Fire main_dns_twist from Monday to Sunday: every 2 hours.
-        - Fire main_certificate_transparency from Monday to Sunday: every hour.
+        - Fire main_certificate_transparency from Monday to Sunday: every 5 minutes, it starts the CertStream
+          listener and restarts it when it is not healthy.
     """
     scheduler = BackgroundScheduler(timezone=str(tzlocal.get_localzone()))
     scheduler.add_job(main_dns_twist, 'cron', day_of_week='mon-sun', hour='*/2', id='main_dns_twist',
                       max_instances=10,
                       replace_existing=True)
-    scheduler.add_job(main_certificate_transparency, 'cron', day_of_week='mon-sun', hour='*/1',
+    scheduler.add_job(main_certificate_transparency, 'cron', day_of_week='mon-sun', minute='*/5',
                       id='main_certificate_transparency',
-                      max_instances=2,
+                      max_instances=1,
                       replace_existing=True)
 
     scheduler.start()
@@ -44,11 +49,7 @@ def in_dns_monitored(domain):
     :param domain: Domain to search (Str).
     :rtype: bool
     """
-    is_in = False
-    for dns_monitored in DnsMonitored.objects.all():
-        if dns_monitored.domain_name in domain:
-            is_in = True
-    return is_in
+    return get_certificate_matcher().in_dns_monitored(domain)
 
 
 def is_legitimate_domain(domain):
@@ -58,21 +59,14 @@ def is_legitimate_domain(domain):
     :param domain: Domain to check (Str).
     :rtype: bool
     """
-    # Get all legitimate domains
-    legitimate_domains = LegitimateDomain.objects.values_list('domain_name', flat=True)
-    
-    # Check exact match
-    if domain in legitimate_domains:
+    legit_domain = get_legitimate_domain_index().get_parent(domain)
+    if legit_domain is None:
+        return False
+    if legit_domain == domain:
         logger.info(f"Domain {domain} is in Legitimate Domains (exact match)")
-        return True
-    
-    # Check if any legitimate domain is the parent of this domain
-    for legit_domain in legitimate_domains:
-        if domain.endswith('.' + legit_domain) or domain == legit_domain:
-            logger.info(f"Domain {domain} is a subdomain of legitimate domain {legit_domain}")
-            return True
-    
-    return False
+    else:
+        logger.info(f"Domain {domain} is a subdomain of legitimate domain {legit_domain}")
+    return True
 
 
 def clean_wildcard_domain(domain):
@@ -82,52 +76,190 @@ def clean_wildcard_domain(domain):
     return domain
 
 
+def frame_may_match(frame):
+    """
+    CertStream prefilter: check the raw frame for a monitored keyword before decoding it.
+
+    :param frame: Raw CertStream frame (str or bytes).
+    :rtype: bool
+    """
+    return get_certificate_matcher().may_match_frame(frame)
+
+
+def get_certificate_domains(leaf_cert):
+    """
+    Return the unique domains of a certificate: its subject CN and its SANs (all_domains), without wildcards.
+
+    :param leaf_cert: leaf_cert dict of a CertStream event.
+    :rtype: list
+    """
+    domains = list(leaf_cert.get('all_domains') or [])
+    domains.append(leaf_cert.get('subject', {}).get('CN'))
+    return list(dict.fromkeys(clean_wildcard_domain(str(domain)) for domain in domains if domain))
+
+
 def print_callback(message, context):
     """
     Runs CertStream scan.
+    Every domain of the certificate (subject CN and SANs) is matched in memory, the database is only reached when a
+    new domain contains a keyword.
 
     :param message: event from CertStream.
     :param context: parameter from CertStream.
     """
-    domain = str(message['data']['leaf_cert']['subject']['CN'])
-    domain = clean_wildcard_domain(domain)
-
-    for keyword_monitored in KeywordMonitored.objects.all():
-        if keyword_monitored.name in domain and not DnsTwisted.objects.filter(domain_name=domain) and \
-                not in_dns_monitored(domain):
-            
-            # Check if domain is legitimate before creating alert
-            if is_legitimate_domain(domain):
-                logger.info(f"Skipping alert for {domain} - domain is in Legitimate Domains")
-                continue
-            
-            logger.info(f"Keyword {keyword_monitored.name} detected in: {domain}")
-            dns_twisted = DnsTwisted.objects.create(domain_name=domain, keyword_monitored=keyword_monitored)
-            alert = Alert.objects.create(dns_twisted=dns_twisted)
-            alert.source = 'print_callback'
-            alert.save()
-            send_dns_finder_notifications(alert)
+    matcher = get_certificate_matcher()
+    max_length = DnsTwisted._meta.get_field('domain_name').max_length
+    for domain in get_certificate_domains(message['data']['leaf_cert']):
+        keyword = matcher.match(domain)
+        if keyword is None:
+            continue
+        keyword_id, keyword_name = keyword
+
+        # Not a valid domain name (more than 253 characters), it would not fit in the database
+        if len(domain) > max_length:
+            logger.warning(f"Skipping {domain[:100]}... - domain name longer than {max_length} characters")
+            continue
+
+        # Check if domain is legitimate before creating alert
+        if is_legitimate_domain(domain):
+            logger.info(f"Skipping alert for {domain} - domain is in Legitimate Domains")
+            continue
+
+        dns_twisted, created = DnsTwisted.objects.get_or_create(domain_name=domain,
+                                                               defaults={'keyword_monitored_id': keyword_id})
+        if not created:
+            continue
+        logger.info(f"Keyword {keyword_name} detected in: {domain}")
+        alert = Alert.objects.create(dns_twisted=dns_twisted)
+        alert.source = 'print_callback'
+        alert.save()
+        send_dns_finder_notifications(alert)
 
 
 def main_certificate_transparency():
     """
-    Launch CertStream scan using internal certstream-server-go.
+    Health check of the CertStream listener using internal certstream-server-go.
+    The listener runs in background for the lifetime of the process, it is only (re)started here when it is not
+    running or when the stream is stalled.
     """
-    certstream_url = get_certstream_config()['url']
-    logger.info(f"Starting CertStream monitoring on {certstream_url}")
+    if certstream_client.is_listener_disabled():
+        logger.debug("CertStream listener disabled, not restarted")
+        return
+    healthy, reason = certstream_client.listener_health()
+    if healthy:
+        logger.debug(f"CertStream listener healthy: {certstream_client.get_active_client().stats()}")
+        return
+    if certstream_client.get_active_client() is not None:
+        logger.warning(f"CertStream listener unhealthy ({reason}), restarting it")
+        if not certstream_client.stop_listener():
+            logger.warning("CertStream listener restart postponed to the next health check")
+            return
+
     try:
-        certstream_client.listen_for_events(print_callback, url=certstream_url)
+        start_certificate_transparency()
     except Exception as e:
         logger.error(f"CertStream connection failed: {e}")
         raise
 
 
+def start_certificate_transparency():
+    """
+    Start the CertStream listener on the configured certstream-server-go, unless it is already running.
+
+    :return: The running CertStreamClient.
+    """
+    certstream_url = get_certstream_config()['url']
+    logger.info(f"Starting CertStream monitoring on {certstream_url}")
+    return certstream_client.start_listener(print_callback, url=certstream_url, prefilter=frame_may_match)
+
+
 def main_dns_twist():
     """
-    Launch dnstwist algorithm.
+    Launch dnstwist algorithm on every monitored domain.
     """
-    for dns_monitored in DnsMonitored.objects.all():
-        check_dnstwist(dns_monitored)
+    run_dnstwist_scans(list(DnsMonitored.objects.all()))
+
+
+def scan_dnstwist(dns_monitored, permutations, results):
+    """
+    Resolve dnstwist permutations of one monitored domain, putting each one in results as soon as it is resolved,
+    then a None end marker.
+
+    :param dns_monitored: DnsMonitored Object.
+    :param permutations: List of dnstwist.Permutation to resolve.
+    :param results: Queue of (DnsMonitored, resolved dnstwist.Permutation or None).
+    """
+    logger.info(f'Runs dnstwist for: {dns_monitored.domain_name}')
+    try:
+        for permutation in iter_resolved_permutations(dns_monitored.domain_name, permutations,
+                                                      threads=settings.DNS_FINDER_DNSTWIST_THREADS,
+                                                      timeout=settings.DNS_FINDER_DNSTWIST_TIMEOUT):
+            results.put((dns_monitored, permutation))
+    except TimeoutError as e:
+        logger.error(f"dnstwist timed out for {dns_monitored.domain_name}: {e}")
+    except Exception as e:
+        logger.error(f"dnstwist failed for {dns_monitored.domain_name}: {e}")
+    finally:
+        results.put((dns_monitored, None))
+
+
+def run_dnstwist_scans(dns_monitored_list):
+    """
+    Runs dnstwist on up to DNS_FINDER_DNSTWIST_CONCURRENCY monitored domains in parallel.
+    Only the permutations due for a rescan are resolved (see permutation_store). Resolved permutations are streamed
+    back to this thread, which stores their state, persists the registered ones and sends the alerts as soon as they
+    are found, grouping the results which arrive together.
+
+    :param dns_monitored_list: List of DnsMonitored Objects.
+    """
+    if not dns_monitored_list:
+        return
+    results = queue.Queue()
+    running = 0
+    resolved_count = 0
+    alerts_count = 0
+    persist_time = 0.0
+    start = time.perf_counter()
+    tld_dictionary = load_tld_dictionary()
+
+    with ThreadPoolExecutor(max_workers=settings.DNS_FINDER_DNSTWIST_CONCURRENCY,
+                            thread_name_prefix='dnstwist') as executor:
+        for dns_monitored in dns_monitored_list:
+            permutations = generate_permutations(dns_monitored.domain_name, tld_dictionary)
+            due = select_due_permutations(dns_monitored, permutations)
+            if due:
+                executor.submit(scan_dnstwist, dns_monitored, due, results)
+                running += 1
+
+        while running:
+            pending = defaultdict(list)
+            finished = list()
+            item = results.get()
+            while True:
+                dns_monitored, permutation = item
+                if permutation is None:
+                    finished.append(dns_monitored)
+                else:
+                    pending[dns_monitored].append(permutation)
+                try:
+                    item = results.get_nowait()
+                except queue.Empty:
+                    break
+
+            persist_start = time.perf_counter()
+            for dns_monitored, permutations in pending.items():
+                record_resolutions(dns_monitored, permutations)
+                registered = [dict(permutation) for permutation in permutations if permutation.is_registered()]
+                if registered:
+                    alerts_count += len(persist_dnstwist_results(dns_monitored, registered))
+                resolved_count += len(permutations)
+            persist_time += time.perf_counter() - persist_start
+            for dns_monitored in finished:
+                logger.info(f"dnstwist: Successfully processed: {dns_monitored.domain_name}")
+            running -= len(finished)
+
+    logger.info(f"dnstwist run: {len(dns_monitored_list)} domains, {resolved_count} permutations resolved, "
+                f"{alerts_count} alerts in {time.perf_counter() - start:.1f}s ({persist_time:.2f}s persisting)")
 
 
 def check_dnstwist(dns_monitored):
@@ -137,73 +269,71 @@ def check_dnstwist(dns_monitored):
     :param dns_monitored: DnsMonitored Object.
     :return:
     """
-    logger.info(f'Runs dnstwist for: {dns_monitored.domain_name}')
-    logger.info('-----------------------------')
-    alerts_list = list()
-    filepath_out = "./dns_finder/data/list.json"
-    filepath_tlds = "./dns_finder/data/abused_tlds.dict"
-
-    if os.path.exists(filepath_out):
-        os.remove(filepath_out)
-
-    subprocess.check_output(map(six.text_type, [
-        'dnstwist',
-        '--registered',
-        '--format={}'.format("json"),
-        '--output={}'.format(filepath_out),
-        '--tld={}'.format(filepath_tlds),
-        '{}'.format(dns_monitored.domain_name),
-    ]))
-
-    with open('dns_finder/data/list.json') as json_file:
-        try:
-            domains = json.load(json_file)
-            for twisted_website_dict in domains:
-                twisted_domain = clean_wildcard_domain(twisted_website_dict['domain'])
-                dns_ns = False
-                dns_a = False
-                dns_aaaa = False
-                dns_mx = False
-                if 'dns_a' in twisted_website_dict:
-                    if twisted_website_dict['dns_a'] != ['!ServFail']:
-                        dns_a = True
-                if 'dns_aaaa' in twisted_website_dict:
-                    if twisted_website_dict['dns_aaaa'] != ['!ServFail']:
-                        dns_aaaa = True
-                if 'dns_mx' in twisted_website_dict:
-                    if twisted_website_dict['dns_mx'] != ['!ServFail']:
-                        dns_mx = True
-                if 'dns_ns' in twisted_website_dict:
-                    if twisted_website_dict['dns_ns'] != ['!ServFail']:
-                        dns_ns = True
-                # Check if there is at least one DNS entry
-                if dns_ns or dns_a or dns_aaaa or dns_mx:
-                    if twisted_website_dict['domain'] != dns_monitored.domain_name:
-                        # Check if domain is legitimate before creating alert
-                        if is_legitimate_domain(twisted_domain):
-                            logger.info(f"Skipping alert for {twisted_domain} - domain is in Legitimate Domains")
-                            continue
-                        
-                        # If it is a new domain name, we create it
-                        if not DnsTwisted.objects.filter(domain_name=twisted_website_dict['domain']):
-                            dns_twisted = DnsTwisted.objects.create(domain_name=twisted_website_dict['domain'],
-                                                                    dns_monitored=dns_monitored,
-                                                                    fuzzer=twisted_website_dict['fuzzer'])
-                            alert = Alert.objects.create(dns_twisted=dns_twisted)
-                            alert.source = 'check_dnstwist'
-                            alert.save()
-                            alerts_list.append(alert)
-
-            # Send email alerts
-            if len(alerts_list) < 6:
-                for alert in alerts_list:
-                    send_dns_finder_notifications(alert)
-            if len(alerts_list) >= 6:
-                send_dns_finder_notifications_group(dns_monitored, len(alerts_list), alerts_list)
-        except ValueError:
-            logger.error('Decoding JSON has failed')
-
-    logger.info(f"dnstwist: Successfully processed: {dns_monitored.domain_name}")
+    run_dnstwist_scans([dns_monitored])
+
+
+def has_dns_record(twisted_website_dict):
+    """
+    Check if a dnstwist result has at least one DNS entry which is not a ServFail.
+    """
+    return any(record in twisted_website_dict and twisted_website_dict[record] != ['!ServFail']
+               for record in ('dns_ns', 'dns_a', 'dns_aaaa', 'dns_mx'))
+
+
+def persist_dnstwist_results(dns_monitored, domains):
+    """
+    Create the new twisted domains found by dnstwist for a monitored domain, with their alerts, and send the
+    notifications.
+    Known twisted domains are fetched with one query, new DnsTwisted and Alert rows are bulk created.
+
+    :param dns_monitored: DnsMonitored Object.
+    :param domains: List of dnstwist result dicts.
+    :return: List of the created Alert Objects.
+    """
+    start = time.perf_counter()
+    candidates = dict()
+    for twisted_website_dict in domains:
+        # Check if there is at least one DNS entry
+        if not has_dns_record(twisted_website_dict) or twisted_website_dict['domain'] == dns_monitored.domain_name:
+            continue
+        twisted_domain = clean_wildcard_domain(twisted_website_dict['domain'])
+        # Check if domain is legitimate before creating alert
+        if is_legitimate_domain(twisted_domain):
+            logger.info(f"Skipping alert for {twisted_domain} - domain is in Legitimate Domains")
+            continue
+        candidates.setdefault(twisted_website_dict['domain'], twisted_website_dict['fuzzer'])
+    if not candidates:
+        return []
+
+    # If it is a new domain name, we create it
+    known = set(DnsTwisted.objects.filter(domain_name__in=list(candidates)).values_list('domain_name', flat=True))
+    new_domains = [domain for domain in candidates if domain not in known]
+    if not new_domains:
+        return []
+    DnsTwisted.objects.bulk_create([DnsTwisted(domain_name=domain, dns_monitored=dns_monitored,
+                                               fuzzer=candidates[domain]) for domain in new_domains],
+                                   batch_size=500, ignore_conflicts=True)
+    # Primary keys are not returned by bulk_create on MySQL, and a concurrent CertStream match may have won the insert
+    created_ids = list(DnsTwisted.objects.filter(domain_name__in=new_domains, dns_monitored=dns_monitored)
+                       .values_list('id', flat=True))
+    Alert.objects.bulk_create([Alert(dns_twisted_id=dns_twisted_id) for dns_twisted_id in created_ids],
+                              batch_size=500)
+    # Only once the alerts exist, the CertStream matcher must not skip domains which were never alerted
+    add_twisted_domains(new_domains)
+    alerts_list = list(Alert.objects.filter(dns_twisted_id__in=created_ids)
+                       .select_related('dns_twisted__dns_monitored', 'dns_twisted__keyword_monitored'))
+    for alert in alerts_list:
+        alert.source = 'check_dnstwist'
+    logger.info(f"dnstwist: {len(alerts_list)} new twisted domains for {dns_monitored.domain_name} "
+                f"({len(candidates)} registered candidates) persisted in {time.perf_counter() - start:.2f}s")
+
+    # Send email alerts
+    if len(alerts_list) < 6:
+        for alert in alerts_list:
+            send_dns_finder_notifications(alert)
+    if len(alerts_list) >= 6:
+        send_dns_finder_notifications_group(dns_monitored, len(alerts_list), alerts_list)
+    return alerts_list
 
 
 def send_dns_finder_notifications(alert):
@@ -0,0 +1,112 @@
+import logging
+import queue
+import re
+import threading
+import time
+import dnstwist
+
+logger = logging.getLogger('watcher.dns_finder')
+
+TLD_DICTIONARY = "./dns_finder/data/abused_tlds.dict"
+# Same TLD validation as the dnstwist --tld option
+TLD_REGEX = re.compile(r'^[a-z0-9-]{2,63}(?:\.[a-z0-9-]{2,63})?$')
+
+
+class _ResolvedQueue(queue.Queue):
+    """
+    Job queue of the dnstwist Scanner threads, which reports each permutation to the resolved queue once the thread
+    which took it calls task_done().
+    """
+
+    def __init__(self, resolved):
+        super().__init__()
+        self.resolved = resolved
+        self.current = dict()
+        self.current_lock = threading.Lock()
+
+    def get(self, block=True, timeout=None):
+        task = super().get(block, timeout)
+        with self.current_lock:
+            self.current[threading.get_ident()] = task
+        return task
+
+    def task_done(self):
+        with self.current_lock:
+            task = self.current.pop(threading.get_ident(), None)
+        if task is not None:
+            self.resolved.put(task)
+        super().task_done()
+
+    def clear(self):
+        with self.mutex:
+            self.queue.clear()
+
+
+def load_tld_dictionary(path=TLD_DICTIONARY):
+    """
+    Return the TLDs used by the tld-swap fuzzer.
+    """
+    with open(path, encoding='utf-8') as tld_file:
+        return [tld for tld in set(tld_file.read().lower().splitlines()) if TLD_REGEX.match(tld)]
+
+
+def generate_permutations(domain_name, tld_dictionary=None):
+    """
+    Return the dnstwist permutations of domain_name, without the original domain.
+
+    :param domain_name: Domain to twist (Str).
+    :param tld_dictionary: TLDs of the tld-swap fuzzer (default: abused_tlds.dict).
+    :return: List of dnstwist.Permutation.
+    """
+    if tld_dictionary is None:
+        tld_dictionary = load_tld_dictionary()
+    fuzzer = dnstwist.Fuzzer(domain_name, tld_dictionary=tld_dictionary)
+    fuzzer.generate()
+    return [permutation for permutation in fuzzer.domains if permutation['fuzzer'] != '*original']
+
+
+def iter_resolved_permutations(domain_name, permutations, threads, timeout):
+    """
+    Resolve the permutations of domain_name with the dnstwist Scanner threads and yield each one as soon as it is
+    resolved, registered or not (a registered permutation has DNS records, see dnstwist.Permutation.is_registered).
+
+    :param domain_name: Twisted domain (Str).
+    :param permutations: List of dnstwist.Permutation to resolve.
+    :param threads: Number of resolver threads.
+    :param timeout: Seconds after which the scan is stopped.
+    :raises TimeoutError: The permutations were not all resolved within timeout.
+    """
+    resolved = queue.Queue()
+    jobs = _ResolvedQueue(resolved)
+    for permutation in permutations:
+        jobs.put(permutation)
+
+    url = dnstwist.UrlParser(domain_name)
+    workers = list()
+    for _ in range(min(threads, len(permutations))):
+        worker = dnstwist.Scanner(jobs)
+        worker.url = url
+        worker.option_extdns = dnstwist.MODULE_DNSPYTHON
+        worker.start()
+        workers.append(worker)
+
+    deadline = time.monotonic() + timeout
+    remaining = len(permutations)
+    try:
+        while remaining:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{remaining} permutations of {domain_name} not resolved after {timeout}s")
+            try:
+                permutation = resolved.get(timeout=1)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers) and resolved.empty():
+                    logger.warning(f"dnstwist scanners of {domain_name} stopped with {remaining} permutations left")
+                    return
+                continue
+            remaining -= 1
+            yield permutation
+    finally:
+        jobs.clear()
+        for worker in workers:
+            worker.stop()
+
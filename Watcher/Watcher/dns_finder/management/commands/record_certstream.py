@@ -0,0 +1,59 @@
+from abc import ABC
+import gzip
+import threading
+import time
+from django.core.management.base import BaseCommand
+
+from dns_finder.certstream_client import CertStreamClient
+
+
+class FrameRecorder(CertStreamClient):
+    """CertStream client writing the raw frames to a file instead of processing them."""
+
+    def __init__(self, output, max_frames, **kwargs):
+        super().__init__(**kwargs)
+        self.output = output
+        self.max_frames = max_frames
+        self.done = threading.Event()
+
+    def _on_message(self, ws, message):
+        if self.done.is_set():
+            return
+        if isinstance(message, str):
+            message = message.encode()
+        self.output.write(message + b'\n')
+        with self.counters_lock:
+            self.received += 1
+            self.last_message_at = time.monotonic()
+            if self.max_frames and self.received >= self.max_frames:
+                self.done.set()
+
+
+class Command(BaseCommand, ABC):
+    help = 'Record raw CertStream frames to a gzip file (one JSON frame per line), to be replayed by ' \
+           'replay_certstream.'
+    # System checks import the urls, which start the schedulers and the live CertStream listener
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Output file, gzip compressed.')
+        parser.add_argument('--url', default=None, help='CertStream URL (default: the configured one).')
+        parser.add_argument('--frames', type=int, default=100000, help='Stop after this many frames (0: no limit).')
+        parser.add_argument('--duration', type=int, default=0, help='Stop after this many seconds (0: no limit).')
+
+    def handle(self, *args, **options):
+        with gzip.open(options['path'], 'wb') as output:
+            recorder = FrameRecorder(output, options['frames'], url=options['url'])
+            self.stdout.write(f"Recording CertStream frames from {recorder.url} to {options['path']}")
+            recorder.start()
+            start = time.monotonic()
+            try:
+                recorder.done.wait(options['duration'] or None)
+            except KeyboardInterrupt:
+                pass
+            recorder.done.set()
+            recorder.stop(timeout=10)
+            elapsed = time.monotonic() - start
+
+        self.stdout.write(f"{recorder.received} frames recorded in {elapsed:.0f} s "
+                          f"({recorder.received / elapsed:.0f} frames/s)")
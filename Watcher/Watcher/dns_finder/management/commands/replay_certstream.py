@@ -0,0 +1,103 @@
+from abc import ABC
+import gzip
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from common.utils.query_counter import QueryCounter
+from dns_finder.certstream_client import CertStreamClient, OVERFLOW_POLICIES
+from dns_finder.core import print_callback, frame_may_match
+
+
+class TimedCallback:
+    """Wrap print_callback to measure its latency and the SQL queries it runs, from any worker thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.queries = 0
+
+    def __call__(self, message, context):
+        counter = QueryCounter()
+        try:
+            with counter:
+                print_callback(message, context)
+        finally:
+            with self.lock:
+                self.latencies.append(counter.elapsed)
+                self.queries += counter.count
+
+    def percentile(self, percent):
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        return latencies[int(percent / 100 * (len(latencies) - 1))]
+
+
+class Command(BaseCommand, ABC):
+    help = 'Replay a recorded CertStream frame file (one JSON frame per line, gzip if .gz, see record_certstream) ' \
+           'through CertStreamClient and print_callback, and report the throughput, the callback latency and the ' \
+           'DB queries per frame. Alerts are created for matching certificates: run it against a test database.'
+    # System checks import the urls, which start the schedulers and the live CertStream listener
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Recorded frame file.')
+        parser.add_argument('--repeat', type=int, default=1, help='Number of passes over the recorded frames.')
+        parser.add_argument('--rate', type=float, default=0,
+                            help='Frames per second fed to the client (0: as fast as possible).')
+        parser.add_argument('--workers', type=int, default=0,
+                            help='Callback workers of the client (0: process frames on the feeding thread).')
+        parser.add_argument('--queue-size', type=int, default=settings.DNS_FINDER_CERTSTREAM_QUEUE_SIZE,
+                            help='Queue size between the feeding thread and the workers.')
+        parser.add_argument('--overflow', choices=OVERFLOW_POLICIES, default=settings.DNS_FINDER_CERTSTREAM_OVERFLOW,
+                            help='Policy when the queue is full.')
+        parser.add_argument('--prefilter', choices=('both', 'on', 'off'), default='both',
+                            help='Replay with the raw frame prefilter, without it, or both.')
+
+    def handle(self, *args, **options):
+        opener = gzip.open if options['path'].endswith('.gz') else open
+        with opener(options['path'], 'rb') as frame_file:
+            frames = [line.rstrip(b'\n') for line in frame_file if line.strip()]
+        if not frames:
+            self.stderr.write("No frame to replay")
+            return
+        self.stdout.write(f"{len(frames)} frames x {options['repeat']} passes, "
+                          f"rate {options['rate'] or 'unlimited'}, {options['workers']} workers")
+
+        modes = {'both': (False, True), 'on': (True,), 'off': (False,)}[options['prefilter']]
+        for prefilter in modes:
+            self.replay(frames, 'Prefilter' if prefilter else 'Full decoding', prefilter, options)
+
+    def replay(self, frames, label, prefilter, options):
+        callback = TimedCallback()
+        client = CertStreamClient(url='ws://localhost/replay', callback=callback,
+                                  prefilter=frame_may_match if prefilter else None, workers=options['workers'],
+                                  queue_size=options['queue_size'], overflow=options['overflow'])
+        client.start_workers()
+
+        interval = 1 / options['rate'] if options['rate'] else 0
+        start = time.perf_counter()
+        sent = 0
+        for _ in range(options['repeat']):
+            for frame in frames:
+                if interval:
+                    delay = start + sent * interval - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                client.feed(frame)
+                sent += 1
+        if client.queue is not None:
+            client.queue.join()
+        elapsed = time.perf_counter() - start
+        client.stop_workers()
+
+        stats = client.stats()
+        self.stdout.write(
+            f"{label}: {stats['received'] / elapsed:.0f} certs/s over {elapsed:.2f} s | "
+            f"{stats['filtered']} filtered, {stats['processed']} processed, {stats['dropped']} dropped, "
+            f"{stats['errors']} errors | callback p50 {callback.percentile(50) * 1000:.3f} ms, "
+            f"p99 {callback.percentile(99) * 1000:.3f} ms, max lag {stats['max_lag_seconds']:.3f} s | "
+            f"{callback.queries / stats['received']:.3f} queries/frame ({callback.queries} queries)"
+        )
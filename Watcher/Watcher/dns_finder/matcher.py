@@ -0,0 +1,148 @@
+import logging
+import re
+import threading
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from common.utils.aho_corasick import AhoCorasick
+from .models import DnsMonitored, DnsTwisted, KeywordMonitored
+
+logger = logging.getLogger('watcher.dns_finder')
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+class CertificateMatcher:
+    """
+    In-memory view of the monitored keywords, corporate domains and twisted domains, used to check every
+    certificate of the CertStream firehose without querying the database.
+    """
+
+    def __init__(self, keywords, monitored_domains, twisted_domains):
+        """
+        :param keywords: Iterable of (id, name) of :model:`dns_finder.KeywordMonitored`, in priority order.
+        :param monitored_domains: Iterable of :model:`dns_finder.DnsMonitored` names.
+        :param twisted_domains: Iterable of :model:`dns_finder.DnsTwisted` names.
+        """
+        self.keyword_ids = dict()
+        for keyword_id, name in keywords:
+            self.keyword_ids.setdefault(name, keyword_id)
+        self.priority = {name: rank for rank, name in enumerate(self.keyword_ids)}
+        self.keywords = AhoCorasick(self.keyword_ids)
+        # Non-ASCII keywords may be escaped in the raw JSON frames, the frame prefilter is then disabled
+        self.frame_prefilter = all(name.isascii() for name in self.keyword_ids)
+        frame_pattern = '|'.join(re.escape(name) for name in sorted(self.keyword_ids, key=len, reverse=True))
+        self.frame_pattern = re.compile(frame_pattern) if self.keyword_ids else None
+        self.frame_pattern_bytes = re.compile(frame_pattern.encode()) if self.keyword_ids else None
+        self.monitored = AhoCorasick(monitored_domains)
+        self.twisted = set(twisted_domains)
+
+    def may_match_frame(self, frame):
+        """
+        Cheap check of a raw CertStream frame (str or bytes) before decoding it: False when no monitored keyword
+        appears anywhere in the frame.
+        """
+        if self.frame_pattern is None:
+            return False
+        if not self.frame_prefilter:
+            return True
+        pattern = self.frame_pattern_bytes if isinstance(frame, (bytes, bytearray)) else self.frame_pattern
+        return pattern.search(frame) is not None
+
+    def match_keyword(self, domain):
+        """
+        Return the (id, name) of the first monitored keyword contained in domain, or None.
+        """
+        matched = self.keywords.matched_patterns(domain)
+        if not matched:
+            return None
+        name = min(matched, key=self.priority.__getitem__)
+        return self.keyword_ids[name], name
+
+    def in_dns_monitored(self, domain):
+        """
+        Check if one domain of the DnsMonitored list is contained in domain.
+        """
+        return self.monitored.search(domain) is not None
+
+    def match(self, domain):
+        """
+        Return the (id, name) of the monitored keyword found in domain when the domain is neither a known twisted
+        domain nor a corporate domain, otherwise None.
+        """
+        if domain in self.twisted:
+            return None
+        keyword = self.match_keyword(domain)
+        if keyword is None or self.in_dns_monitored(domain):
+            return None
+        return keyword
+
+
+def get_certificate_matcher():
+    """
+    Return the process-wide CertificateMatcher, building it on first use or after a keyword or corporate domain
+    change.
+    """
+    global _matcher
+    matcher = _matcher
+    if matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = CertificateMatcher(
+                    KeywordMonitored.objects.values_list('id', 'name'),
+                    DnsMonitored.objects.values_list('domain_name', flat=True),
+                    DnsTwisted.objects.values_list('domain_name', flat=True),
+                )
+                logger.debug(f"Certificate matcher built with {len(_matcher.keyword_ids)} keywords, "
+                             f"{len(_matcher.monitored.patterns)} corporate domains and "
+                             f"{len(_matcher.twisted)} twisted domains")
+            matcher = _matcher
+    return matcher
+
+
+@receiver(post_save, sender=KeywordMonitored)
+@receiver(post_delete, sender=KeywordMonitored)
+@receiver(post_save, sender=DnsMonitored)
+@receiver(post_delete, sender=DnsMonitored)
+def invalidate_certificate_matcher(sender, **kwargs):
+    """
+    Drop the cached CertificateMatcher when a keyword or a corporate domain is created, updated or deleted.
+    """
+    global _matcher
+    _matcher = None
+
+
+def add_twisted_domains(domain_names):
+    """
+    Add twisted domains created with bulk_create, which sends no post_save signal, to the cached CertificateMatcher.
+    """
+    matcher = _matcher
+    if matcher is not None:
+        matcher.twisted.update(domain_names)
+
+
+@receiver(post_save, sender=DnsTwisted)
+def add_twisted_domain(sender, instance, created, **kwargs):
+    """
+    Keep the twisted domains of the cached CertificateMatcher in sync, without rebuilding it for new domains.
+    """
+    global _matcher
+    matcher = _matcher
+    if matcher is None:
+        return
+    if created:
+        matcher.twisted.add(instance.domain_name)
+    else:
+        # The domain name may have been renamed
+        _matcher = None
+
+
+@receiver(post_delete, sender=DnsTwisted)
+def remove_twisted_domain(sender, instance, **kwargs):
+    """
+    Keep the twisted domains of the cached CertificateMatcher in sync without rebuilding it.
+    """
+    matcher = _matcher
+    if matcher is not None:
+        matcher.twisted.discard(instance.domain_name)
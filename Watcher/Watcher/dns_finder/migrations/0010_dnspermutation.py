@@ -0,0 +1,34 @@
+# Generated by Django 6.0.5 on 2026-10-17 14:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dns_finder', '0009_remove_dnstwisted_misp_event_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DnsPermutation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain_name', models.CharField(max_length=255)),
+                ('fuzzer', models.CharField(blank=True, max_length=100)),
+                ('registered', models.BooleanField(default=False)),
+                ('dns_records', models.JSONField(blank=True, default=dict)),
+                ('registered_at', models.DateTimeField(blank=True, null=True)),
+                ('last_resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('next_resolve_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('dns_monitored', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='permutations', to='dns_finder.dnsmonitored')),
+            ],
+            options={
+                'ordering': ['domain_name'],
+                'indexes': [models.Index(fields=['dns_monitored', 'next_resolve_at'], name='dns_permutation_due_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dns_monitored', 'domain_name'), name='unique_dns_permutation')],
+            },
+        ),
+    ]
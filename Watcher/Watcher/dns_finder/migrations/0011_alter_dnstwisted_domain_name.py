@@ -0,0 +1,18 @@
+# Generated by Django 6.0.5 on 2026-10-17 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dns_finder', '0010_dnspermutation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dnstwisted',
+            name='domain_name',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
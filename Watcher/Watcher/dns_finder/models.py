@@ -43,7 +43,7 @@ class DnsTwisted(models.Model):
     """
     Twisted dns: typosquatting, phishing attacks, fraud, and brand impersonation.
     """
-    domain_name = models.CharField(max_length=100, unique=True)
+    domain_name = models.CharField(max_length=255, unique=True)
     dns_monitored = models.ForeignKey(DnsMonitored, on_delete=models.CASCADE, blank=True, null=True)
     keyword_monitored = models.ForeignKey(KeywordMonitored, on_delete=models.CASCADE, blank=True, null=True)
     fuzzer = models.CharField(max_length=100, blank=True, null=True)
@@ -58,6 +58,33 @@ class DnsTwisted(models.Model):
         return self.domain_name
 
 
+class DnsPermutation(models.Model):
+    """
+    Last DNS resolution of a dnstwist permutation of a :model:`dns_finder.DnsMonitored`, used to only re-resolve the
+    permutations due for a rescan.
+    """
+    dns_monitored = models.ForeignKey(DnsMonitored, on_delete=models.CASCADE, related_name='permutations')
+    domain_name = models.CharField(max_length=255)
+    fuzzer = models.CharField(max_length=100, blank=True)
+    registered = models.BooleanField(default=False)
+    dns_records = models.JSONField(default=dict, blank=True)
+    registered_at = models.DateTimeField(null=True, blank=True)
+    last_resolved_at = models.DateTimeField(null=True, blank=True)
+    next_resolve_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["domain_name"]
+        constraints = [
+            models.UniqueConstraint(fields=['dns_monitored', 'domain_name'], name='unique_dns_permutation'),
+        ]
+        indexes = [
+            models.Index(fields=['dns_monitored', 'next_resolve_at'], name='dns_permutation_due_idx'),
+        ]
+
+    def __str__(self):
+        return self.domain_name
+
+
 class Alert(models.Model):
     """
     Triggered when there is a new twisted dns.
@@ -0,0 +1,91 @@
+import logging
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+from .models import DnsPermutation
+
+logger = logging.getLogger('watcher.dns_finder')
+
+DNS_RECORDS = ('dns_ns', 'dns_a', 'dns_aaaa', 'dns_mx')
+
+
+def rescan_interval(registered, registered_at, now):
+    """
+    Return the delay before the next resolution of a permutation, following its tier:
+        - hot: registered for less than DNS_FINDER_PERMUTATION_HOT_DAYS, rescanned every run.
+        - registered: rescanned every DNS_FINDER_PERMUTATION_REGISTERED_RESCAN hours.
+        - unregistered long tail: rescanned every DNS_FINDER_PERMUTATION_UNREGISTERED_RESCAN hours.
+    Intervals are jittered down to half their value, so that the long tail is spread over the runs.
+
+    :rtype: timedelta
+    """
+    if registered and registered_at and now - registered_at < timedelta(days=settings.DNS_FINDER_PERMUTATION_HOT_DAYS):
+        return timedelta(0)
+    if registered:
+        hours = settings.DNS_FINDER_PERMUTATION_REGISTERED_RESCAN
+    else:
+        hours = settings.DNS_FINDER_PERMUTATION_UNREGISTERED_RESCAN
+    return timedelta(hours=hours * random.uniform(0.5, 1))
+
+
+def select_due_permutations(dns_monitored, permutations, now=None):
+    """
+    Sync the stored permutations of dns_monitored with the generated ones and return the ones due for a resolution:
+    new permutations and the ones whose rescan time is reached.
+
+    :param dns_monitored: DnsMonitored Object.
+    :param permutations: List of dnstwist.Permutation generated for dns_monitored.
+    :return: List of dnstwist.Permutation to resolve.
+    """
+    now = now or timezone.now()
+    next_resolve_at = dict(
+        DnsPermutation.objects.filter(dns_monitored=dns_monitored).values_list('domain_name', 'next_resolve_at')
+    )
+    generated = {permutation['domain']: permutation for permutation in permutations}
+
+    new = [DnsPermutation(dns_monitored=dns_monitored, domain_name=domain, fuzzer=permutation['fuzzer'],
+                          next_resolve_at=now)
+           for domain, permutation in generated.items() if domain not in next_resolve_at]
+    if new:
+        DnsPermutation.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+    stale = [domain for domain in next_resolve_at if domain not in generated]
+    for start in range(0, len(stale), 1000):
+        DnsPermutation.objects.filter(dns_monitored=dns_monitored, domain_name__in=stale[start:start + 1000]).delete()
+
+    due = [permutation for domain, permutation in generated.items()
+           if domain not in next_resolve_at or next_resolve_at[domain] <= now]
+    logger.info(f"dnstwist: {len(due)}/{len(generated)} permutations of {dns_monitored.domain_name} due "
+                f"({len(new)} new)")
+    return due
+
+
+def record_resolutions(dns_monitored, permutations, now=None):
+    """
+    Store the result of the resolution of permutations and schedule their next one.
+
+    :param dns_monitored: DnsMonitored Object.
+    :param permutations: List of resolved dnstwist.Permutation.
+    """
+    if not permutations:
+        return
+    now = now or timezone.now()
+    resolved = {permutation['domain']: permutation for permutation in permutations}
+    states = list()
+    domains = list(resolved)
+    for start in range(0, len(domains), 1000):
+        states += DnsPermutation.objects.filter(dns_monitored=dns_monitored,
+                                                domain_name__in=domains[start:start + 1000])
+
+    for state in states:
+        permutation = resolved[state.domain_name]
+        registered = permutation.is_registered()
+        if registered and not state.registered:
+            state.registered_at = now
+        state.registered = registered
+        state.dns_records = {record: permutation[record] for record in DNS_RECORDS if record in permutation}
+        state.last_resolved_at = now
+        state.next_resolve_at = now + rescan_interval(registered, state.registered_at, now)
+    DnsPermutation.objects.bulk_update(states, ['registered', 'registered_at', 'dns_records', 'last_resolved_at',
+                                                'next_resolve_at'], batch_size=500)
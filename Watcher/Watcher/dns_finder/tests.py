@@ -104,21 +104,327 @@ class CoreTest(TestCase):
         
         self.assertTrue(mock_notifications.called)
     
-    @patch('dns_finder.core.subprocess.check_output')
-    def test_check_dnstwist(self, mock_subprocess):
+    @patch('dns_finder.core.iter_resolved_permutations')
+    @patch('dns_finder.core.generate_permutations')
+    def test_check_dnstwist(self, mock_generate, mock_resolve):
         """Test dnstwist checking."""
+        from dnstwist import Permutation
         from dns_finder.core import check_dnstwist
         
-        mock_subprocess.return_value = b'{"domain": "test.com"}'
+        permutations = [Permutation(fuzzer="addition", domain="twisted.com"),
+                        Permutation(fuzzer="addition", domain="unregistered.com")]
+        mock_generate.return_value = permutations
+        permutations[0]['dns_a'] = ["1.2.3.4"]
+        mock_resolve.return_value = iter(permutations)
         
         dns = DnsMonitored.objects.create(domain_name="dnstwist-test.com")
+        check_dnstwist(dns)
         
-        with patch('dns_finder.core.open', create=True) as mock_open:
-            mock_open.return_value.__enter__.return_value.read.return_value = '[{"domain": "twisted.com", "fuzzer": "addition"}]'
-            
-            check_dnstwist(dns)
-            
-            self.assertTrue(mock_subprocess.called)
+        self.assertTrue(mock_resolve.called)
+        self.assertTrue(DnsTwisted.objects.filter(domain_name="twisted.com", dns_monitored=dns).exists())
+        self.assertFalse(DnsTwisted.objects.filter(domain_name="unregistered.com").exists())
+
+    @patch('dns_finder.core.persist_dnstwist_results')
+    @patch('dns_finder.core.iter_resolved_permutations')
+    @patch('dns_finder.core.generate_permutations')
+    def test_main_dns_twist_parallel(self, mock_generate, mock_resolve, mock_persist):
+        """Results are persisted as they stream in, a timed out domain does not prevent the others."""
+        from dnstwist import Permutation
+        from dns_finder.core import main_dns_twist
+
+        mock_generate.side_effect = lambda domain_name, tlds: [
+            Permutation(fuzzer="addition", domain=f"{prefix}{domain_name}") for prefix in "xy"]
+
+        def resolve(domain_name, permutations, threads, timeout):
+            for permutation in permutations:
+                permutation['dns_a'] = ["1.2.3.4"]
+                yield permutation
+                if domain_name == "slow.com":
+                    raise TimeoutError("timed out")
+
+        mock_resolve.side_effect = resolve
+        for name in ("a.com", "b.com", "slow.com"):
+            DnsMonitored.objects.create(domain_name=name)
+        main_dns_twist()
+
+        persisted = sorted(domain["domain"] for call in mock_persist.call_args_list for domain in call.args[1])
+        self.assertEqual(persisted, ["xa.com", "xb.com", "xslow.com", "ya.com", "yb.com"])
+
+
+class PersistDnstwistResultsTest(TestCase):
+    """Test the bulk persistence of the dnstwist results."""
+
+    @patch('dns_finder.core.send_dns_finder_notifications_group')
+    def test_bulk_persist(self, mock_group):
+        from common.legitimate_domains import invalidate_legitimate_domain_index
+        from common.models import LegitimateDomain
+        from dns_finder.core import persist_dnstwist_results
+
+        dns = DnsMonitored.objects.create(domain_name="example.com")
+        DnsTwisted.objects.create(domain_name="known-example.com")
+        LegitimateDomain.objects.create(domain_name="example.net")
+        invalidate_legitimate_domain_index(sender=None)
+        domains = [{"domain": f"example{i}.com", "fuzzer": "addition", "dns_a": ["1.2.3.4"]} for i in range(10)]
+        domains += [
+            {"domain": "example0.com", "fuzzer": "addition", "dns_a": ["1.2.3.4"]},
+            {"domain": "known-example.com", "fuzzer": "hyphenation", "dns_ns": ["ns1.known.com"]},
+            {"domain": "mail.example.net", "fuzzer": "subdomain", "dns_mx": ["mx.example.net"]},
+            {"domain": "examp1e.com", "fuzzer": "homoglyph", "dns_a": ["!ServFail"]},
+            {"domain": "example.com", "fuzzer": "*original", "dns_a": ["1.2.3.4"]},
+        ]
+
+        with self.assertNumQueries(6):
+            alerts = persist_dnstwist_results(dns, domains)
+
+        self.assertEqual(len(alerts), 10)
+        self.assertTrue(all(alert.source == 'check_dnstwist' for alert in alerts))
+        self.assertEqual(DnsTwisted.objects.filter(dns_monitored=dns).count(), 10)
+        mock_group.assert_called_once_with(dns, 10, alerts)
+
+    def test_has_dns_record(self):
+        from dns_finder.core import has_dns_record
+        self.assertTrue(has_dns_record({"domain": "example0.com", "dns_a": ["1.2.3.4"]}))
+        self.assertTrue(has_dns_record({"domain": "example0.com", "dns_mx": None}))
+        self.assertFalse(has_dns_record({"domain": "example0.com", "dns_a": ["!ServFail"]}))
+        self.assertFalse(has_dns_record({"domain": "example0.com"}))
+
+
+class PermutationStoreTest(TestCase):
+    """Test the tiered rescan of the dnstwist permutations."""
+
+    def setUp(self):
+        self.dns = DnsMonitored.objects.create(domain_name="example.com")
+
+    def test_only_due_permutations_resolved(self):
+        from datetime import timedelta
+        from dnstwist import Permutation
+        from dns_finder.models import DnsPermutation
+        from dns_finder.permutation_store import select_due_permutations, record_resolutions
+
+        now = timezone.now()
+        permutations = [Permutation(fuzzer="addition", domain=f"example{i}.com") for i in range(3)]
+        due = select_due_permutations(self.dns, permutations, now)
+        self.assertEqual(len(due), 3)
+
+        due[0]['dns_a'] = ["1.2.3.4"]
+        record_resolutions(self.dns, due, now)
+        hot = DnsPermutation.objects.get(domain_name="example0.com")
+        self.assertEqual((hot.registered, hot.registered_at, hot.next_resolve_at), (True, now, now))
+        self.assertEqual(hot.dns_records, {'dns_a': ["1.2.3.4"]})
+
+        # The registered permutation is hot, the unregistered ones wait for the long tail rescan
+        later = now + timedelta(hours=2)
+        self.assertEqual([p['domain'] for p in select_due_permutations(self.dns, permutations, later)],
+                         ["example0.com"])
+        much_later = now + timedelta(days=8)
+        self.assertEqual(len(select_due_permutations(self.dns, permutations, much_later)), 3)
+
+        # Permutations no longer generated are dropped
+        select_due_permutations(self.dns, permutations[:1], much_later)
+        self.assertEqual(DnsPermutation.objects.count(), 1)
+
+
+class CertificateMatcherTest(TestCase):
+    """Test the in-memory matching of CertStream certificates."""
+
+    def setUp(self):
+        from dns_finder.matcher import invalidate_certificate_matcher
+        invalidate_certificate_matcher(sender=None)
+        self.keyword = KeywordMonitored.objects.create(name="acme")
+        DnsMonitored.objects.create(domain_name="acme.com")
+
+    @staticmethod
+    def message(domain):
+        return {'data': {'leaf_cert': {'subject': {'CN': domain}}}}
+
+    @patch('dns_finder.core.send_dns_finder_notifications')
+    def test_print_callback(self, mock_notifications):
+        from dns_finder.core import print_callback
+        print_callback(self.message("*.acme-login.net"), None)
+        print_callback(self.message("acme-login.net"), None)
+        print_callback(self.message("mail.acme.com"), None)
+
+        twisted = DnsTwisted.objects.get()
+        self.assertEqual((twisted.domain_name, twisted.keyword_monitored), ("acme-login.net", self.keyword))
+        self.assertEqual(Alert.objects.count(), 1)
+        mock_notifications.assert_called_once()
+
+    def test_no_query_on_miss(self):
+        from dns_finder.core import print_callback
+        print_callback(self.message("unrelated.org"), None)
+        with self.assertNumQueries(0):
+            for domain in ("unrelated.org", "mail.acme.com", "*.example.net"):
+                print_callback(self.message(domain), None)
+
+    def test_refreshed_on_change(self):
+        from dns_finder.matcher import get_certificate_matcher
+        self.assertIsNone(get_certificate_matcher().match("globex-login.net"))
+        KeywordMonitored.objects.create(name="globex")
+        self.assertEqual(get_certificate_matcher().match("globex-login.net")[1], "globex")
+        DnsTwisted.objects.create(domain_name="globex-login.net")
+        self.assertIsNone(get_certificate_matcher().match("globex-login.net"))
+
+    @patch('dns_finder.core.send_dns_finder_notifications')
+    def test_print_callback_all_domains(self, mock_notifications):
+        from dns_finder.core import print_callback
+        message = {'data': {'leaf_cert': {'subject': {'CN': "cdn.example.net"},
+                                          'all_domains': ["cdn.example.net", "*.acme-sso.net", "acme-sso.net"]}}}
+        print_callback(message, None)
+        self.assertEqual(list(DnsTwisted.objects.values_list('domain_name', flat=True)), ["acme-sso.net"])
+        mock_notifications.assert_called_once()
+
+    @patch('dns_finder.core.send_dns_finder_notifications')
+    def test_print_callback_long_domains(self, mock_notifications):
+        from dns_finder.core import print_callback
+        long_domain = "acme-" + "a" * 120 + ".example.net"
+        invalid_domain = "acme-" + ".".join(["a" * 60] * 5) + ".net"
+        message = {'data': {'leaf_cert': {'subject': {'CN': long_domain}, 'all_domains': [invalid_domain]}}}
+        print_callback(message, None)
+        self.assertEqual(list(DnsTwisted.objects.values_list('domain_name', flat=True)), [long_domain])
+        mock_notifications.assert_called_once()
+
+    def test_frame_prefilter(self):
+        from dns_finder.matcher import get_certificate_matcher
+        matcher = get_certificate_matcher()
+        self.assertTrue(matcher.may_match_frame('{"all_domains": ["www.acme-sso.net"]}'))
+        self.assertTrue(matcher.may_match_frame(b'{"all_domains": ["www.acme-sso.net"]}'))
+        self.assertFalse(matcher.may_match_frame('{"all_domains": ["www.example.net"]}'))
+
+
+class CertStreamQueueTest(TestCase):
+    """Test the bounded queue between the CertStream websocket and the callback workers."""
+    FRAME = '{"message_type": "certificate_update", "data": {"leaf_cert": {"subject": {"CN": "example.com"}}}}'
+
+    def make_client(self, callback, **kwargs):
+        from dns_finder.certstream_client import CertStreamClient
+        return CertStreamClient(url="ws://certstream:8080/", callback=callback, **kwargs)
+
+    def test_overflow_policies(self):
+        for overflow, expected in (('drop_newest', 'first'), ('drop_oldest', 'last')):
+            client = self.make_client(MagicMock(), workers=1, queue_size=1, overflow=overflow)
+            client.feed(self.FRAME.replace('example.com', 'first'))
+            client.feed(self.FRAME.replace('example.com', 'last'))
+            self.assertIn(expected, client.queue.get_nowait()[0])
+            stats = client.stats()
+            self.assertEqual((stats['received'], stats['dropped']), (2, 1))
+
+    def test_workers_process_queue(self):
+        callback = MagicMock()
+        client = self.make_client(callback, workers=2, queue_size=100)
+        client.start_workers()
+        for _ in range(10):
+            client.feed(self.FRAME)
+        client.feed('not json')
+        client.queue.join()
+        client.stop_workers()
+        stats = client.stats()
+        self.assertEqual(callback.call_count, 10)
+        self.assertEqual((stats['received'], stats['processed'], stats['errors']), (11, 11, 1))
+
+    def test_prefilter_skips_decoding(self):
+        callback = MagicMock()
+        client = self.make_client(callback, prefilter=lambda frame: 'acme' in frame)
+        client.feed(self.FRAME)
+        client.feed(self.FRAME.replace('example.com', 'acme-login.net'))
+        stats = client.stats()
+        callback.assert_called_once()
+        self.assertEqual((stats['received'], stats['filtered'], stats['processed']), (2, 1, 1))
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            self.make_client(MagicMock(), workers=1, overflow='ignore')
+
+
+class CertStreamListenerTest(TestCase):
+    """Test the lifecycle of the CertStream listener: iterative reconnection with backoff and health check."""
+
+    def make_client(self, **kwargs):
+        from dns_finder.certstream_client import CertStreamClient
+        return CertStreamClient(url="ws://certstream:8080/", callback=MagicMock(), **kwargs)
+
+    def test_reconnect_with_backoff(self):
+        client = self.make_client(reconnect_delay=1, max_reconnect_delay=8)
+        attempts = []
+
+        def connect():
+            attempts.append(client.backoff_delay())
+            if len(attempts) == 6:
+                client.should_reconnect = False
+            raise ConnectionError("refused")
+
+        with patch.object(client, '_connect', side_effect=connect), patch.object(client.stop_event, 'wait'):
+            client._run()
+
+        self.assertEqual(len(attempts), 6)
+        self.assertEqual(client.failures, 6)
+        for failures, delay in enumerate(attempts):
+            expected = min(8, 2 ** failures)
+            self.assertTrue(expected / 2 <= delay <= expected)
+
+    def test_resume_metrics(self):
+        client = self.make_client()
+
+        def connect():
+            client._on_open(None)
+            client._on_message(None, '{"message_type": "heartbeat"}')
+            if client.connections == 2:
+                client.should_reconnect = False
+
+        with patch.object(client, '_connect', side_effect=connect), patch.object(client.stop_event, 'wait'):
+            client._run()
+
+        stats = client.stats()
+        self.assertEqual((stats['connections'], stats['reconnects'], stats['consecutive_failures']), (2, 1, 0))
+        self.assertIsNotNone(stats['last_resume_seconds'])
+
+    def test_health(self):
+        client = self.make_client()
+        self.assertFalse(client.health(60)[0])
+        client.connection_thread = MagicMock(is_alive=MagicMock(return_value=True))
+        client.started_at = client.last_message_at = 0.0
+        with patch('dns_finder.certstream_client.time.monotonic', return_value=30.0):
+            self.assertEqual(client.health(60), (True, "ok"))
+        with patch('dns_finder.certstream_client.time.monotonic', return_value=90.0):
+            self.assertFalse(client.health(60)[0])
+
+    @patch('dns_finder.certstream_client.start_listener')
+    @patch('dns_finder.certstream_client.listener_health', return_value=(True, "ok"))
+    def test_scheduler_only_checks_health(self, mock_health, mock_start):
+        from dns_finder.core import main_certificate_transparency
+        with patch('dns_finder.certstream_client.get_active_client'):
+            main_certificate_transparency()
+        mock_start.assert_not_called()
+        mock_health.return_value = (False, "listener is not started")
+        with patch('dns_finder.certstream_client.get_active_client', return_value=None):
+            main_certificate_transparency()
+        mock_start.assert_called_once()
+
+    def test_stop_waits_for_connection_thread(self):
+        import dns_finder.certstream_client as certstream_client
+        client = MagicMock()
+        client.is_running.return_value = True
+        client.stop_event.is_set.return_value = True
+        with patch.object(certstream_client, '_active_client', client):
+            # The old thread is still running: it stays tracked and no second listener is started
+            self.assertFalse(certstream_client.stop_listener(timeout=0))
+            self.assertIs(certstream_client.get_active_client(), client)
+            self.assertEqual(certstream_client.listener_health(), (False, "listener is stopping"))
+            with self.assertRaises(RuntimeError):
+                certstream_client.start_listener(MagicMock())
+
+            client.is_running.return_value = False
+            self.assertTrue(certstream_client.stop_listener(timeout=0))
+            self.assertIsNone(certstream_client.get_active_client())
+
+    @patch('dns_finder.certstream_client.start_listener')
+    def test_disabled_listener_not_restarted(self, mock_start):
+        import dns_finder.certstream_client as certstream_client
+        from dns_finder.core import main_certificate_transparency
+        with patch.object(certstream_client, '_listener_disabled', False):
+            self.assertTrue(certstream_client.stop_listener(disable=True))
+            self.assertEqual(certstream_client.listener_health(), (False, "listener is disabled"))
+            main_certificate_transparency()
+        mock_start.assert_not_called()
 
 
 class SerializerTest(TestCase):
@@ -188,6 +494,27 @@ class APITest(APITestCase):
 
         response = self.client.delete(f'/api/dns_finder/dns_monitored/{self.dns.pk}/')
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    @patch('dns_finder.certstream_client.stop_listener', return_value=False)
+    @patch('dns_finder.core.start_certificate_transparency')
+    def test_certstream_actions(self, mock_start, mock_stop):
+        """Test the admin only start/stop actions of the CertStream listener."""
+        response = self.client.post('/api/dns_finder/dns_monitored/certstream/start/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_start.assert_called_once()
+
+        response = self.client.post('/api/dns_finder/dns_monitored/certstream/stop/')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_stop.assert_called_once_with(disable=True)
+
+        user = User.objects.create_user("analyst", password="analystpass123")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {AuthToken.objects.create(user)[1]}')
+        for path in ('start', 'stop'):
+            response = self.client.post(f'/api/dns_finder/dns_monitored/certstream/{path}/')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get('/api/dns_finder/dns_monitored/certstream/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(mock_start.call_count, 1)
     
     def test_keyword_and_twisted_api(self):
         """Test Keyword and Twisted API operations."""
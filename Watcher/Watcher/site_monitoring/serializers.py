@@ -58,7 +58,7 @@ class SiteSerializer(serializers.ModelSerializer):
         return _get_last_event(obj)
         
     def validate_domain_name(self, value):
-        from common.models import LegitimateDomain
+        from common.legitimate_domains import get_legitimate_domain_index
         
         extracted = tldextract.extract(value)
         
@@ -66,13 +66,13 @@ class SiteSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("The domain name is not valid")
         
         if self.instance is None:
-            if LegitimateDomain.objects.filter(domain_name=value).exists():
+            if value in get_legitimate_domain_index():
                 raise serializers.ValidationError(
                     f'{value} Already exists in Legitimate Domains'
                 )
         else:
             current = getattr(self.instance, 'domain_name', None)
-            if value != current and LegitimateDomain.objects.filter(domain_name=value).exists():
+            if value != current and value in get_legitimate_domain_index():
                 raise serializers.ValidationError(
                     f'{value} Already exists in Legitimate Domains'
                 )
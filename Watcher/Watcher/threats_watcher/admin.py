@@ -2,7 +2,7 @@
 from __future__ import unicode_literals
 
 from django.contrib import admin
-from .models import Source, TrendyWord, BannedWord, Summary, Subscriber, MonitoredKeyword
+from .models import Source, TrendyWord, BannedWord, Summary, Subscriber, MonitoredKeyword, SummaryJob
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin, ExportMixin
 from django.utils.html import format_html
@@ -11,7 +11,7 @@ from django.utils.html import format_html
 class SourceResource(resources.ModelResource):
     class Meta:
         model = Source
-        exclude = ('created_at',)
+        exclude = ('created_at', 'etag', 'last_modified')
 
 
 @admin.register(Source)
@@ -52,6 +52,13 @@ class SummaryAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
 
 
+@admin.register(SummaryJob)
+class SummaryJobAdmin(admin.ModelAdmin):
+    list_display = ('keyword', 'attempts', 'locked_at', 'created_at')
+    search_fields = ('keyword',)
+    readonly_fields = ('trendy_word', 'created_at')
+
+
 class TrendyWordResource(resources.ModelResource):
     class Meta:
         model = TrendyWord
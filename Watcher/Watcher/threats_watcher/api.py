@@ -142,7 +142,7 @@ class SummaryViewSet(viewsets.ModelViewSet):
 
         try:
             from .summary_manager import (
-                get_article_title_or_summary,
+                get_article_texts,
                 clean_text_and_metadata,
                 generate_keyword_summary_from_posturls,
             )
@@ -199,11 +199,9 @@ class SummaryViewSet(viewsets.ModelViewSet):
             valid_sources = 0
             sample_valid_urls = []
             try:
+                article_texts = get_article_texts(posts_qs)
                 for p in posts_qs:
-                    try:
-                        txt = get_article_title_or_summary(p) or ""
-                    except Exception:
-                        txt = ""
+                    txt = article_texts.get(p.id) or ""
                     try:
                         txt = clean_text_and_metadata(txt)
                     except Exception:
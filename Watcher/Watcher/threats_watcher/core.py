@@ -1,29 +1,37 @@
 # coding=utf-8
 import logging
-from .models import BannedWord, Source, TrendyWord, PostUrl, Summary, Subscriber, MonitoredKeyword
+from .models import (
+    Source, TrendyWord, PostUrl, Summary, Subscriber, MonitoredKeyword, TitleEntities, ProcessedPost, PostWord,
+    ArticleText
+)
 from django.utils import timezone
 from django.conf import settings
 from datetime import timedelta
 from datetime import datetime
 import calendar
+import hashlib
 from apscheduler.schedulers.background import BackgroundScheduler
 import tzlocal
 from nltk.tokenize import word_tokenize
 import feedparser
 import requests
 import re
-from django.db import close_old_connections
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from django.db import close_old_connections, transaction
 from common.core import send_app_specific_notifications
-from django.db.models import Q
+from common.utils.query_counter import QueryCounter
+from django.db.models import Q, Count
 from urllib.parse import urlparse
 from .model_manager import get_ner_pipeline
+from .word_filter import get_word_filter
 
 # Import summary generation functions
 from .summary_manager import (
     generate_weekly_summary,
-    generate_breaking_news,
-    generate_trendy_word_summary
+    generate_breaking_news_batch
 )
+from .summary_queue import enqueue_summaries
 
 # Configure logger
 logger = logging.getLogger('watcher.threats_watcher')
@@ -35,6 +43,9 @@ ATTACKER_PATTERNS = [
     r"\bHFG\d+\b",
 ]
 
+# Feeds parsed during previous runs of this process, reused when a source answers 304 Not Modified
+_parsed_feeds = {}
+
 HEADERS = {
     'User-Agent': (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -50,17 +61,59 @@ def extract_entities_and_threats(title: str) -> dict:
     ner_pipe = get_ner_pipeline()
     if not ner_pipe:
         logger.error("NER pipeline not available")
-        return {
-            "persons": [],
-            "organizations": [],
-            "locations": [],
-            "product": [],
-            "cves": [],
-            "attackers": [],
-        }
-    
-    ner_results = ner_pipe(title)
+        return _entities_from_ner(title, [])
+
+    return _entities_from_ner(title, ner_pipe(title))
+
+
+def extract_entities_batch(titles) -> dict:
+    """
+    Extract entities and threats for many titles with a single batched NER pass.
 
+    Results are cached in :model:`threats_watcher.TitleEntities` keyed by the SHA-256 of the title, so only titles
+    never seen before go through the model. The batch size is THREATS_WATCHER_NER_BATCH_SIZE.
+
+    :param titles: Iterable of post titles.
+    :return: Dict mapping each title to its extracted entities (see extract_entities_and_threats).
+    """
+    hashes = {title: hashlib.sha256(title.encode('utf-8')).hexdigest() for title in set(titles)}
+    results = dict()
+
+    cached = dict()
+    hash_list = list(hashes.values())
+    for i in range(0, len(hash_list), 1000):
+        cached.update(TitleEntities.objects.filter(title_hash__in=hash_list[i:i + 1000])
+                      .values_list('title_hash', 'entities'))
+
+    missing = []
+    for title, title_hash in hashes.items():
+        if title_hash in cached:
+            results[title] = cached[title_hash]
+        else:
+            missing.append(title)
+
+    if not missing:
+        return results
+
+    ner_pipe = get_ner_pipeline()
+    if not ner_pipe:
+        logger.error("NER pipeline not available")
+        for title in missing:
+            results[title] = _entities_from_ner(title, [])
+        return results
+
+    logger.info(f"Running NER on {len(missing)} new titles ({len(results)} served from cache).")
+    ner_outputs = ner_pipe(missing, batch_size=settings.THREATS_WATCHER_NER_BATCH_SIZE)
+    new_rows = []
+    for title, ner_results in zip(missing, ner_outputs):
+        results[title] = _entities_from_ner(title, ner_results)
+        new_rows.append(TitleEntities(title_hash=hashes[title], entities=results[title]))
+    TitleEntities.objects.bulk_create(new_rows, batch_size=500, ignore_conflicts=True)
+    return results
+
+
+def _entities_from_ner(title: str, ner_results) -> dict:
+    """Clean the raw NER output of a title and add the regex-based CVE and attacker matches."""
     persons       = set()
     organizations = set()
     locations     = set()
@@ -125,7 +178,7 @@ def start_scheduler():
     scheduler = BackgroundScheduler(timezone=str(tzlocal.get_localzone()))
 
     scheduler.add_job(main_watch, 'cron', day_of_week='mon-sun', minute='*/30', id='main_watch_job',
-                      max_instances=10, replace_existing=True)
+                      max_instances=1, replace_existing=True)
 
     scheduler.add_job(cleanup, 'cron', day_of_week='mon-sun', hour=8, minute=0, id='day_clean', replace_existing=True)
 
@@ -150,7 +203,7 @@ def start_scheduler():
 
 def cleanup():
     """
-    Remove words with a creation date greater than 30 days.
+    Remove words, processed posts, cached title entities and article texts older than 30 days.
     """
     close_old_connections()
     logger.info("CRON TASK : Remove words with a creation date greater than 30 days")
@@ -160,6 +213,13 @@ def cleanup():
             logger.info(f"Delete this trendy word -> {word.name}")
             word.delete()
 
+    # Posts older than 30 days are no longer counted, their words and cached entities can go
+    cutoff = timezone.now() - timedelta(days=30)
+    PostWord.objects.filter(post__published_at__lt=cutoff).delete()
+    ProcessedPost.objects.filter(published_at__lt=cutoff).delete()
+    TitleEntities.objects.filter(created_at__lt=cutoff).delete()
+    ArticleText.objects.filter(fetched_at__lt=cutoff).delete()
+
 
 def main_watch():
     """
@@ -171,6 +231,7 @@ def main_watch():
         - remove_banned_words()
         - focus_five_letters()
         - focus_on_top(settings.WORDS_OCCURRENCE)
+        - record_processed_posts()
         - send_threats_watcher_notifications()
         
     """
@@ -189,6 +250,7 @@ def main_watch():
 
     focus_five_letters()
     focus_on_top(settings.WORDS_OCCURRENCE)
+    record_processed_posts()
     reliability_score()
     send_threats_watcher_notifications(email_words)
 
@@ -214,60 +276,158 @@ def load_feeds():
     sources_by_url = {}
     for source in sources:
         rss_urls.append(source.url)
-        sources_by_url[source.url] = source.id
+        sources_by_url[source.url] = source
 
 
-def _update_source_status(url, status_code):
-    """Write last_status_code and last_checked for a Source row (fire-and-forget)."""
-    source_id = sources_by_url.get(url)
-    if source_id is None:
+def _flush_source_statuses(statuses, validators):
+    """
+    Write last_status_code, last_checked and the HTTP cache validators of every fetched Source in a single bulk
+    update.
+
+    :param statuses: Dict mapping feed url to the HTTP status code of the last fetch (0 on network error).
+    :param validators: Dict mapping feed url to the (ETag, Last-Modified) pair returned with a 200 response.
+    """
+    now = timezone.now()
+    to_update = []
+    for url, status_code in statuses.items():
+        source = sources_by_url.get(url)
+        if source is None:
+            continue
+        source.last_status_code = status_code
+        source.last_checked = now
+        if url in validators:
+            source.etag, source.last_modified = validators[url]
+        to_update.append(source)
+    if not to_update:
         return
     try:
-        Source.objects.filter(pk=source_id).update(
-            last_status_code=status_code,
-            last_checked=timezone.now(),
-        )
+        Source.objects.bulk_update(to_update, ['last_status_code', 'last_checked', 'etag', 'last_modified'],
+                                   batch_size=500)
     except Exception as exc:
-        logger.debug(f"Could not update status for source {url}: {exc}")
+        logger.debug(f"Could not update status for {len(to_update)} sources: {exc}")
 
 
-def fetch_last_posts(nb_max_post):
+def _fetch_feed(url, host_slots, etag, last_modified):
     """
-    Fetch the nb last posts for each feed (non-Bluesky) .
+    Download and parse one RSS feed. Runs in a worker thread, so it must not touch the database.
 
-    :param nb_max_post: The deepness of the search on each feed.
+    The stored validators are sent as If-None-Match / If-Modified-Since so that an unchanged feed is answered with
+    a bodyless 304 which is not parsed at all.
+
+    :param url: Feed url.
+    :param host_slots: Dict mapping host to a semaphore bounding concurrent requests on that host.
+    :param etag: ETag returned by the last 200 response, or empty.
+    :param last_modified: Last-Modified returned by the last 200 response, or empty.
+    :return: Tuple (url, status_code, parsed feed or None, (etag, last_modified) or None).
     """
-    global posts
-    global posts_published
-    posts = dict()
-    tmp_posts = dict()
-    posts_published = dict()
+    headers = dict(HEADERS)
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
 
-    for url in rss_urls:
+    with host_slots[urlparse(url).netloc.lower()]:
         try:
-            feed_content = requests.get(url, headers=HEADERS, timeout=10, verify=True)
-            _update_source_status(url, feed_content.status_code)
-            if feed_content.status_code // 100 == 2:
-                feeds.append(feedparser.parse(feed_content.text))
-            else:
-                logger.warning(f"Feed: {url} => Error: Status code: {feed_content.status_code}")
+            feed_content = requests.get(url, headers=headers, timeout=settings.THREATS_WATCHER_FETCH_TIMEOUT,
+                                        verify=True)
         except requests.exceptions.SSLError:
             logger.warning("SSL certificate error for %s (skipping)", url)
-            _update_source_status(url, 0)
+            return url, 0, None, None
         except requests.exceptions.ProxyError as e:
             detail = re.search(r'(\d{3}\s+\w[\w ]*)', str(e))
             code_str = f" [{detail.group(1).strip()}]" if detail else ""
             logger.error("Feed unreachable through proxy%s: %s", code_str, url)
-            _update_source_status(url, 0)
+            return url, 0, None, None
         except requests.exceptions.ConnectionError:
             logger.error("Connection failed for %s", url)
-            _update_source_status(url, 0)
+            return url, 0, None, None
         except requests.exceptions.Timeout:
             logger.warning("Timeout fetching %s", url)
-            _update_source_status(url, 0)
+            return url, 0, None, None
         except requests.exceptions.RequestException as e:
             logger.error("Error fetching %s: %s", url, type(e).__name__)
-            _update_source_status(url, 0)
+            return url, 0, None, None
+
+    if feed_content.status_code == 304:
+        return url, 304, None, None
+    if feed_content.status_code // 100 != 2:
+        logger.warning(f"Feed: {url} => Error: Status code: {feed_content.status_code}")
+        return url, feed_content.status_code, None, None
+    validators = (
+        (feed_content.headers.get('ETag') or '')[:255],
+        (feed_content.headers.get('Last-Modified') or '')[:64],
+    )
+    return url, feed_content.status_code, feedparser.parse(feed_content.text), validators
+
+
+def fetch_feeds():
+    """
+    Download every feed of rss_urls concurrently and append the parsed feeds to feeds as they arrive.
+
+    Concurrency is bounded globally by THREATS_WATCHER_FETCH_WORKERS and per host by
+    THREATS_WATCHER_FETCH_PER_HOST. Feeds still pending after THREATS_WATCHER_FETCH_DEADLINE seconds are dropped
+    for this run. A feed answered with 304 Not Modified reuses the feed parsed during a previous run of this
+    process, so that its posts are still counted. The validators are only sent for the feeds parsed by this process.
+    """
+    host_slots = {}
+    for url in rss_urls:
+        host = urlparse(url).netloc.lower()
+        if host not in host_slots:
+            host_slots[host] = threading.BoundedSemaphore(settings.THREATS_WATCHER_FETCH_PER_HOST)
+
+    statuses = dict()
+    validators = dict()
+    not_modified = 0
+    executor = ThreadPoolExecutor(max_workers=settings.THREATS_WATCHER_FETCH_WORKERS,
+                                  thread_name_prefix='threats_watcher_fetch')
+    futures = []
+    for url in rss_urls:
+        # Without a parsed copy of the feed a 304 could not be served, the feed is then fetched unconditionally
+        if url in _parsed_feeds:
+            etag, last_modified = sources_by_url[url].etag, sources_by_url[url].last_modified
+        else:
+            etag = last_modified = ''
+        futures.append(executor.submit(_fetch_feed, url, host_slots, etag, last_modified))
+    try:
+        for future in as_completed(futures, timeout=settings.THREATS_WATCHER_FETCH_DEADLINE):
+            url, status_code, feed, feed_validators = future.result()
+            statuses[url] = status_code
+            if status_code == 304:
+                not_modified += 1
+                feed = _parsed_feeds.get(url)
+            elif feed is not None:
+                _parsed_feeds[url] = feed
+                validators[url] = feed_validators
+            if feed is not None:
+                feeds.append(feed)
+    except FuturesTimeoutError:
+        pending = sum(1 for future in futures if not future.done())
+        logger.warning(f"Feed fetch deadline of {settings.THREATS_WATCHER_FETCH_DEADLINE}s reached, "
+                       f"{pending} feeds skipped for this run.")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Forget the feeds of deleted sources
+    for url in set(_parsed_feeds).difference(rss_urls):
+        del _parsed_feeds[url]
+
+    logger.info(f"Fetched {len(statuses)} feeds ({not_modified} not modified since last run).")
+    _flush_source_statuses(statuses, validators)
+
+
+def fetch_last_posts(nb_max_post):
+    """
+    Fetch the nb last posts for each feed (non-Bluesky) .
+
+    :param nb_max_post: The deepness of the search on each feed.
+    """
+    global posts
+    global posts_published
+    posts = dict()
+    tmp_posts = dict()
+    posts_published = dict()
+
+    fetch_feeds()
 
     # Fetch monitored keywords once for efficiency
     monitored_keywords = list(MonitoredKeyword.objects.all())
@@ -324,100 +484,114 @@ def fetch_last_posts(nb_max_post):
 
 def tokenize_count_urls():
     """
-    For each title (≤ 30 days):
-        - Runs NER and threat extraction,
-        - Casts scores to float,
+    For each title (≤ 30 days) of the current feed window:
+        - Runs NER and threat extraction (one batched pass, cached per title) on the posts not processed by a
+          previous run, the words of the other posts are read from :model:`threats_watcher.PostWord`,
         - Counts occurrences and aggregates associated URLs.
+    The new posts are only marked as processed by record_processed_posts(), once the cycle succeeded.
     """
-    global posts_words, wordurl
+    global posts_words, wordurl, new_post_words
     posts_words = {}
     wordurl     = {}
+    new_post_words = {}
 
     threshold = timezone.now() - timedelta(days=30)
-    ner_pipe = get_ner_pipeline()
-    
-    if not ner_pipe:
-        logger.error("NER pipeline not available for tokenization")
-        return
 
+    recent_posts = list()
     for title, url in posts.items():
         post_date = posts_published.get(url, "no-date")
         if post_date == "no-date" or not isinstance(post_date, datetime) or post_date < threshold:
             continue
-        raw_ner = ner_pipe(title)
-        for ent in raw_ner:
-            ent['score'] = float(ent['score'])
-        ents = extract_entities_and_threats(title)
-        retained = (
-              ents["persons"]
-            + ents["organizations"]
-            + ents["locations"]
-            + ents["product"]
-            + ents["cves"]
-            + ents["attackers"]
-        )
-        for item in retained:
+        recent_posts.append((title, url))
+
+    url_hashes = {url: hashlib.sha256(url.encode('utf-8')).hexdigest() for _, url in recent_posts}
+    hash_list = list(url_hashes.values())
+    stored_words = dict()
+    processed = set()
+    for i in range(0, len(hash_list), 1000):
+        processed.update(ProcessedPost.objects.filter(url_hash__in=hash_list[i:i + 1000])
+                         .values_list('url_hash', flat=True))
+        rows = PostWord.objects.filter(post__url_hash__in=hash_list[i:i + 1000]).order_by('id') \
+            .values_list('post__url_hash', 'word', 'occurrences')
+        for url_hash, word, occurrences in rows:
+            stored_words.setdefault(url_hash, dict())[word] = occurrences
+
+    new_titles = [title for title, url in recent_posts if url_hashes[url] not in processed]
+    logger.info(f"{len(new_titles)} new posts out of {len(recent_posts)} recent posts.")
+    entities_by_title = extract_entities_batch(new_titles) if new_titles else {}
+
+    for title, url in recent_posts:
+        if url_hashes[url] in processed:
+            words = stored_words.get(url_hashes[url], {})
+        else:
+            ents = entities_by_title[title]
+            retained = (
+                  ents["persons"]
+                + ents["organizations"]
+                + ents["locations"]
+                + ents["product"]
+                + ents["cves"]
+                + ents["attackers"]
+            )
+            words = dict()
+            for item in retained:
+                words[item] = words.get(item, 0) + 1
+            post_words = new_post_words.setdefault(url, dict())
+            for item, occurrences in words.items():
+                post_words[item] = post_words.get(item, 0) + occurrences
+
+        for item, occurrences in words.items():
             key = f"{item}_url"
-            posts_words[item] = posts_words.get(item, 0) + 1
+            posts_words[item] = posts_words.get(item, 0) + occurrences
+            urls = ", ".join([url] * occurrences)
             if key in wordurl:
-                wordurl[key] += ", " + url
+                wordurl[key] += ", " + urls
             else:
-                wordurl[key] = url
+                wordurl[key] = urls
+
+
+def record_processed_posts():
+    """
+    Mark the new posts of tokenize_count_urls() as processed and store their words, so the next runs do not
+    extract them again. Posts with a word too long for :model:`threats_watcher.PostWord` are left unprocessed.
+    """
+    max_length = PostWord._meta.get_field('word').max_length
+    new_posts = {url: words for url, words in new_post_words.items()
+                 if all(len(word) <= max_length for word in words)}
+    if not new_posts:
+        return
+    url_hashes = {url: hashlib.sha256(url.encode('utf-8')).hexdigest() for url in new_posts}
+
+    with transaction.atomic():
+        ProcessedPost.objects.bulk_create(
+            [ProcessedPost(url=url, url_hash=url_hashes[url], published_at=posts_published[url])
+             for url in new_posts],
+            batch_size=500, ignore_conflicts=True
+        )
+        post_ids = dict()
+        new_hashes = list(url_hashes.values())
+        for i in range(0, len(new_hashes), 1000):
+            post_ids.update(ProcessedPost.objects.filter(url_hash__in=new_hashes[i:i + 1000])
+                            .values_list('url_hash', 'id'))
+        PostWord.objects.bulk_create(
+            [PostWord(post_id=post_ids[url_hashes[url]], word=word, occurrences=occurrences)
+             for url, words in new_posts.items() for word, occurrences in words.items()],
+            batch_size=1000, ignore_conflicts=True
+        )
+    logger.info(f"Recorded {len(new_posts)} processed posts.")
+
 
 def remove_banned_words():
     """
     Clean the posts for specific patterns: BannedWord, then english + french common words.
     """
-    banned_words = BannedWord.objects.all().order_by('id')
     global posts_without_banned
 
     posts_without_banned = dict()
-
-    french = open('threats_watcher/datas/french.txt', 'r')
-    french = french.read().splitlines()
-    english = open('threats_watcher/datas/english.txt', 'r')
-    english = english.read().splitlines()
+    word_filter = get_word_filter()
 
     for word, count in posts_words.items():
-        for word1 in banned_words:
-            if word1.name == word:
-                word = ""
-        for word2 in english:
-            word = re.sub(r'^' + word2 + r'$', "", word)
-        for word3 in french:
-            word = re.sub(r'^' + word3 + r'$', "", word)
-        if word == "https":
-            word = ""
-
-        # Remove all special characters
-        word = re.sub(r"[^a-zA-Z0-9]+" + r'$', '', word)
-        # Remove version numbers
-        word = re.sub(r"^(\d+\.)?(\d+\.)?(\*|\d+)?(\.\d+)?(\.\d+)$" + r'$', '', word)
-        # Remove ' (sometimes regular expression don't catch this character)
-        word = word.replace("'", "")
-        # Remove '/' (sometimes regular expression don't catch this character)
-        word = word.replace("/", "")
-
-        # Remove domain name
-        domain_extensions = [
-        ".com", ".org", ".net", ".edu", ".gov", ".mil", 
-        ".biz", ".info", ".name", ".pro", ".coop", ".museum", ".aero", ".int", ".jobs", ".mobi", ".tel", ".travel", 
-        ".fr", ".uk", ".de", ".jp", ".cn", ".it", ".us", ".es", ".ca", ".au", ".nl", ".ru", ".br", ".pl", ".in", ".be", ".ch", ".se", ".mx", ".at", ".dk", ".no", ".fi", ".ie", ".nz", ".sg", ".hk", ".my", ".za", ".ar", ".tw", ".kr", ".vn", ".tr", ".ua", ".gr", ".pt", ".cz", ".hu", ".cl", ".ro", ".id", ".il", ".co", ".ae", ".th", ".sk", ".bg", ".ph", ".hr", ".lt", ".si", ".lv", ".ee", ".rs", ".is", ".ir", ".sa", ".pe", ".ma", ".by", ".gt", ".do", ".ng", ".cr", ".ve", ".ec", ".py", ".sv", ".hn", ".pa", ".bo", ".kz", ".lu", ".uy", ".dz", ".uz", ".ke", ".np", ".kh", ".zm", ".ug", ".cy", ".mm", ".et", ".ni", ".al", ".kg", ".bd", ".tn", ".np", ".la", ".gh", ".iq", ".bj", ".gm", ".tg", ".lk", ".jo", ".zw", ".sn", ".km", ".mw", ".md", ".mr", ".tn", ".bf", ".bi", ".sc", ".er", ".sl", ".cf", ".ss", ".td", ".cg", ".gq", ".dj", ".rw", ".so", ".ne", ".yt", ".re", ".pm", ".wf", ".tf", ".gs", ".ai", ".aw", ".bb", ".bm", ".vg", ".ky", ".fk", ".fo", ".gl", ".gp", ".gg", ".gi", ".je", ".im", ".mq", ".ms", ".nc", ".pf", ".pn", ".sh", ".sb", ".gs", ".tc", ".tk", ".vg", ".vi", ".um", ".cx", ".cc", ".ac", ".eu", ".ad", ".ax", ".gg", ".gi", ".im", ".je", ".mc", ".me", ".sm", ".va", ".rs", ".ps", ".asia", ".cat", ".coop", ".jobs", ".mobi", ".tel", ".travel"  # Domaines de premier niveau géographiques (ccTLD)
-        ]
-        if any(word.endswith(ext) for ext in domain_extensions):
-            word = ""
-        
-        # Remove special characters
-        word = word.encode("latin1", errors="ignore").decode("utf-8", errors="ignore")
-
-        # Remove version numbers in the format x.x.x
-        word = re.sub(r"\b\d+(?:\.\d+){2,}\b", "", word)
-        # Remove version numbers in the format vx.x.x
-        word = re.sub(r"v\d+(?:\.\d+){2,}", "", word)
-
-        if word.startswith("#"):
-            word = ""
-
+        word = word_filter.clean(word)
         if word:
             posts_without_banned[word] = count
 
@@ -439,103 +613,147 @@ def focus_on_top(words_occurrence):
     Focus on top words.
     Populated the database with only words with a minimum occurrence of "words_occurence" in feeds.
     Also triggers breaking news when threshold is exceeded.
-    Generates AI summary for newly created or updated words.
+    Queues AI summary for newly created or updated words.
 
     :param words_occurrence: Word occurence in feeds.
     """
     global email_words
     email_words = list()
-    new_posts = dict()
-    words_to_summarize = []
-    
+
+    with QueryCounter() as counter:
+        words_to_summarize, breaking_words = persist_top_words(words_occurrence)
+    logger.info(f"Top words persisted: {counter.count} queries in {counter.elapsed:.2f}s")
+
+    if breaking_words:
+        logger.info(f"Breaking news threshold reached for {[w.name for w in breaking_words]}")
+        generate_breaking_news_batch(breaking_words)
+
+    # Summaries are generated by the run_summary_worker command
+    if words_to_summarize:
+        logger.info(f"Queuing summaries for {len(words_to_summarize)} words: {[w.name for w in words_to_summarize]}")
+        enqueue_summaries(words_to_summarize)
+
+
+def _get_posturl_ids(urls):
+    """
+    Return a dict mapping each url of urls that has a :model:`threats_watcher.PostUrl` to its id.
+    """
+    urls = list(urls)
+    posturl_ids = dict()
+    for i in range(0, len(urls), 500):
+        for url, posturl_id in PostUrl.objects.filter(url__in=urls[i:i + 500]).values_list('url', 'id'):
+            posturl_ids.setdefault(url, posturl_id)
+    return posturl_ids
+
+
+def persist_top_words(words_occurrence):
+    """
+    Set-based persistence of the top words of posts_five_letters.
+
+        - Existing PostUrls, TrendyWords and their links are fetched with one query per table,
+        - New PostUrls, TrendyWords and links are written with bulk_create,
+        - Existing TrendyWords get one occurrence per newly linked post, written with bulk_update.
+
+    :param words_occurrence: Word occurence in feeds.
+    :return: Tuple (TrendyWords to summarize, TrendyWords reaching the breaking news threshold).
+    """
     breaking_threshold = settings.BREAKING_NEWS_THRESHOLD
 
+    urls_by_word = dict()
     for word, occurrences in posts_five_letters.items():
-        if occurrences >= words_occurrence:
-            if TrendyWord.objects.filter(name=word):
-                try:
-                    for posturl in wordurl[word + "_url"].split(', '):
-                        for url_, date in posts_published.items():
-                            if posturl == url_:
-                                if not PostUrl.objects.filter(url=posturl):
-                                    trendy_word = TrendyWord.objects.get(name=word)
-                                    trendy_word.occurrences += 1
-                                    trendy_word.save()
-                                    
-                                    if date != "no-date":
-                                        PostUrl.objects.create(url=posturl, created_at=date)
-                                    else:
-                                        PostUrl.objects.create(url=posturl)
-                                    post_url = PostUrl.objects.filter(url=posturl).first()
-                                    if post_url:
-                                        trendy_word.posturls.add(post_url)
-                                    new_posts[word] = new_posts.get(word, 0) + 1
-                                    
-                                    # Add to summary queue if it has enough posts and no recent summary
-                                    if trendy_word.posturls.count() >= 3:
-                                        last_24h = timezone.now() - timedelta(hours=24)
-                                        has_recent_summary = Summary.objects.filter(
-                                            type='trendy_word_summary',
-                                            keywords=word,
-                                            created_at__gte=last_24h
-                                        ).exists()
-                                        if not has_recent_summary and trendy_word.id not in words_to_summarize:
-                                            words_to_summarize.append(trendy_word.id)
-                                    
-                                    # Check for breaking news threshold
-                                    if trendy_word.occurrences >= breaking_threshold:
-                                        # Check if we already sent breaking news recently (last 24h)
-                                        last_24h = timezone.now() - timedelta(hours=24)
-                                        recent_breaking = Summary.objects.filter(
-                                            type='breaking_news',
-                                            keywords=word,
-                                            created_at__gte=last_24h
-                                        ).exists()
-                                        
-                                        if not recent_breaking:
-                                            logger.info(f"Breaking news threshold reached for '{word}' ({trendy_word.occurrences} occurrences)")
-                                            generate_breaking_news(trendy_word)
-                except KeyError:
-                    pass
-            else:
-                try:
-                    for url in wordurl[word + "_url"].split(', '):
-                        for url_, date in posts_published.items():
-                            if url == url_:
-                                if not PostUrl.objects.filter(url=url):
-                                    if date != "no-date":
-                                        PostUrl.objects.create(url=url, created_at=date)
-                                    else:
-                                        PostUrl.objects.create(url=url)
-
-                    word_db = TrendyWord.objects.create(name=word, occurrences=occurrences)
-                    for url in wordurl[word + "_url"].split(', '):
-                        post_url, _ = PostUrl.objects.get_or_create(url=url)
-                        word_db.posturls.add(post_url)
-
-                    email_words.append(
-                        "<a href=" + settings.WATCHER_URL + ">" + word + "</a> :<b> " + str(occurrences) + "</b>")
-                    
-                    # Add newly created word to summary queue if it has enough posts
-                    if word_db.posturls.count() >= 3:
-                        words_to_summarize.append(word_db.id)
-                    
-                    # Check for breaking news on new words
-                    if occurrences >= breaking_threshold:
-                        logger.info(f"New word '{word}' reached breaking news threshold ({occurrences} occurrences)")
-                        generate_breaking_news(word_db)
-                        
-                except KeyError:
-                    pass
-    
-    # Generate summaries for all words in queue
-    if words_to_summarize:
-        logger.info(f"Generating summaries for {len(words_to_summarize)} words: {words_to_summarize}")
-        for word_id in words_to_summarize:
-            try:
-                generate_trendy_word_summary(word_id)
-            except Exception as e:
-                logger.error(f"Failed to generate summary for word ID {word_id}: {e}")
+        if occurrences >= words_occurrence and word + "_url" in wordurl:
+            urls_by_word[word] = list(dict.fromkeys(wordurl[word + "_url"].split(', ')))
+    if not urls_by_word:
+        return [], []
+
+    existing_words = dict()
+    for trendy_word in TrendyWord.objects.filter(name__in=list(urls_by_word)):
+        existing_words.setdefault(trendy_word.name, trendy_word)
+    new_words = [word for word in urls_by_word if word not in existing_words]
+
+    posturl_ids = _get_posturl_ids(set().union(*urls_by_word.values()))
+    through = TrendyWord.posturls.through
+    linked = set(through.objects.filter(
+        trendyword_id__in=[trendy_word.id for trendy_word in existing_words.values()]
+    ).values_list('trendyword_id', 'posturl_id'))
+
+    # Posts of existing words are only considered when their publication date is known from the feeds
+    new_links_by_word = dict()
+    for word, trendy_word in existing_words.items():
+        new_links_by_word[word] = [
+            url for url in urls_by_word[word]
+            if url in posts_published
+            and (url not in posturl_ids or (trendy_word.id, posturl_ids[url]) not in linked)
+        ]
+
+    missing_urls = {url for urls in new_links_by_word.values() for url in urls if url not in posturl_ids}
+    missing_urls.update(url for word in new_words for url in urls_by_word[word] if url not in posturl_ids)
+    if missing_urls:
+        now = timezone.now()
+        PostUrl.objects.bulk_create(
+            [PostUrl(url=url, created_at=posts_published[url] if isinstance(posts_published.get(url), datetime) else now)
+             for url in missing_urls],
+            batch_size=500
+        )
+        posturl_ids.update(_get_posturl_ids(missing_urls))
+
+    created_words = dict()
+    if new_words:
+        TrendyWord.objects.bulk_create(
+            [TrendyWord(name=word, occurrences=posts_five_letters[word]) for word in new_words], batch_size=500
+        )
+        for trendy_word in TrendyWord.objects.filter(name__in=new_words).exclude(
+                id__in=[trendy_word.id for trendy_word in existing_words.values()]):
+            created_words.setdefault(trendy_word.name, trendy_word)
+
+    links = []
+    updated_words = []
+    for word, urls in new_links_by_word.items():
+        if not urls:
+            continue
+        trendy_word = existing_words[word]
+        trendy_word.occurrences += len(urls)
+        updated_words.append(trendy_word)
+        links += [through(trendyword_id=trendy_word.id, posturl_id=posturl_ids[url]) for url in urls]
+    for word, trendy_word in created_words.items():
+        links += [through(trendyword_id=trendy_word.id, posturl_id=posturl_ids[url]) for url in urls_by_word[word]]
+        email_words.append(
+            "<a href=" + settings.WATCHER_URL + ">" + word + "</a> :<b> " + str(trendy_word.occurrences) + "</b>")
+
+    through.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+    TrendyWord.objects.bulk_update(updated_words, ['occurrences'], batch_size=500)
+
+    touched_words = updated_words + list(created_words.values())
+    if not touched_words:
+        return [], []
+    posts_count = dict(TrendyWord.objects.filter(id__in=[trendy_word.id for trendy_word in touched_words])
+                       .annotate(posts_count=Count('posturls')).values_list('id', 'posts_count'))
+    last_24h = timezone.now() - timedelta(hours=24)
+    touched_names = [trendy_word.name for trendy_word in touched_words]
+    recent_summaries = set(Summary.objects.filter(
+        type='trendy_word_summary', keywords__in=touched_names, created_at__gte=last_24h
+    ).values_list('keywords', flat=True))
+    recent_breaking = set(Summary.objects.filter(
+        type='breaking_news', keywords__in=touched_names, created_at__gte=last_24h
+    ).values_list('keywords', flat=True))
+
+    words_to_summarize = []
+    breaking_words = []
+    for trendy_word in updated_words:
+        # Add to summary queue if it has enough posts and no recent summary
+        if posts_count.get(trendy_word.id, 0) >= 3 and trendy_word.name not in recent_summaries:
+            words_to_summarize.append(trendy_word)
+        if trendy_word.occurrences >= breaking_threshold and trendy_word.name not in recent_breaking:
+            breaking_words.append(trendy_word)
+    for trendy_word in created_words.values():
+        if posts_count.get(trendy_word.id, 0) >= 3:
+            words_to_summarize.append(trendy_word)
+        if trendy_word.occurrences >= breaking_threshold:
+            breaking_words.append(trendy_word)
+
+    logger.info(f"{len(created_words)} trendy words created, {len(updated_words)} updated, "
+                f"{len(links)} post links added.")
+    return words_to_summarize, breaking_words
 
 
 def get_pre_redirect_domain(url):
@@ -569,35 +787,60 @@ def get_normalized_domain(url):
     return domain
 
 
+def get_source_domain_index():
+    """
+    Build the normalized domain -> confidence score index of the :model:`threats_watcher.Source`.
+    When several sources share a domain, the first one wins.
+    """
+    index = dict()
+    for source_url, confident in Source.objects.values_list('url', 'confident'):
+        index.setdefault(get_normalized_domain(source_url), get_confidence_score(confident))
+    return index
+
+
+def resolve_pre_redirect_domains(posturls):
+    """
+    Resolve concurrently the pre-redirect domain of the PostUrls which were never resolved and store it on them.
+    At most THREATS_WATCHER_PRE_REDIRECT_BATCH PostUrls, the most recent first, are resolved per call.
+
+    :param posturls: List of :model:`threats_watcher.PostUrl` with an empty pre_redirect_domain.
+    """
+    if not posturls:
+        return
+    backlog = len(posturls)
+    posturls = sorted(posturls, key=lambda post: post.created_at, reverse=True)
+    posturls = posturls[:settings.THREATS_WATCHER_PRE_REDIRECT_BATCH]
+    with ThreadPoolExecutor(max_workers=settings.THREATS_WATCHER_FETCH_WORKERS) as executor:
+        for post, domain in zip(posturls, executor.map(lambda post: get_pre_redirect_domain(post.url), posturls)):
+            post.pre_redirect_domain = domain[:255]
+    PostUrl.objects.bulk_update(posturls, ['pre_redirect_domain'], batch_size=500)
+    logger.info(f"{len(posturls)} pre-redirect domains resolved, {backlog - len(posturls)} left for the next runs.")
+
+
 def reliability_score():
     """
     Calculates the reliability score for each TrendyWord by scanning its associated PostUrls.
     """
-    trendy_words = TrendyWord.objects.prefetch_related('posturls').all()
-
-    for word in trendy_words:
-        score_list = []
-        for post in word.posturls.all():
-            try:
-                post_domain = get_pre_redirect_domain(post.url)
-                source_match = None
-                for source in Source.objects.all():
-                    source_domain = get_normalized_domain(source.url)
-                    if post_domain == source_domain:
-                        source_match = source
-                        break
-                if source_match:
-                    conf_score = get_confidence_score(source_match.confident)
-                    score_list.append(conf_score)
-            except Exception as e:
-                logger.error(f"Error for {post.url} word : '{word.name}' : {e}")
-
+    domain_scores = get_source_domain_index()
+    links = list(TrendyWord.posturls.through.objects.values_list('trendyword_id', 'posturl_id'))
+    posturls = PostUrl.objects.in_bulk({posturl_id for _, posturl_id in links})
+    resolve_pre_redirect_domains([post for post in posturls.values() if not post.pre_redirect_domain])
+
+    score_lists = dict()
+    for word_id, posturl_id in links:
+        conf_score = domain_scores.get(posturls[posturl_id].pre_redirect_domain)
+        if conf_score is not None:
+            score_lists.setdefault(word_id, []).append(conf_score)
+
+    scored_words = []
+    for word in TrendyWord.objects.only('id', 'name', 'score'):
+        score_list = score_lists.get(word.id)
         if score_list:
-            avg_score = sum(score_list) / len(score_list)
-            word.score = avg_score
-            word.save()
+            word.score = sum(score_list) / len(score_list)
+            scored_words.append(word)
         else:
             logger.info(f"'{word.name}' : No fiability score.")
+    TrendyWord.objects.bulk_update(scored_words, ['score'], batch_size=500)
 
 
 def send_threats_watcher_notifications(content):
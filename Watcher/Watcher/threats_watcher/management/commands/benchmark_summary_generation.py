@@ -0,0 +1,53 @@
+from abc import ABC
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from threats_watcher.model_manager import get_summarizer_model, generate_texts
+from threats_watcher.models import TrendyWord
+
+SAMPLE_NEWS = (
+    "Researchers disclosed a critical vulnerability in {word} allowing remote code execution on exposed servers. "
+    "Attackers are actively exploiting the flaw to deploy ransomware and steal credentials from victims. "
+    "The vendor released security updates and urged administrators to patch {word} deployments immediately."
+)
+
+
+class Command(BaseCommand, ABC):
+    help = 'Compare the CPU time of the per-word and the batched FLAN-T5 generation used by the AI summaries.'
+    # System checks import the urls, which start the schedulers
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=16, help='Number of prompts to generate.')
+        parser.add_argument('--batch-size', type=int, default=settings.THREATS_WATCHER_GENERATION_BATCH_SIZE,
+                            help='Prompts per generate() call for the batched path.')
+
+    def handle(self, *args, **options):
+        import torch
+
+        model, _ = get_summarizer_model()
+        if model is None:
+            self.stderr.write("Summarizer model unavailable")
+            return
+        model.to('cpu')
+
+        names = list(TrendyWord.objects.values_list('name', flat=True)[:options['words']])
+        names += [f"product{i}" for i in range(options['words'] - len(names))]
+        prompts = ["Write a complete summary of this cybersecurity news in 30-90 words.\n\n"
+                   + SAMPLE_NEWS.format(word=name) for name in names]
+
+        self.stdout.write(f"{len(prompts)} prompts, {torch.get_num_threads()} CPU threads, "
+                          f"{settings.THREATS_WATCHER_GENERATION_NUM_BEAMS} beams, "
+                          f"{settings.THREATS_WATCHER_GENERATION_MAX_NEW_TOKENS} max new tokens")
+
+        start = time.perf_counter()
+        generate_texts(prompts, batch_size=1, min_new_tokens=40)
+        per_word = time.perf_counter() - start
+        self.stdout.write(f"Per-word: {per_word:.1f} s ({per_word / len(prompts):.2f} s/word)")
+
+        start = time.perf_counter()
+        generate_texts(prompts, batch_size=options['batch_size'], min_new_tokens=40)
+        batched = time.perf_counter() - start
+        self.stdout.write(f"Batched ({options['batch_size']}/call): {batched:.1f} s "
+                          f"({batched / len(prompts):.2f} s/word, x{per_word / batched:.2f})")
@@ -0,0 +1,36 @@
+from abc import ABC
+import random
+import time
+from django.core.management.base import BaseCommand
+
+from threats_watcher.models import TrendyWord
+from threats_watcher.word_filter import get_word_filter, invalidate_word_filter
+
+
+class Command(BaseCommand, ABC):
+    help = 'Measure the build time and the per-word cost of the word filter used by remove_banned_words.'
+    # System checks import the urls, which start the schedulers
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--words', type=int, default=100000, help='Number of words to clean.')
+
+    def handle(self, *args, **options):
+        invalidate_word_filter(sender=None)
+        start = time.perf_counter()
+        word_filter = get_word_filter()
+        build_time = time.perf_counter() - start
+
+        # Mix of real trendy words, excluded words and version numbers / domain names
+        samples = list(TrendyWord.objects.values_list('name', flat=True)[:1000])
+        samples += list(word_filter.excluded)[:1000]
+        samples += ['1.2.3', 'v10.4.1', 'example.com', 'Fortinet!!', "O'Reilly", '#hashtag', 'Microsoft']
+        words = [random.choice(samples) for _ in range(options['words'])]
+
+        start = time.perf_counter()
+        kept = sum(1 for word in words if word_filter.clean(word))
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"Filter built in {build_time * 1000:.1f} ms ({len(word_filter.excluded)} excluded words)")
+        self.stdout.write(f"{len(words)} words cleaned in {elapsed * 1000:.1f} ms, {kept} kept")
+        self.stdout.write(f"Per-word cost: {elapsed / len(words) * 1e6:.2f} µs")
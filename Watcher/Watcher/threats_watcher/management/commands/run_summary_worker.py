@@ -0,0 +1,40 @@
+from abc import ABC
+import logging
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from threats_watcher.summary_queue import drain_summary_queue
+
+logger = logging.getLogger('watcher.threats_watcher')
+
+
+class Command(BaseCommand, ABC):
+    help = 'Drain the AI summary queue filled by the Threats Watcher. Runs forever unless --once is given.'
+    # System checks import the urls, which start the schedulers: the worker would run a second copy of every job
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.THREATS_WATCHER_SUMMARY_BATCH_SIZE,
+                            help='Number of jobs claimed at once.')
+        parser.add_argument('--interval', type=int, default=settings.THREATS_WATCHER_SUMMARY_POLL_INTERVAL,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty.')
+
+    def handle(self, *args, **options):
+        logger.info("Summary worker started.")
+        processed = 0
+        try:
+            while True:
+                close_old_connections()
+                count = drain_summary_queue(options['batch_size'])
+                processed += count
+                if count:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"{processed} summary jobs processed.")
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.5 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0020_source_last_checked_source_last_status_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='etag',
+            field=models.CharField(blank=True, help_text='ETag returned by the last successful fetch, sent back as If-None-Match', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='last_modified',
+            field=models.CharField(blank=True, help_text='Last-Modified header returned by the last successful fetch, sent back as If-Modified-Since', max_length=64),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.5 on 2026-10-17 10:03
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0021_source_etag_source_last_modified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleEntities',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title_hash', models.CharField(max_length=64, unique=True)),
+                ('entities', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'title entities',
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.5 on 2026-10-17 11:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0022_titleentities'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=1000)),
+                ('url_hash', models.CharField(max_length=64, unique=True)),
+                ('published_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PostWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(db_index=True, max_length=100)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='words', to='threats_watcher.processedpost')),
+            ],
+            options={
+                'unique_together': {('post', 'word')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.5 on 2026-10-17 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0023_processedpost_postword'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posturl',
+            name='pre_redirect_domain',
+            field=models.CharField(blank=True, help_text='Normalized domain of the url before redirects, resolved once', max_length=255),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.5 on 2026-10-17 11:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0024_posturl_pre_redirect_domain'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SummaryJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=100, unique=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('trendy_word', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summary_jobs', to='threats_watcher.trendyword')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.5 on 2026-10-17 13:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0025_summaryjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(blank=True)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('fetched_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('posturl', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='article_text', to='threats_watcher.posturl')),
+            ],
+        ),
+    ]
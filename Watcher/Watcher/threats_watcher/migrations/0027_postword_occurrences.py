@@ -0,0 +1,29 @@
+# Generated by Django 6.0.5 on 2026-10-17 17:05
+
+from django.db import migrations, models
+
+
+def clear_processed_posts(apps, schema_editor):
+    # Words were stored deduplicated and truncated, the posts are extracted again (from the title entities cache)
+    apps.get_model('threats_watcher', 'ProcessedPost').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('threats_watcher', '0026_articletext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postword',
+            name='occurrences',
+            field=models.PositiveIntegerField(default=1, help_text='Number of times the word is in the post title.'),
+        ),
+        migrations.AlterField(
+            model_name='postword',
+            name='word',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.RunPython(clear_processed_posts, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 
 
 import logging
+from django.conf import settings
 from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
 
 logger = logging.getLogger('watcher.threats_watcher')
@@ -21,10 +22,15 @@ def get_ner_pipeline():
         - Organizations (ORG)
         - Locations (LOC)
         - Miscellaneous entities (MISC)
+
+    THREATS_WATCHER_NER_THREADS, when set, caps the number of CPU threads used by torch.
     """
     global _ner_pipeline
     if _ner_pipeline is None:
         try:
+            if settings.THREATS_WATCHER_NER_THREADS > 0:
+                import torch
+                torch.set_num_threads(settings.THREATS_WATCHER_NER_THREADS)
             _ner_pipeline = pipeline(
                 "ner",
                 model="dslim/bert-base-NER",
@@ -94,4 +100,53 @@ def get_summarizer_model():
         except Exception as e:
             logger.error(f"Failed to load FLAN-T5 model/tokenizer: {e}")
             return None, None
-    return _summarizer_model, _summarizer_tokenizer
\ No newline at end of file
+    return _summarizer_model, _summarizer_tokenizer
+
+def generate_texts(prompts, max_input_tokens=450, batch_size=None, **gen_kwargs):
+    """
+    Run FLAN-T5 generation on a list of prompts, one model.generate() call per batch.
+
+    The prompts of a batch are padded to the longest one. Batch size, beams and max new tokens default to
+    THREATS_WATCHER_GENERATION_BATCH_SIZE, THREATS_WATCHER_GENERATION_NUM_BEAMS and
+    THREATS_WATCHER_GENERATION_MAX_NEW_TOKENS, any generate() argument can be overridden with gen_kwargs.
+
+    :param prompts: List of prompts.
+    :param max_input_tokens: Prompts are truncated to this number of tokens.
+    :param batch_size: Number of prompts per generate() call.
+    :return: List of generated texts, in the order of prompts.
+    """
+    model, tokenizer = get_summarizer_model()
+    if model is None or tokenizer is None:
+        raise RuntimeError("Summarizer model unavailable")
+
+    import torch
+
+    batch_size = batch_size or settings.THREATS_WATCHER_GENERATION_BATCH_SIZE
+    kwargs = {
+        "max_new_tokens": settings.THREATS_WATCHER_GENERATION_MAX_NEW_TOKENS,
+        "num_beams": settings.THREATS_WATCHER_GENERATION_NUM_BEAMS,
+        "no_repeat_ngram_size": 3,
+        "early_stopping": True,
+        "do_sample": False,
+        "length_penalty": 0.9,
+    }
+    kwargs.update(gen_kwargs)
+
+    texts = []
+    for i in range(0, len(prompts), batch_size):
+        with torch.no_grad():
+            inputs = tokenizer(prompts[i:i + batch_size], padding=True, truncation=True,
+                               max_length=max_input_tokens, return_tensors="pt")
+            try:
+                outputs = model.generate(input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"],
+                                         **kwargs)
+            except RuntimeError as e:
+                if "out of memory" not in str(e).lower():
+                    raise
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+                outputs = model.generate(input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"],
+                                         **dict(kwargs, max_new_tokens=min(kwargs["max_new_tokens"], 80),
+                                                num_beams=min(kwargs["num_beams"], 2)))
+        texts += tokenizer.batch_decode(outputs, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+    return texts
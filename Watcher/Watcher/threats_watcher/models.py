@@ -33,6 +33,14 @@ class Source(models.Model):
         null=True, blank=True,
         help_text="Timestamp of the last fetch attempt"
     )
+    etag = models.CharField(
+        max_length=255, blank=True,
+        help_text="ETag returned by the last successful fetch, sent back as If-None-Match"
+    )
+    last_modified = models.CharField(
+        max_length=64, blank=True,
+        help_text="Last-Modified header returned by the last successful fetch, sent back as If-Modified-Since"
+    )
     created_at = models.DateTimeField(default=timezone.now)
     timeline_events = GenericRelation('timeline.TimelineEvent', related_query_name='source')
 
@@ -47,6 +55,8 @@ class PostUrl(models.Model):
     """
     url = models.URLField(max_length=1000, default="")
     created_at = models.DateTimeField(default=timezone.now)
+    pre_redirect_domain = models.CharField(max_length=255, blank=True,
+                                           help_text='Normalized domain of the url before redirects, resolved once')
 
     class Meta:
         ordering = ["-created_at"]
@@ -74,6 +84,67 @@ class TrendyWord(models.Model):
         return self.name
 
 
+class ProcessedPost(models.Model):
+    """
+    Watermark of the RSS posts already run through entity extraction by **threats_watcher/core.py**.
+    Keyed by the SHA-256 of the post url, so each post is tokenized once.
+    """
+    url = models.URLField(max_length=1000)
+    url_hash = models.CharField(max_length=64, unique=True)
+    published_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.url
+
+
+class PostWord(models.Model):
+    """
+    Stores a word extracted from a :model:`threats_watcher.ProcessedPost`.
+    Lets the next runs count the words of an already processed post without extracting them again.
+    """
+    post = models.ForeignKey(ProcessedPost, on_delete=models.CASCADE, related_name='words')
+    word = models.CharField(max_length=255, db_index=True)
+    occurrences = models.PositiveIntegerField(default=1, help_text="Number of times the word is in the post title.")
+
+    class Meta:
+        unique_together = ('post', 'word')
+
+    def __str__(self):
+        return self.word
+
+
+class TitleEntities(models.Model):
+    """
+    Caches the entities extracted by the NER model from a post title, keyed by the SHA-256 of the title.
+    Lets **threats_watcher/core.py** skip the BERT forward pass for titles seen during previous runs.
+    """
+    title_hash = models.CharField(max_length=64, unique=True)
+    entities = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name_plural = 'title entities'
+
+    def __str__(self):
+        return self.title_hash
+
+
+class ArticleText(models.Model):
+    """
+    Caches the text extracted from the article behind a :model:`threats_watcher.PostUrl`, used by the AI summaries.
+    The article is fetched again once the entry is older than THREATS_WATCHER_ARTICLE_TEXT_TTL hours, and only
+    re-extracted when the SHA-256 of the page changed.
+    """
+    posturl = models.OneToOneField(PostUrl, on_delete=models.CASCADE, related_name='article_text')
+    text = models.TextField(blank=True)
+    content_hash = models.CharField(max_length=64)
+    fetched_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.posturl.url
+
+
 @receiver(pre_delete, sender=TrendyWord)
 def cascade_delete_branch(sender, instance, **kwargs):
     """
@@ -145,35 +216,44 @@ class Summary(models.Model):
         return count
 
 
+class SummaryJob(models.Model):
+    """
+    Pending AI summary generation for a :model:`threats_watcher.TrendyWord`, drained by the **run_summary_worker**
+    management command. There is at most one job per keyword.
+    """
+    keyword = models.CharField(max_length=100, unique=True)
+    trendy_word = models.ForeignKey(TrendyWord, on_delete=models.CASCADE, related_name='summary_jobs')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return self.keyword
+
+
 @receiver(post_save, sender=TrendyWord)
 def auto_generate_trendy_word_summary(sender, instance, created, **kwargs):
     """
-    Auto-generate an AI summary when a TrendyWord is created or updated.
+    Queue an AI summary when a TrendyWord is created or updated.
     """
-    from .summary_manager import generate_trendy_word_summary
+    from .summary_queue import enqueue_summaries
 
     logger = logging.getLogger('watcher.threats_watcher')
 
-    # Check for an existing summary for this keyword
-    existing_summary = Summary.objects.filter(
-        type='trendy_word_summary',
-        keywords=instance.name
-    ).first()
-
-    should_generate = False
-
-    if created and instance.occurrences >= 3:
-        should_generate = True
-        logger.info(f"New TrendyWord '{instance.name}' created with {instance.occurrences} occurrences - generating summary")
-    elif not created and instance.posturls.count() >= 5 and not existing_summary:
-        should_generate = True
-        logger.info(f"TrendyWord '{instance.name}' updated with {instance.posturls.count()} posts - generating summary")
-
-    if should_generate:
-        try:
-            generate_trendy_word_summary(instance.id)
-        except Exception as e:
-            logger.error(f"Failed to auto-generate summary for '{instance.name}': {e}", exc_info=True)
+    if created:
+        if instance.occurrences < 3:
+            return
+        logger.info(f"New TrendyWord '{instance.name}' created with {instance.occurrences} occurrences - queuing summary")
+    else:
+        posts_count = instance.posturls.count()
+        if posts_count < 5 or Summary.objects.filter(type='trendy_word_summary', keywords=instance.name).exists():
+            return
+        logger.info(f"TrendyWord '{instance.name}' updated with {posts_count} posts - queuing summary")
+
+    enqueue_summaries([instance])
 
 
 class MonitoredKeyword(models.Model):
@@ -1,23 +1,32 @@
 import logging
 import re
 import difflib
+import hashlib
+import html as _html
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Set
 from datetime import timedelta
 
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
 from django.utils import timezone
 from django.conf import settings
 
-from .models import TrendyWord, PostUrl, Summary
+from .models import TrendyWord, PostUrl, Summary, ArticleText
 from .model_manager import (
     get_ner_pipeline,
-    get_summarizer_pipeline,
-    get_summarizer_tokenizer,
     get_summarizer_model,
+    generate_texts,
 )
 
 logger = logging.getLogger('watcher.threats_watcher')
 
+_http_session = None
+_http_session_lock = threading.Lock()
+
 
 def normalize_text(text: str) -> str:
     """Normalize text for comparison: lowercase, collapse whitespace, remove punctuation."""
@@ -203,35 +212,43 @@ def deduplicate_titles(titles: List[str]) -> List[str]:
     return unique_titles
 
 
-def get_article_title_or_summary(posturl_obj):
-    """Extract article content from PostUrl using multiple fallback strategies."""
-    import feedparser
-    import requests
-    import re
-    import json
-    import html as _html
-
-    url = getattr(posturl_obj, "url", None)
-    if not url:
-        return ""
-
-    ua = getattr(settings, "REQUESTS_USER_AGENT",
-                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                 "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
-    headers = {
-        "User-Agent": ua,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": getattr(settings, "WATCHER_URL", "https://example.com"),
-    }
+def get_http_session():
+    """
+    Return the process-wide requests Session used to fetch articles, keeping connections alive between fetches.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=settings.THREATS_WATCHER_FETCH_WORKERS,
+                                      pool_maxsize=settings.THREATS_WATCHER_FETCH_WORKERS)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({
+                    "User-Agent": getattr(settings, "REQUESTS_USER_AGENT",
+                                          "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                                          "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"),
+                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "en-US,en;q=0.9",
+                    "Referer": getattr(settings, "WATCHER_URL", "https://example.com"),
+                })
+                _http_session = session
+    return _http_session
+
+
+def fetch_article_html(url):
+    """
+    Download an article with the pooled session.
+
+    :return: The page HTML, an empty string when the page has no usable content, or None when the fetch failed.
+    """
     timeout = getattr(settings, "THREATS_WATCHER_REQUEST_TIMEOUT", 10)
-
     try:
-        session = requests.Session()
-        resp = session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        resp = get_http_session().get(url, timeout=timeout, allow_redirects=True)
     except Exception as e:
         logger.warning(f"Failed fetching URL {url}: {e}")
-        return ""
+        return None
 
     if resp.status_code != 200:
         return ""
@@ -245,6 +262,13 @@ def get_article_title_or_summary(posturl_obj):
     html_text = resp.text or ""
     if not html_text or len(html_text.strip()) < 50:
         return ""
+    return html_text
+
+
+def extract_article_text(html_text, url=""):
+    """Extract article content from a page using multiple fallback strategies."""
+    if not html_text:
+        return ""
 
     try:
         feed = feedparser.parse(html_text)
@@ -376,6 +400,72 @@ def get_article_title_or_summary(posturl_obj):
     return ""
 
 
+def get_article_texts(posturls):
+    """
+    Return the extracted text of the articles behind posturls, from the :model:`threats_watcher.ArticleText` cache.
+
+    Missing and expired entries are fetched concurrently. An expired entry is only re-extracted when the page
+    changed, and is kept as is when the fetch fails.
+
+    :param posturls: Iterable of saved :model:`threats_watcher.PostUrl`.
+    :return: Dict mapping each PostUrl id to its text ("" when nothing could be extracted).
+    """
+    posturls = [posturl for posturl in posturls if posturl.url]
+    cached = {entry.posturl_id: entry for entry in
+              ArticleText.objects.filter(posturl_id__in=[posturl.id for posturl in posturls])}
+    now = timezone.now()
+    fresh_after = now - timedelta(hours=settings.THREATS_WATCHER_ARTICLE_TEXT_TTL)
+
+    texts = dict()
+    stale = []
+    for posturl in posturls:
+        entry = cached.get(posturl.id)
+        if entry and entry.fetched_at >= fresh_after:
+            texts[posturl.id] = entry.text
+        elif posturl.id not in texts:
+            stale.append(posturl)
+    if not stale:
+        return texts
+
+    with ThreadPoolExecutor(max_workers=min(settings.THREATS_WATCHER_FETCH_WORKERS, len(stale))) as executor:
+        pages = list(executor.map(lambda posturl: fetch_article_html(posturl.url), stale))
+
+    created, updated = [], []
+    for posturl, html_text in zip(stale, pages):
+        entry = cached.get(posturl.id)
+        if html_text is None:
+            texts[posturl.id] = entry.text if entry else ""
+            continue
+        content_hash = hashlib.sha256(html_text.encode('utf-8', errors='ignore')).hexdigest()
+        if entry is None:
+            entry = ArticleText(posturl_id=posturl.id, text=extract_article_text(html_text, posturl.url),
+                                content_hash=content_hash, fetched_at=now)
+            created.append(entry)
+        else:
+            if entry.content_hash != content_hash:
+                entry.text = extract_article_text(html_text, posturl.url)
+                entry.content_hash = content_hash
+            entry.fetched_at = now
+            updated.append(entry)
+        texts[posturl.id] = entry.text
+
+    ArticleText.objects.bulk_create(created, batch_size=500, ignore_conflicts=True)
+    ArticleText.objects.bulk_update(updated, ['text', 'content_hash', 'fetched_at'], batch_size=500)
+    logger.info(f"Article texts: {len(posturls) - len(stale)} cached, {len(created)} fetched, "
+                f"{len(updated)} refreshed.")
+    return texts
+
+
+def get_article_title_or_summary(posturl_obj):
+    """Extract article content from PostUrl, through the ArticleText cache when the PostUrl is saved."""
+    url = getattr(posturl_obj, "url", None)
+    if not url:
+        return ""
+    if getattr(posturl_obj, "pk", None) is None:
+        return extract_article_text(fetch_article_html(url), url)
+    return get_article_texts([posturl_obj]).get(posturl_obj.pk, "")
+
+
 def extract_entities_and_threats(title: str) -> dict:
     """Extract entities and threats from title using NER model."""
     ner_pipe = get_ner_pipeline()
@@ -453,8 +543,74 @@ def extract_entities_and_threats(title: str) -> dict:
     }
 
 
+def _prepare_weekly_prompt(tw, cutoff, max_posts_per_trend, min_words, max_words_target, english_confidence_threshold):
+    """
+    Build the weekly summary prompt of a TrendyWord.
+
+    :return: Tuple (prompt, deduplicated titles), or None when the TrendyWord has not enough English content.
+    """
+    logger.info(f"Processing trendy word '{tw.name}'")
+
+    posturls = list(tw.posturls.filter(created_at__gte=cutoff).order_by('-created_at')[:max_posts_per_trend])
+
+    if not posturls:
+        return None
+
+    article_texts = get_article_texts(posturls)
+    raw_titles = []
+    for posturl_obj in posturls:
+        try:
+            text = article_texts.get(posturl_obj.id, "")
+            if not text or len(text.strip()) < 30:
+                logger.debug(f"Insufficient text for {posturl_obj.url} (len={len(text) if text else 0})")
+                continue
+
+            text = clean_text_and_metadata(text)
+            if len(text.strip()) < 30:
+                logger.debug(f"Text too short after cleaning for {posturl_obj.url}")
+                continue
+
+            if not is_english(text, threshold=english_confidence_threshold):
+                logger.debug(f"Non-English source skipped for {posturl_obj.url}")
+                continue
+
+            raw_titles.append(text)
+
+        except Exception as e:
+            logger.warning(f"Error processing post for '{tw.name}': {e}")
+            continue
+
+    if not raw_titles:
+        return None
+
+    all_titles = deduplicate_titles(raw_titles)
+
+    min_titles_required = 1 if tw.name.startswith('CVE-') else 2
+    if len(all_titles) < min_titles_required:
+        return None
+
+    # Build corpus
+    corpus = " ".join(all_titles[:20])
+    corpus_words = corpus.split()
+    if len(corpus_words) > 350:
+        corpus = " ".join(corpus_words[:350])
+
+    prompt = (
+        f"Write a complete summary of this cybersecurity news in {min_words}-{max_words_target} words. "
+        f"Requirements:\n"
+        f"- Write 2-3 complete sentences (NO truncation)\n"
+        f"- Be specific about vulnerability, products, impact\n"
+        f"- End with a period\n\n"
+        f"{corpus}"
+    )
+    return prompt, all_titles
+
+
 def generate_weekly_summary():
-    """Generate and send weekly threat summary (top-5 trending topics)."""
+    """
+    Generate and send weekly threat summary (top-5 trending topics).
+    Candidate TrendyWords are generated in batches, only as many as needed to fill the remaining entries.
+    """
     logger.info("Starting weekly summary generation")
 
     try:
@@ -462,11 +618,6 @@ def generate_weekly_summary():
         if model is None or tokenizer is None:
             raise RuntimeError("Summarizer model unavailable")
 
-        try:
-            model.eval()
-        except Exception:
-            pass
-
         logger.info("Summarizer model loaded successfully")
     except Exception:
         logger.error("Failed to load summarizer model", exc_info=True)
@@ -488,163 +639,89 @@ def generate_weekly_summary():
         max_posts_per_trend = 30
         max_input_tokens = 450
         min_words, max_words_target = 30, 90
-        generation_min_new_tokens, generation_max_new_tokens = 40, 150
-        num_beams = 5
-        no_repeat_ngram_size = 3
-        length_penalty = 0.9
-        early_stopping = True
+        generation_min_new_tokens = 40
         english_confidence_threshold = 0.70
 
         max_attempts = min(trendywords_qs.count(), max_words_needed * 5)
-
-        for tw in trendywords_qs[:max_attempts]:
-            if len(summaries_data) >= max_words_needed:
+        candidates = iter(trendywords_qs[:max_attempts])
+
+        while len(summaries_data) < max_words_needed:
+            batch_size = min(settings.THREATS_WATCHER_GENERATION_BATCH_SIZE, max_words_needed - len(summaries_data))
+            batch = []
+            for tw in candidates:
+                prepared = _prepare_weekly_prompt(tw, cutoff, max_posts_per_trend, min_words, max_words_target,
+                                                  english_confidence_threshold)
+                if prepared:
+                    batch.append((tw, *prepared))
+                if len(batch) >= batch_size:
+                    break
+            if not batch:
                 break
 
-            logger.info(f"Processing trendy word '{tw.name}'")
-
-            posturls = list(tw.posturls.filter(created_at__gte=cutoff).order_by('-created_at')[:max_posts_per_trend])
-
-            if not posturls:
+            # Generate summaries
+            try:
+                generated_texts = generate_texts(
+                    [prompt for _, prompt, _ in batch],
+                    max_input_tokens=max_input_tokens,
+                    min_new_tokens=generation_min_new_tokens,
+                    repetition_penalty=1.3,
+                )
+            except Exception as e:
+                logger.error(f"Generation failed for {[tw.name for tw, _, _ in batch]}: {e}")
                 continue
 
-            raw_titles = []
-            for posturl_obj in posturls:
-                try:
-                    text = get_article_title_or_summary(posturl_obj)
-                    if not text or len(text.strip()) < 30:
-                        logger.debug(f"Insufficient text for {posturl_obj.url} (len={len(text) if text else 0})")
-                        continue
-
-                    text = clean_text_and_metadata(text)
-                    if len(text.strip()) < 30:
-                        logger.debug(f"Text too short after cleaning for {posturl_obj.url}")
-                        continue
+            for (tw, _, all_titles), generated in zip(batch, generated_texts):
+                if len(summaries_data) >= max_words_needed:
+                    break
 
-                    if not is_english(text, threshold=english_confidence_threshold):
-                        logger.debug(f"Non-English source skipped for {posturl_obj.url}")
-                        continue
+                summary = (generated or "").strip()
+                summary = re.sub(r'^(summarize|summary|text):\s*', '', summary, flags=re.IGNORECASE)
+                summary = clean_text_and_metadata(summary)
+                summary = re.sub(r'\s+', ' ', summary).strip()
 
-                    raw_titles.append(text)
+                cves_in_summary = extract_and_normalize_cves(summary)
 
-                except Exception as e:
-                    logger.warning(f"Error processing post for '{tw.name}': {e}")
-                    continue
+                if summary and not summary[0].isupper():
+                    summary = summary[0].upper() + summary[1:]
 
-            if not raw_titles:
-                continue
-
-            all_titles = deduplicate_titles(raw_titles)
+                if summary and not summary.endswith(('.', '!', '?')):
+                    summary += '.'
 
-            min_titles_required = 1 if tw.name.startswith('CVE-') else 2
-            if len(all_titles) < min_titles_required:
-                continue
+                word_count = len(summary.split()) if summary else 0
+                if word_count < 20:
+                    continue
 
-            # Build corpus
-            corpus = " ".join(all_titles[:20])
-            corpus_words = corpus.split()
-            if len(corpus_words) > 350:
-                corpus = " ".join(corpus_words[:350])
-
-            prompt = (
-                f"Write a complete summary of this cybersecurity news in {min_words}-{max_words_target} words. "
-                f"Requirements:\n"
-                f"- Write 2-3 complete sentences (NO truncation)\n"
-                f"- Be specific about vulnerability, products, impact\n"
-                f"- End with a period\n\n"
-                f"{corpus}"
-            )
+                if is_duplicate_summary(summary, existing_summaries, threshold=0.70):
+                    continue
 
-            # Generate summary
-            try:
-                import torch
-                with torch.no_grad():
-                    inputs = tokenizer(prompt, truncation=True, max_length=max_input_tokens, return_tensors="pt")
-
-                    gen_kwargs = {
-                        "max_new_tokens": generation_max_new_tokens,
-                        "min_new_tokens": generation_min_new_tokens,
-                        "num_beams": num_beams,
-                        "no_repeat_ngram_size": no_repeat_ngram_size,
-                        "early_stopping": early_stopping,
-                        "do_sample": False,
-                        "length_penalty": length_penalty,
-                        "repetition_penalty": 1.3,
-                    }
+                # Extract entities
+                entities = {
+                    'products': set(),
+                    'cves': set(),
+                    'organizations': set(),
+                    'attackers': set()
+                }
 
+                for title in all_titles:
                     try:
-                        summarizer_model = get_summarizer_model()[0]
-                        outputs = summarizer_model.generate(input_ids=inputs["input_ids"], attention_mask=inputs.get("attention_mask"), **gen_kwargs)
-                        generated = get_summarizer_model()[1].decode(outputs[0], skip_special_tokens=True, clean_up_tokenization_spaces=True)
+                        extracted = extract_entities_and_threats(title)
+                        entities['products'].update(extracted.get('product', []))
+                        entities['cves'].update(extracted.get('cves', []))
+                        entities['organizations'].update(extracted.get('organizations', []))
+                        entities['attackers'].update(extracted.get('attackers', []))
                     except Exception:
-                        summarizer = get_summarizer_pipeline()
-                        if summarizer:
-                            res = summarizer(prompt, max_length=120, min_length=40, truncation=True, do_sample=False)
-                            if isinstance(res, list) and res:
-                                first = res[0]
-                                if isinstance(first, dict):
-                                    generated = first.get('generated_text') or first.get('summary_text') or first.get('text') or ""
-                                elif isinstance(first, str):
-                                    generated = first
-                            elif isinstance(res, dict):
-                                generated = res.get('generated_text') or res.get('summary_text') or res.get('text') or ""
-                            else:
-                                generated = str(res)
-                        else:
-                            raise RuntimeError("No summarizer available")
-
-            except Exception as e:
-                logger.error(f"Generation failed for '{tw.name}': {e}")
-                continue
-
-            summary = (generated or "").strip()
-            summary = re.sub(r'^(summarize|summary|text):\s*', '', summary, flags=re.IGNORECASE)
-            summary = clean_text_and_metadata(summary)
-            summary = re.sub(r'\s+', ' ', summary).strip()
-
-            cves_in_summary = extract_and_normalize_cves(summary)
-
-            if summary and not summary[0].isupper():
-                summary = summary[0].upper() + summary[1:]
-
-            if summary and not summary.endswith(('.', '!', '?')):
-                summary += '.'
-
-            word_count = len(summary.split()) if summary else 0
-            if word_count < 20:
-                continue
-
-            if is_duplicate_summary(summary, existing_summaries, threshold=0.70):
-                continue
-
-            # Extract entities
-            entities = {
-                'products': set(),
-                'cves': set(),
-                'organizations': set(),
-                'attackers': set()
-            }
-
-            for title in all_titles:
-                try:
-                    extracted = extract_entities_and_threats(title)
-                    entities['products'].update(extracted.get('product', []))
-                    entities['cves'].update(extracted.get('cves', []))
-                    entities['organizations'].update(extracted.get('organizations', []))
-                    entities['attackers'].update(extracted.get('attackers', []))
-                except Exception:
-                    continue
+                        continue
 
-            entities['products'] = {p for p in entities['products'] if len(p) >= 4 and not p.isdigit()}
-            entities['cves'] = cves_in_summary
+                entities['products'] = {p for p in entities['products'] if len(p) >= 4 and not p.isdigit()}
+                entities['cves'] = cves_in_summary
 
-            summaries_data.append({
-                'summary': summary,
-                'entities': entities
-            })
-            existing_summaries.append(summary)
-            keywords_used.append(tw.name)
-            logger.info(f"Summary generated for '{tw.name}'")
+                summaries_data.append({
+                    'summary': summary,
+                    'entities': entities
+                })
+                existing_summaries.append(summary)
+                keywords_used.append(tw.name)
+                logger.info(f"Summary generated for '{tw.name}'")
 
         if summaries_data:
             summary_lines = []
@@ -701,448 +778,371 @@ def generate_weekly_summary():
             pass
 
 
-def generate_breaking_news(trendy_word):
-    """Generate a breaking-news style alert for a TrendyWord."""
-    logger.info(f"Generating breaking news for '{trendy_word.name}' ({getattr(trendy_word, 'occurrences', 'n/a')} occurrences)")
-    summarizer = get_summarizer_pipeline()
-    tokenizer = get_summarizer_tokenizer()
+def _prepare_breaking_news_input(trendy_word):
+    """
+    Build the breaking news prompt of a TrendyWord from the content of its posts.
 
-    if not summarizer or not tokenizer:
-        logger.error("Summarizer pipeline or tokenizer unavailable")
-        return None
+    :return: Tuple (prompt, corpus, candidate texts), or None when there is not enough content.
+    """
+    posturls = list(trendy_word.posturls.all().order_by('-created_at'))
 
-    try:
-        from .core import send_threats_watcher_notifications
+    if not posturls:
+        return None
 
-        posturls_qs = trendy_word.posturls.all().order_by('-created_at')
-        posturls = list(posturls_qs)
+    article_texts = get_article_texts(posturls)
+    raw_texts = []
+    for posturl_obj in posturls:
+        try:
+            txt = article_texts.get(posturl_obj.id, "")
+            if not txt:
+                continue
+            txt = clean_text_and_metadata(txt)
+            if txt and len(txt.strip()) >= 30:
+                raw_texts.append(txt.strip())
+        except Exception:
+            continue
 
-        if not posturls:
-            return None
+    if not raw_texts:
+        return None
 
-        raw_texts = []
-        for posturl_obj in posturls:
-            try:
-                txt = get_article_title_or_summary(posturl_obj)
-                if not txt:
-                    continue
-                txt = clean_text_and_metadata(txt)
-                if txt and len(txt.strip()) >= 30:
-                    raw_texts.append(txt.strip())
-            except Exception:
-                continue
+    unique_texts = deduplicate_titles(raw_texts)
+    candidate_texts = unique_texts if unique_texts else raw_texts
 
-        if not raw_texts:
-            return None
+    corpus = "\n\n".join(candidate_texts).strip()
+    if len(corpus) < 40:
+        corpus = " ".join(raw_texts).strip()
+    if len(corpus) < 40:
+        return None
 
-        unique_texts = deduplicate_titles(raw_texts)
-        candidate_texts = unique_texts if unique_texts else raw_texts
+    pre_prompt = (
+        "Produce a single short paragraph (1-3 short sentences, 15-70 words) summarizing the cybersecurity news below. "
+        "Only provide factual information. Do NOT output questions, instructions, repeated lines, placeholders, or prompts like 'Identify the'. "
+        "Be specific about affected products, impact and CVEs. End with a single period.\n\n"
+    )
+    return pre_prompt + corpus, corpus, candidate_texts
 
-        corpus = "\n\n".join(candidate_texts).strip()
-        if len(corpus) < 40:
-            corpus = " ".join(raw_texts).strip()
-        if len(corpus) < 40:
-            return None
 
-        pre_prompt = (
-            "Produce a single short paragraph (1-3 short sentences, 15-70 words) summarizing the cybersecurity news below. "
-            "Only provide factual information. Do NOT output questions, instructions, repeated lines, placeholders, or prompts like 'Identify the'. "
-            "Be specific about affected products, impact and CVEs. End with a single period.\n\n"
-        )
-        full_input = pre_prompt + corpus
+def _publish_breaking_news(trendy_word, summary_raw, corpus, candidate_texts):
+    """
+    Clean the generated text of a TrendyWord (or build a deterministic one from its entities when generation
+    failed), store it as a breaking news Summary and notify subscribers.
+    """
+    from .core import send_threats_watcher_notifications
 
-        max_input_tokens = getattr(settings, "THREATS_WATCHER_MAX_INPUT_TOKENS", 1024)
-        try:
-            tokens = tokenizer.encode(full_input)
-            input_tokens = len(tokens)
-            if input_tokens > max_input_tokens:
-                tokens = tokens[:max_input_tokens]
-                try:
-                    full_input = tokenizer.decode(tokens, skip_special_tokens=True, clean_up_tokenization_spaces=True)
-                except Exception:
-                    full_input = tokenizer.decode(tokens, skip_special_tokens=True)
-                input_tokens = len(tokens)
-        except Exception:
-            input_tokens = len(full_input.split())
-            if input_tokens > max_input_tokens:
-                words = full_input.split()[:max_input_tokens]
-                full_input = " ".join(words)
-                input_tokens = len(words)
-
-        max_len = min(150, max(80, input_tokens // 2))
-        min_len = max(30, max_len // 2)
-
-        def _extract_summary_from_result(result):
-            if not result:
-                return None
-            try:
-                if isinstance(result, list) and result:
-                    first = result[0]
-                    if isinstance(first, dict):
-                        for key in ('summary_text', 'generated_text', 'text', 'content'):
-                            val = first.get(key)
-                            if val and isinstance(val, str) and val.strip():
-                                return val.strip()
-                    else:
-                        if isinstance(first, str) and first.strip():
-                            return first.strip()
-                elif isinstance(result, dict):
-                    for key in ('summary_text', 'generated_text', 'text', 'content'):
-                        val = result.get(key)
-                        if val and isinstance(val, str) and val.strip():
-                            return val.strip()
-                elif isinstance(result, str):
-                    return result.strip()
-            except Exception:
-                return None
-            return None
+    summary_text = None
+    if summary_raw and summary_raw.strip():
+        summary_text = clean_text_and_metadata(summary_raw.strip())
+        summary_text = re.sub(r'^\s*Breaking:\s*', '', summary_text, flags=re.IGNORECASE)
+        summary_text = re.sub(r"'\w+'\s*\(\s*\)\.\s*", '', summary_text)
+        summary_text = re.sub(r'\s+', ' ', summary_text).strip()
 
-        summary_raw = None
-        for attempt in range(2):
-            prompt = full_input
-            if attempt == 1:
-                prompt = ("IMPORTANT: Do NOT output instructions, questions, or placeholders. Produce 1-2 factual sentences only.\n\n" + full_input)
-            try:
-                result = summarizer(prompt, max_length=max_len, min_length=min_len, truncation=True, do_sample=False)
-            except Exception as e:
-                logger.warning(f"Summarizer pipeline error for '{trendy_word.name}' on attempt {attempt+1}: {e}")
-                result = None
+        disallowed_patterns = [
+            r'(?i)\bidentify the\b', r'(?i)\blist the\b', r'(?i)\bplease find more\b',
+            r'(?i)\bplease review\b', r'(?i)find more details\b', r'(?i)identify domains\b'
+        ]
+        if any(re.search(pat, summary_text) for pat in disallowed_patterns):
+            summary_text = None
+        else:
+            sentences = re.split(r'(?<=[.!?])\s+', summary_text)
+            cleaned = []
+            for s in sentences:
+                s = s.strip()
+                if not s:
+                    continue
+                if s in cleaned:
+                    continue
+                too_similar = False
+                for existing in cleaned:
+                    sim = difflib.SequenceMatcher(None, normalize_text(s), normalize_text(existing)).ratio()
+                    if sim >= 0.85:
+                        too_similar = True
+                        break
+                if too_similar:
+                    continue
+                cleaned.append(s)
+            if cleaned:
+                summary_text = " ".join(cleaned[:3]).strip()
+                if not summary_text.endswith((".", "!", "?")):
+                    summary_text += "."
+            else:
+                summary_text = None
 
-            candidate = _extract_summary_from_result(result)
-            if candidate:
-                summary_raw = candidate
-                break
+        if summary_text:
+            wc = len(summary_text.split())
+            if wc < 15:
+                summary_text = None
 
-        if not summary_raw:
+    if not summary_text:
+        products = {}
+        orgs = {}
+        attackers = {}
+        cves_set = set()
+        for txt in candidate_texts[:20]:
             try:
-                model, model_tokenizer = get_summarizer_model()
-                if model and model_tokenizer:
-                    import torch
-                    with torch.no_grad():
-                        inputs = model_tokenizer(full_input, truncation=True, max_length=450, return_tensors="pt")
-                        gen_kwargs = {
-                            "max_new_tokens": 120,
-                            "min_new_tokens": 40,
-                            "num_beams": 4,
-                            "no_repeat_ngram_size": 3,
-                            "early_stopping": True,
-                            "do_sample": False,
-                            "length_penalty": 0.9,
-                        }
-                        try:
-                            outputs = model.generate(input_ids=inputs["input_ids"], attention_mask=inputs.get("attention_mask"), **gen_kwargs)
-                        except RuntimeError as e:
-                            if "out of memory" in str(e).lower():
-                                try:
-                                    torch.cuda.empty_cache()
-                                except Exception:
-                                    pass
-                                gen_kwargs["max_new_tokens"] = 80
-                                gen_kwargs["num_beams"] = 2
-                                outputs = model.generate(input_ids=inputs["input_ids"], attention_mask=inputs.get("attention_mask"), **gen_kwargs)
-                            else:
-                                raise
-                        summary_raw = model_tokenizer.decode(outputs[0], skip_special_tokens=True, clean_up_tokenization_spaces=True).strip()
-            except Exception as e:
-                logger.warning(f"Model.generate fallback failed for '{trendy_word.name}': {e}")
-                summary_raw = None
-
-        summary_text = None
-        if summary_raw and summary_raw.strip():
-            summary_text = clean_text_and_metadata(summary_raw.strip())
-            summary_text = re.sub(r'^\s*Breaking:\s*', '', summary_text, flags=re.IGNORECASE)
-            summary_text = re.sub(r"'\w+'\s*\(\s*\)\.\s*", '', summary_text)
-            summary_text = re.sub(r'\s+', ' ', summary_text).strip()
-
-            disallowed_patterns = [
-                r'(?i)\bidentify the\b', r'(?i)\blist the\b', r'(?i)\bplease find more\b',
-                r'(?i)\bplease review\b', r'(?i)find more details\b', r'(?i)identify domains\b'
-            ]
-            if any(re.search(pat, summary_text) for pat in disallowed_patterns):
-                summary_text = None
-            else:
-                sentences = re.split(r'(?<=[.!?])\s+', summary_text)
-                cleaned = []
-                for s in sentences:
-                    s = s.strip()
-                    if not s:
-                        continue
-                    if s in cleaned:
-                        continue
-                    too_similar = False
-                    for existing in cleaned:
-                        sim = difflib.SequenceMatcher(None, normalize_text(s), normalize_text(existing)).ratio()
-                        if sim >= 0.85:
-                            too_similar = True
-                            break
-                    if too_similar:
-                        continue
-                    cleaned.append(s)
-                if cleaned:
-                    summary_text = " ".join(cleaned[:3]).strip()
-                    if not summary_text.endswith((".", "!", "?")):
-                        summary_text += "."
-                else:
-                    summary_text = None
-
-            if summary_text:
-                wc = len(summary_text.split())
-                if wc < 15:
-                    summary_text = None
-
-        if not summary_text:
-            products = {}
-            orgs = {}
-            attackers = {}
-            cves_set = set()
-            for txt in candidate_texts[:20]:
-                try:
-                    ext = extract_entities_and_threats(txt)
-                    for p in ext.get('product', []):
-                        products[p] = products.get(p, 0) + 1
-                    for o in ext.get('organizations', []):
-                        orgs[o] = orgs.get(o, 0) + 1
-                    for a in ext.get('attackers', []):
-                        attackers[a] = attackers.get(a, 0) + 1
-                    for c in ext.get('cves', []):
-                        cves_set.add(c)
-                except Exception:
-                    continue
+                ext = extract_entities_and_threats(txt)
+                for p in ext.get('product', []):
+                    products[p] = products.get(p, 0) + 1
+                for o in ext.get('organizations', []):
+                    orgs[o] = orgs.get(o, 0) + 1
+                for a in ext.get('attackers', []):
+                    attackers[a] = attackers.get(a, 0) + 1
+                for c in ext.get('cves', []):
+                    cves_set.add(c)
+            except Exception:
+                continue
 
-            top_products = [p for p, _ in sorted(products.items(), key=lambda x: -x[1])][:3]
-            top_orgs = [o for o, _ in sorted(orgs.items(), key=lambda x: -x[1])][:2]
-            top_attackers = [a for a, _ in sorted(attackers.items(), key=lambda x: -x[1])][:2]
-            cves = sorted(list(cves_set))
-
-            joined = corpus.lower()
-            if any(k in joined for k in ('critical vulnerability', 'critical severity', 'critical')):
-                impact = 'critical'
-            elif any(k in joined for k in ('high severity', 'high-severity', 'high severity')):
-                impact = 'high'
-            elif any(k in joined for k in ('actively exploited', 'known exploited', 'being exploited', 'exploit')):
-                impact = 'actively exploited'
-            else:
-                impact = None
-
-            sentences = []
-            if top_products:
-                prod_str = ", ".join(top_products)
-                s = f"{trendy_word.name}: {prod_str} affected"
-                if impact:
-                    s += f" - {impact} impact"
-                s += "."
-                sentences.append(s)
-            elif top_orgs:
-                sentences.append(f"{trendy_word.name}: reports reference {', '.join(top_orgs)}.")
-            else:
-                sentences.append(f"{trendy_word.name}: multiple sources report a cybersecurity issue.")
+        top_products = [p for p, _ in sorted(products.items(), key=lambda x: -x[1])][:3]
+        top_orgs = [o for o, _ in sorted(orgs.items(), key=lambda x: -x[1])][:2]
+        cves = sorted(list(cves_set))
+
+        joined = corpus.lower()
+        if any(k in joined for k in ('critical vulnerability', 'critical severity', 'critical')):
+            impact = 'critical'
+        elif any(k in joined for k in ('high severity', 'high-severity', 'high severity')):
+            impact = 'high'
+        elif any(k in joined for k in ('actively exploited', 'known exploited', 'being exploited', 'exploit')):
+            impact = 'actively exploited'
+        else:
+            impact = None
+
+        sentences = []
+        if top_products:
+            prod_str = ", ".join(top_products)
+            s = f"{trendy_word.name}: {prod_str} affected"
+            if impact:
+                s += f" - {impact} impact"
+            s += "."
+            sentences.append(s)
+        elif top_orgs:
+            sentences.append(f"{trendy_word.name}: reports reference {', '.join(top_orgs)}.")
+        else:
+            sentences.append(f"{trendy_word.name}: multiple sources report a cybersecurity issue.")
 
-            if cves:
-                sentences.append("CVEs: " + ", ".join(cves[:3]) + ".")
+        if cves:
+            sentences.append("CVEs: " + ", ".join(cves[:3]) + ".")
 
-            fallback_summary = " ".join(sentences[:3])
-            fallback_summary = re.sub(r'\s+', ' ', fallback_summary).strip()
-            if not fallback_summary.endswith((".", "!", "?")):
-                fallback_summary += "."
+        fallback_summary = " ".join(sentences[:3])
+        fallback_summary = re.sub(r'\s+', ' ', fallback_summary).strip()
+        if not fallback_summary.endswith((".", "!", "?")):
+            fallback_summary += "."
 
-            if len(fallback_summary.split()) < 8:
-                logger.error(f"Deterministic fallback summary too short for '{trendy_word.name}'")
-                return None
-            summary_text = fallback_summary
+        if len(fallback_summary.split()) < 8:
+            logger.error(f"Deterministic fallback summary too short for '{trendy_word.name}'")
+            return None
+        summary_text = fallback_summary
 
-        cves_final = sorted(list(extract_and_normalize_cves(summary_text)))
+    cves_final = sorted(list(extract_and_normalize_cves(summary_text)))
 
-        summary_obj = Summary.objects.create(
-            type='breaking_news',
-            keywords=trendy_word.name,
-            summary_text=summary_text
-        )
+    summary_obj = Summary.objects.create(
+        type='breaking_news',
+        keywords=trendy_word.name,
+        summary_text=summary_text
+    )
 
-        payload = {
-            'notification_type': 'breakingnews',
-            'keyword': trendy_word.name,
-            'occurrences': getattr(trendy_word, 'occurrences', None),
-            'summary_text': summary_text,
-        }
-        if cves_final:
-            payload['cves'] = cves_final
+    payload = {
+        'notification_type': 'breakingnews',
+        'keyword': trendy_word.name,
+        'occurrences': getattr(trendy_word, 'occurrences', None),
+        'summary_text': summary_text,
+    }
+    if cves_final:
+        payload['cves'] = cves_final
 
-        try:
-            send_threats_watcher_notifications(payload)
-        except Exception:
-            logger.exception("Failed sending breaking news notifications")
+    try:
+        send_threats_watcher_notifications(payload)
+    except Exception:
+        logger.exception("Failed sending breaking news notifications")
 
-        wc = len(summary_text.split())
-        logger.info(f"Breaking news sent for '{trendy_word.name}' (id={summary_obj.id}, {wc} words, {len(cves_final)} CVEs)")
-        return summary_obj
+    wc = len(summary_text.split())
+    logger.info(f"Breaking news sent for '{trendy_word.name}' (id={summary_obj.id}, {wc} words, {len(cves_final)} CVEs)")
+    return summary_obj
 
-    except Exception as e:
-        logger.error(f"Breaking news generation failed for '{trendy_word.name}': {e}", exc_info=True)
-        return None
 
+def generate_breaking_news_batch(trendy_words):
+    """
+    Generate breaking-news style alerts for several TrendyWords, with one batched generation for all prompts.
+    Prompts which produce no text are retried once with a stricter instruction.
 
-def _generate_summary_for_keyword_posts(keyword: str, posturls: list):
-    """Generate AI summary for a keyword using a provided PostUrl list."""
-    summarizer = get_summarizer_pipeline()
-    tokenizer = get_summarizer_tokenizer()
-    if not summarizer or not tokenizer:
-        logger.error("Summarizer or tokenizer unavailable")
-        return None
+    :param trendy_words: List of :model:`threats_watcher.TrendyWord`.
+    :return: List of the created Summary (or None), in the order of trendy_words.
+    """
+    results = [None] * len(trendy_words)
+    if get_summarizer_model()[0] is None:
+        logger.error("Summarizer model unavailable")
+        return results
 
-    try:
-        if not posturls:
-            return None
+    prepared = []
+    for i, trendy_word in enumerate(trendy_words):
+        logger.info(f"Generating breaking news for '{trendy_word.name}' ({getattr(trendy_word, 'occurrences', 'n/a')} occurrences)")
+        try:
+            inputs = _prepare_breaking_news_input(trendy_word)
+        except Exception as e:
+            logger.error(f"Breaking news generation failed for '{trendy_word.name}': {e}", exc_info=True)
+            continue
+        if inputs:
+            prepared.append((i, *inputs))
+    if not prepared:
+        return results
+
+    max_input_tokens = getattr(settings, "THREATS_WATCHER_MAX_INPUT_TOKENS", 1024)
+    summaries_raw = [None] * len(prepared)
+    pending = list(range(len(prepared)))
+    for attempt in range(2):
+        prompts = [prepared[k][1] for k in pending]
+        if attempt == 1:
+            prompts = ["IMPORTANT: Do NOT output instructions, questions, or placeholders. Produce 1-2 factual sentences only.\n\n" + prompt
+                       for prompt in prompts]
+        try:
+            generated_texts = generate_texts(prompts, max_input_tokens=max_input_tokens, min_new_tokens=30)
+        except Exception as e:
+            logger.warning(f"Breaking news generation error on attempt {attempt+1}: {e}")
+            continue
+        for k, generated in zip(pending, generated_texts):
+            if generated and generated.strip():
+                summaries_raw[k] = generated.strip()
+        pending = [k for k in pending if not summaries_raw[k]]
+        if not pending:
+            break
+
+    for (i, _, corpus, candidate_texts), summary_raw in zip(prepared, summaries_raw):
+        trendy_word = trendy_words[i]
+        try:
+            results[i] = _publish_breaking_news(trendy_word, summary_raw, corpus, candidate_texts)
+        except Exception as e:
+            logger.error(f"Breaking news generation failed for '{trendy_word.name}': {e}", exc_info=True)
+    return results
 
-        raw_texts = []
-        for posturl_obj in posturls:
-            try:
-                txt = get_article_title_or_summary(posturl_obj)
-                if not txt:
-                    continue
-                txt = clean_text_and_metadata(txt)
-                if txt and len(txt.strip()) >= 30:
-                    raw_texts.append(txt.strip())
-            except Exception:
-                continue
 
-        if not raw_texts:
-            logger.info(f"No valid content for '{keyword}'")
-            return None
+def generate_breaking_news(trendy_word):
+    """Generate a breaking-news style alert for a TrendyWord."""
+    return generate_breaking_news_batch([trendy_word])[0]
 
-        unique_texts = deduplicate_titles(raw_texts)
-        corpus = "\n\n".join(unique_texts[:12]).strip()
 
-        if len(corpus) < 40:
-            logger.info(f"Corpus too small for '{keyword}' (len={len(corpus)})")
-            return None
+def _prepare_keyword_corpus(keyword: str, posturls: list):
+    """
+    Build the corpus summarized for a keyword from the content of its posts.
 
-        # Generate summary
+    :return: Tuple (corpus, deduplicated texts), or None when there is not enough content.
+    """
+    if not posturls:
+        return None
+
+    article_texts = get_article_texts(posturls)
+    raw_texts = []
+    for posturl_obj in posturls:
         try:
-            input_tokens = len(tokenizer.encode(corpus))
+            txt = article_texts.get(posturl_obj.id, "")
+            if not txt:
+                continue
+            txt = clean_text_and_metadata(txt)
+            if txt and len(txt.strip()) >= 30:
+                raw_texts.append(txt.strip())
         except Exception:
-            input_tokens = len(corpus.split())
+            continue
 
-        max_len = min(150, max(80, input_tokens // 2))
-        min_len = max(40, max_len // 2)
+    if not raw_texts:
+        logger.info(f"No valid content for '{keyword}'")
+        return None
 
-        try:
-            result = summarizer(corpus, max_length=max_len, min_length=min_len, truncation=True, do_sample=False)
-        except Exception as e:
-            logger.error(f"Summarizer failed for '{keyword}': {e}")
-            result = None
-
-        summary_raw = None
-        if result:
-            if isinstance(result, list) and result:
-                first = result[0]
-                if isinstance(first, dict):
-                    for key in ('summary_text', 'generated_text', 'text', 'content'):
-                        val = first.get(key)
-                        if val and isinstance(val, str) and val.strip():
-                            summary_raw = val.strip()
-                            break
-                elif isinstance(first, str) and first.strip():
-                    summary_raw = first.strip()
-            elif isinstance(result, dict):
-                for key in ('summary_text', 'generated_text', 'text', 'content'):
-                    val = result.get(key)
-                    if val and isinstance(val, str) and val.strip():
-                        summary_raw = val.strip()
-                        break
-            elif isinstance(result, str) and result.strip():
-                summary_raw = result.strip()
+    unique_texts = deduplicate_titles(raw_texts)
+    corpus = "\n\n".join(unique_texts[:12]).strip()
 
-        if not summary_raw:
-            try:
-                model, model_tokenizer = get_summarizer_model()
-                if model and model_tokenizer:
-                    import torch
-                    with torch.no_grad():
-                        inputs = model_tokenizer(corpus, truncation=True, max_length=450, return_tensors="pt")
-                        gen_kwargs = {
-                            "max_new_tokens": 120,
-                            "min_new_tokens": 40,
-                            "num_beams": 4,
-                            "no_repeat_ngram_size": 3,
-                            "early_stopping": True,
-                            "do_sample": False,
-                            "length_penalty": 0.9,
-                        }
-                        try:
-                            outputs = model.generate(input_ids=inputs["input_ids"], attention_mask=inputs.get("attention_mask"), **gen_kwargs)
-                        except RuntimeError as e:
-                            if "out of memory" in str(e).lower():
-                                try:
-                                    import torch as _torch
-                                    _torch.cuda.empty_cache()
-                                except Exception:
-                                    pass
-                                gen_kwargs["max_new_tokens"] = 80
-                                gen_kwargs["num_beams"] = 2
-                                outputs = model.generate(input_ids=inputs["input_ids"], attention_mask=inputs.get("attention_mask"), **gen_kwargs)
-                            else:
-                                raise
-                        summary_raw = model_tokenizer.decode(outputs[0], skip_special_tokens=True, clean_up_tokenization_spaces=True).strip()
-            except Exception as e:
-                logger.error(f"Model.generate fallback failed for '{keyword}': {e}")
-                return None
+    if len(corpus) < 40:
+        logger.info(f"Corpus too small for '{keyword}' (len={len(corpus)})")
+        return None
+    return corpus, unique_texts
 
-        if not summary_raw or not summary_raw.strip():
-            logger.error(f"Empty summary after all attempts for '{keyword}'")
-            return None
 
-        summary_text = clean_text_and_metadata(summary_raw.strip())
-        summary_text = re.sub(r'\s+', ' ', summary_text).strip()
+def _save_keyword_summary(keyword: str, summary_raw: str, unique_texts: list):
+    """Clean the generated text of a keyword, add its entities and store it as its trendy word Summary."""
+    if not summary_raw or not summary_raw.strip():
+        logger.error(f"Empty summary after all attempts for '{keyword}'")
+        return None
 
-        if not summary_text.endswith((".", "!", "?")):
-            summary_text += "."
+    summary_text = clean_text_and_metadata(summary_raw.strip())
+    summary_text = re.sub(r'\s+', ' ', summary_text).strip()
 
-        if len(summary_text.split()) < 15:
-            return None
+    if not summary_text.endswith((".", "!", "?")):
+        summary_text += "."
 
-        entities = {
-            'products': set(),
-            'cves': set(),
-            'organizations': set(),
-            'attackers': set()
-        }
+    if len(summary_text.split()) < 15:
+        return None
 
-        for title in unique_texts:
-            try:
-                extracted = extract_entities_and_threats(title)
-                entities['products'].update(extracted.get('product', []))
-                entities['organizations'].update(extracted.get('organizations', []))
-                entities['attackers'].update(extracted.get('attackers', []))
-                entities['cves'].update(extracted.get('cves', []))
-            except Exception:
-                continue
+    entities = {
+        'products': set(),
+        'cves': set(),
+        'organizations': set(),
+        'attackers': set()
+    }
 
-        entities['cves'].update(extract_and_normalize_cves(summary_text))
-
-        # Build final summary
-        summary_lines = [summary_text, ""]
-        if entities['products']:
-            summary_lines.append("Products: " + ", ".join(sorted(list(entities['products']))[:3]))
-        if entities['cves']:
-            cves = sorted(list(entities['cves']))
-            cve_links = [f"{cve} (https://nvd.nist.gov/vuln/detail/{cve})" for cve in cves]
-            summary_lines.append("CVEs: " + " | ".join(cve_links))
-        if entities['attackers']:
-            summary_lines.append("Threat actors: " + ", ".join(sorted(list(entities['attackers']))[:2]))
-        if entities['organizations']:
-            summary_lines.append("Organizations: " + ", ".join(sorted(list(entities['organizations']))[:3]))
-
-        final_summary = "\n".join([line for line in summary_lines if line]).strip()
-
-        summary_obj, created = Summary.objects.update_or_create(
-            type='trendy_word_summary',
-            keywords=keyword,
-            defaults={'summary_text': final_summary}
-        )
+    for title in unique_texts:
+        try:
+            extracted = extract_entities_and_threats(title)
+            entities['products'].update(extracted.get('product', []))
+            entities['organizations'].update(extracted.get('organizations', []))
+            entities['attackers'].update(extracted.get('attackers', []))
+            entities['cves'].update(extracted.get('cves', []))
+        except Exception:
+            continue
+
+    entities['cves'].update(extract_and_normalize_cves(summary_text))
+
+    # Build final summary
+    summary_lines = [summary_text, ""]
+    if entities['products']:
+        summary_lines.append("Products: " + ", ".join(sorted(list(entities['products']))[:3]))
+    if entities['cves']:
+        cves = sorted(list(entities['cves']))
+        cve_links = [f"{cve} (https://nvd.nist.gov/vuln/detail/{cve})" for cve in cves]
+        summary_lines.append("CVEs: " + " | ".join(cve_links))
+    if entities['attackers']:
+        summary_lines.append("Threat actors: " + ", ".join(sorted(list(entities['attackers']))[:2]))
+    if entities['organizations']:
+        summary_lines.append("Organizations: " + ", ".join(sorted(list(entities['organizations']))[:3]))
+
+    final_summary = "\n".join([line for line in summary_lines if line]).strip()
+
+    summary_obj, created = Summary.objects.update_or_create(
+        type='trendy_word_summary',
+        keywords=keyword,
+        defaults={'summary_text': final_summary}
+    )
+
+    logger.info(f"Summary {'created' if created else 'updated'} for '{keyword}' (id={summary_obj.id}, {len(summary_text.split())} words)")
+    return summary_obj
+
+
+def generate_keyword_summaries(posturls_by_keyword: dict):
+    """
+    Generate/update the summaries of several keywords, with one batched generation for all corpora.
+    Generation errors are raised so that queued jobs can be retried.
+
+    :param posturls_by_keyword: Dict mapping each keyword to its list of PostUrl objects.
+    :return: Dict mapping each keyword to its Summary (or None).
+    """
+    results = {keyword: None for keyword in posturls_by_keyword}
+    prepared = []
+    for keyword, posturls in posturls_by_keyword.items():
+        corpus = _prepare_keyword_corpus(keyword, posturls)
+        if corpus:
+            prepared.append((keyword, *corpus))
+    if not prepared:
+        return results
+
+    generated_texts = generate_texts([corpus for _, corpus, _ in prepared], max_input_tokens=450, min_new_tokens=40)
+
+    for (keyword, _, unique_texts), generated in zip(prepared, generated_texts):
+        try:
+            results[keyword] = _save_keyword_summary(keyword, generated, unique_texts)
+        except Exception as e:
+            logger.error(f"Summary generation failed for '{keyword}': {e}", exc_info=True)
+    return results
 
-        logger.info(f"Summary {'created' if created else 'updated'} for '{keyword}' (id={summary_obj.id}, {len(summary_text.split())} words)")
-        return summary_obj
 
+def _generate_summary_for_keyword_posts(keyword: str, posturls: list):
+    """Generate AI summary for a keyword using a provided PostUrl list."""
+    try:
+        return generate_keyword_summaries({keyword: posturls})[keyword]
     except Exception as e:
         logger.error(f"Summary generation failed for '{keyword}': {e}", exc_info=True)
         return None
@@ -1153,6 +1153,18 @@ def generate_keyword_summary_from_posturls(keyword: str, posturls: list):
     return _generate_summary_for_keyword_posts(keyword, posturls)
 
 
+def generate_trendy_word_summaries(trendy_word_ids):
+    """
+    Generate AI summaries for several TrendyWords at once, from their 15 latest posts.
+
+    :return: Dict mapping each TrendyWord name to its Summary (or None).
+    """
+    posturls_by_keyword = dict()
+    for trendy_word in TrendyWord.objects.filter(id__in=trendy_word_ids):
+        posturls_by_keyword[trendy_word.name] = list(trendy_word.posturls.all().order_by('-created_at')[:15])
+    return generate_keyword_summaries(posturls_by_keyword)
+
+
 def generate_trendy_word_summary(trendy_word_id):
     """Generate AI summary for a specific TrendyWord."""
     logger.info(f"Generating summary for TrendyWord ID: {trendy_word_id}")
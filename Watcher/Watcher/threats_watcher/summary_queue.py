@@ -0,0 +1,77 @@
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import SummaryJob
+
+logger = logging.getLogger('watcher.threats_watcher')
+
+# A job failing this many times is dropped
+MAX_ATTEMPTS = 3
+# A job locked for longer than this is considered abandoned by a crashed worker
+LOCK_TIMEOUT = timedelta(minutes=30)
+
+
+def enqueue_summaries(trendy_words):
+    """
+    Queue an AI summary for each TrendyWord. Keywords which already have a pending job are skipped.
+
+    :param trendy_words: Iterable of :model:`threats_watcher.TrendyWord`.
+    """
+    jobs = [SummaryJob(keyword=trendy_word.name, trendy_word_id=trendy_word.id) for trendy_word in trendy_words]
+    if jobs:
+        SummaryJob.objects.bulk_create(jobs, batch_size=500, ignore_conflicts=True)
+
+
+def claim_summary_jobs(batch_size):
+    """
+    Lock and return the oldest pending jobs, skipping the ones held by another worker.
+
+    :param batch_size: Maximum number of jobs to claim.
+    :return: List of :model:`threats_watcher.SummaryJob`.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            SummaryJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(locked_at__isnull=True) | Q(locked_at__lt=now - LOCK_TIMEOUT))
+            .order_by('created_at')[:batch_size]
+        )
+        SummaryJob.objects.filter(id__in=[job.id for job in jobs]).update(locked_at=now)
+    return jobs
+
+
+def drain_summary_queue(batch_size):
+    """
+    Generate the summaries of one batch of queued jobs, with one batched generation.
+    Done jobs are deleted. When the generation fails, the jobs are released for a retry until MAX_ATTEMPTS is
+    reached.
+
+    :param batch_size: Maximum number of jobs to process.
+    :return: Number of jobs processed.
+    """
+    from .summary_manager import generate_trendy_word_summaries
+
+    jobs = claim_summary_jobs(batch_size)
+    if not jobs:
+        return 0
+    logger.info(f"Generating summaries for {len(jobs)} queued words: {[job.keyword for job in jobs]}")
+
+    try:
+        generate_trendy_word_summaries([job.trendy_word_id for job in jobs])
+        failed = []
+    except Exception as e:
+        logger.error(f"Failed to generate summaries for {[job.keyword for job in jobs]}: {e}")
+        failed = jobs
+
+    for job in failed:
+        job.attempts += 1
+        job.locked_at = None
+    dropped = [job.id for job in failed if job.attempts >= MAX_ATTEMPTS]
+    SummaryJob.objects.bulk_update([job for job in failed if job.id not in dropped], ['attempts', 'locked_at'])
+    SummaryJob.objects.filter(id__in=[job.id for job in jobs if job not in failed] + dropped).delete()
+    if dropped:
+        logger.warning(f"{len(dropped)} summary jobs dropped after {MAX_ATTEMPTS} attempts.")
+    return len(jobs)
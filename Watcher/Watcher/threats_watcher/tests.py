@@ -1,5 +1,6 @@
 import time
 import uuid
+import feedparser
 from unittest.mock import patch, MagicMock
 from django.test import TestCase, TransactionTestCase
 from django.contrib.auth.models import User
@@ -8,7 +9,10 @@ from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from knox.models import AuthToken
-from threats_watcher.models import Source, PostUrl, TrendyWord, BannedWord, Subscriber, Summary, MonitoredKeyword
+from threats_watcher.models import (
+    Source, PostUrl, TrendyWord, BannedWord, Subscriber, Summary, MonitoredKeyword, TitleEntities, SummaryJob,
+    ArticleText, ProcessedPost, PostWord
+)
 from threats_watcher.serializers import TrendyWordSerializer, BannedWordSerializer, SummarySerializer
 
 
@@ -286,6 +290,28 @@ class ReliabilityScoreTest(TestCase):
         updated_word = TrendyWord.objects.get(pk=self.word.pk)
         assert updated_word.score == 100  # confident=1 gives 100
 
+    @patch('threats_watcher.core.get_pre_redirect_domain')
+    def test_reliability_score_resolves_each_url_once(self, mock_pre_redirect):
+        mock_pre_redirect.return_value = "trusted-source.com"
+        from threats_watcher.core import reliability_score
+        reliability_score()
+        reliability_score()
+        self.assertEqual(mock_pre_redirect.call_count, 2)
+        self.post1.refresh_from_db()
+        self.assertEqual(self.post1.pre_redirect_domain, "trusted-source.com")
+
+    @patch('threats_watcher.core.get_pre_redirect_domain')
+    def test_reliability_score_resolution_capped(self, mock_pre_redirect):
+        mock_pre_redirect.return_value = "trusted-source.com"
+        from threats_watcher.core import reliability_score
+        with self.settings(THREATS_WATCHER_PRE_REDIRECT_BATCH=1):
+            reliability_score()
+            self.assertEqual(mock_pre_redirect.call_count, 1)
+            self.assertEqual(PostUrl.objects.filter(pre_redirect_domain="").count(), 1)
+            reliability_score()
+        self.assertEqual(mock_pre_redirect.call_count, 2)
+        self.assertFalse(PostUrl.objects.filter(pre_redirect_domain="").exists())
+
 class TrendingAlgorithmTest(TestCase):
     """Test trending words algorithm and occurrence filter."""
     def setUp(self):
@@ -309,6 +335,100 @@ class TrendingAlgorithmTest(TestCase):
         word = TrendyWord.objects.get(name="malware")
         assert word.posturls.count() > 0
 
+    def test_persist_top_words_bulk(self):
+        """New words are created with their posts, existing words only count posts not linked yet."""
+        import threats_watcher.core
+        setattr(threats_watcher.core, 'wordurl', {
+            "malware_url": "https://example.com/1, https://example.com/2",
+            "ransom_url": "https://example.com/2, https://example.com/2",
+        })
+        setattr(threats_watcher.core, 'posts_published', self.posts_published)
+        setattr(threats_watcher.core, 'posts_five_letters', {"malware": 2, "ransom": 2, "rare": 1})
+
+        from threats_watcher.core import persist_top_words
+        existing = TrendyWord.objects.create(name="malware", occurrences=5)
+        existing.posturls.add(PostUrl.objects.create(url="https://example.com/1"))
+        persist_top_words(2)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.occurrences, 6)
+        self.assertEqual(existing.posturls.count(), 2)
+        self.assertEqual(TrendyWord.objects.get(name="ransom").posturls.count(), 1)
+        self.assertFalse(TrendyWord.objects.filter(name="rare").exists())
+        self.assertEqual(PostUrl.objects.filter(url="https://example.com/2").count(), 1)
+
+
+class SummaryQueueTest(TestCase):
+    """Test the AI summary job queue."""
+
+    def test_signal_enqueues_once_per_keyword(self):
+        TrendyWord.objects.create(name="botnet", occurrences=3)
+        TrendyWord.objects.create(name="botnet", occurrences=4)
+        TrendyWord.objects.create(name="rare", occurrences=1)
+        self.assertEqual(list(SummaryJob.objects.values_list('keyword', flat=True)), ["botnet"])
+
+    @patch('threats_watcher.summary_manager.generate_trendy_word_summaries')
+    def test_drain_summary_queue(self, mock_generate):
+        from threats_watcher.summary_queue import drain_summary_queue, MAX_ATTEMPTS
+        TrendyWord.objects.create(name="botnet", occurrences=3)
+        self.assertEqual(drain_summary_queue(10), 1)
+        self.assertFalse(SummaryJob.objects.exists())
+
+        TrendyWord.objects.create(name="wiper", occurrences=3)
+        mock_generate.side_effect = RuntimeError("Summarizer model unavailable")
+        drain_summary_queue(10)
+        job = SummaryJob.objects.get()
+        self.assertEqual((job.keyword, job.attempts, job.locked_at), ("wiper", 1, None))
+
+        for _ in range(MAX_ATTEMPTS - 1):
+            drain_summary_queue(10)
+        self.assertFalse(SummaryJob.objects.exists())
+
+    @patch('apscheduler.schedulers.background.BackgroundScheduler.start')
+    @patch('threats_watcher.management.commands.run_summary_worker.drain_summary_queue', return_value=0)
+    def test_worker_does_not_start_schedulers(self, mock_drain, mock_scheduler_start):
+        from django.core.management import call_command
+        from threats_watcher.management.commands.run_summary_worker import Command
+        with patch.object(Command, 'check') as mock_check:
+            call_command('run_summary_worker', '--once', skip_checks=False, stdout=MagicMock())
+        mock_drain.assert_called_once()
+        mock_check.assert_not_called()
+        mock_scheduler_start.assert_not_called()
+
+
+class ArticleTextCacheTest(TestCase):
+    """Test the extracted article text cache."""
+    HTML = '<html><head><meta name="description" content="{}"></head><body></body></html>'
+
+    def setUp(self):
+        self.post = PostUrl.objects.create(url="https://news.example.com/article")
+
+    @patch('threats_watcher.summary_manager.fetch_article_html')
+    def test_text_cached_until_ttl(self, mock_fetch):
+        from threats_watcher.summary_manager import get_article_texts
+        mock_fetch.return_value = self.HTML.format("A critical vulnerability is exploited in the wild by attackers.")
+        first = get_article_texts([self.post])
+        second = get_article_texts([self.post])
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertIn("critical vulnerability", first[self.post.id])
+        self.assertEqual(first, second)
+
+    @patch('threats_watcher.summary_manager.extract_article_text', return_value="Extracted text")
+    @patch('threats_watcher.summary_manager.fetch_article_html')
+    def test_expired_entry_reextracted_only_on_change(self, mock_fetch, mock_extract):
+        from threats_watcher.summary_manager import get_article_texts
+        mock_fetch.return_value = self.HTML.format("unchanged")
+        get_article_texts([self.post])
+        ArticleText.objects.update(fetched_at=timezone.now() - timezone.timedelta(days=2))
+        get_article_texts([self.post])
+        self.assertEqual(mock_fetch.call_count, 2)
+        self.assertEqual(mock_extract.call_count, 1)
+
+        ArticleText.objects.update(fetched_at=timezone.now() - timezone.timedelta(days=2))
+        mock_fetch.return_value = None
+        self.assertEqual(get_article_texts([self.post])[self.post.id], "Extracted text")
+
+
 class SourceNewFieldsTest(TestCase):
     """Test new fields added to the Source model: last_status_code and last_checked."""
 
@@ -503,4 +623,227 @@ class MonitoredKeywordAPITest(APITestCase):
         mk.update_level(); mk.save()
         response = self.client.get(f'/api/threats_watcher/monitored-keywords/{mk.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('level_display', response.data)
\ No newline at end of file
+        self.assertIn('level_display', response.data)
+
+
+class FeedFetchTest(TestCase):
+    """Test the concurrent feed fetch stage."""
+
+    RSS = (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+        '<item><title>Fetched title</title><link>https://ok-feed.com/post1</link>'
+        '<pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate></item>'
+        '</channel></rss>'
+    )
+
+    def setUp(self):
+        import threats_watcher.core as core
+        core._parsed_feeds.clear()
+        self.ok_source = Source.objects.create(url="https://ok-feed.com/feed.xml")
+        self.down_source = Source.objects.create(url="https://down-feed.com/feed.xml")
+
+    @staticmethod
+    def rss(title, link):
+        from email.utils import format_datetime
+        return (
+            '<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+            f'<item><title>{title}</title><link>{link}</link>'
+            f'<pubDate>{format_datetime(timezone.now().astimezone(), usegmt=False)}</pubDate></item>'
+            '</channel></rss>'
+        )
+
+    @patch('threats_watcher.core.requests.get')
+    def test_fetch_updates_statuses_and_posts(self, mock_get):
+        import requests
+        import threats_watcher.core as core
+
+        def fake_get(url, **kwargs):
+            if 'down-feed' in url:
+                raise requests.exceptions.ConnectionError()
+            return MagicMock(status_code=200, text=self.RSS, headers={'ETag': '"v1"'})
+        mock_get.side_effect = fake_get
+
+        core.load_feeds()
+        core.fetch_last_posts(5)
+
+        self.assertEqual(core.posts.get("Fetched title"), "https://ok-feed.com/post1")
+        self.ok_source.refresh_from_db()
+        self.down_source.refresh_from_db()
+        self.assertEqual(self.ok_source.last_status_code, 200)
+        self.assertEqual(self.down_source.last_status_code, 0)
+        self.assertIsNotNone(self.down_source.last_checked)
+        self.assertEqual(self.ok_source.etag, '"v1"')
+
+    @patch('threats_watcher.core.feedparser.parse', wraps=feedparser.parse)
+    @patch('threats_watcher.core.requests.get')
+    def test_not_modified_feed_is_not_parsed(self, mock_get, mock_parse):
+        import threats_watcher.core as core
+        self.down_source.delete()
+
+        # Not parsed yet by this process: fetched without validators
+        Source.objects.filter(pk=self.ok_source.pk).update(etag='"v0"')
+        mock_get.return_value = MagicMock(status_code=200, text=self.RSS, headers={'ETag': '"v1"'})
+        core.load_feeds()
+        core.fetch_last_posts(5)
+        self.assertNotIn('If-None-Match', mock_get.call_args.kwargs['headers'])
+
+        mock_get.return_value = MagicMock(status_code=304, text='', headers={})
+        core.load_feeds()
+        core.fetch_last_posts(5)
+
+        sent_headers = mock_get.call_args.kwargs['headers']
+        self.assertEqual(sent_headers.get('If-None-Match'), '"v1"')
+        self.assertEqual(mock_parse.call_count, 1)
+        # The posts of the unchanged feed are still in the window
+        self.assertEqual(core.posts.get("Fetched title"), "https://ok-feed.com/post1")
+        self.ok_source.refresh_from_db()
+        self.assertEqual(self.ok_source.last_status_code, 304)
+        self.assertEqual(self.ok_source.etag, '"v1"')
+
+    @patch('threats_watcher.core.extract_entities_batch')
+    @patch('threats_watcher.core.requests.get')
+    def test_not_modified_feed_counted(self, mock_get, mock_batch):
+        import threats_watcher.core as core
+        self.down_source.delete()
+        Source.objects.create(url="https://stable-feed.com/feed.xml")
+        entities = {"Fortinet flaw": "Fortinet", "Ivanti bug": "Ivanti"}
+        mock_batch.side_effect = lambda titles: {
+            title: {"persons": [], "organizations": [entities[title]], "locations": [], "product": [], "cves": [],
+                    "attackers": []}
+            for title in titles
+        }
+
+        def fake_get(url, headers, **kwargs):
+            if 'stable-feed' in url:
+                if headers.get('If-None-Match') == '"s1"':
+                    return MagicMock(status_code=304, text='', headers={})
+                return MagicMock(status_code=200, text=self.rss("Ivanti bug", "https://stable-feed.com/1"),
+                                 headers={'ETag': '"s1"'})
+            return MagicMock(status_code=200, text=self.rss("Fortinet flaw", "https://ok-feed.com/1"), headers={})
+        mock_get.side_effect = fake_get
+
+        for _ in range(2):
+            core.load_feeds()
+            core.fetch_last_posts(5)
+            core.tokenize_count_urls()
+            core.record_processed_posts()
+            self.assertEqual(core.posts_words, {"Fortinet": 1, "Ivanti": 1})
+        self.assertEqual(Source.objects.get(url="https://stable-feed.com/feed.xml").last_status_code, 304)
+
+
+class NerBatchTest(TestCase):
+    """Test batched NER extraction and its title cache."""
+
+    @patch('threats_watcher.core.get_ner_pipeline')
+    def test_batch_runs_model_once_and_caches(self, mock_get_ner_pipeline):
+        ner_pipe = MagicMock(side_effect=lambda titles, **kwargs: [
+            [{"entity_group": "ORG", "word": "Microsoft"}] for _ in titles
+        ])
+        mock_get_ner_pipeline.return_value = ner_pipe
+        from threats_watcher.core import extract_entities_batch
+
+        titles = ["Microsoft patches CVE-2024-1234", "Microsoft warns about APT28"]
+        results = extract_entities_batch(titles)
+        self.assertEqual(ner_pipe.call_count, 1)
+        self.assertIn("Microsoft", results[titles[0]]["organizations"])
+        self.assertIn("CVE-2024-1234", results[titles[0]]["cves"])
+        self.assertIn("APT28", results[titles[1]]["attackers"])
+        self.assertEqual(TitleEntities.objects.count(), 2)
+
+        # Second run is served from the cache
+        results = extract_entities_batch(titles)
+        self.assertEqual(ner_pipe.call_count, 1)
+        self.assertIn("Microsoft", results[titles[1]]["organizations"])
+
+
+class IncrementalTokenizeTest(TestCase):
+    """Test that tokenize_count_urls only extracts unseen posts and counts the current feed window as before."""
+
+    @staticmethod
+    def _entities(*orgs):
+        return {"persons": [], "organizations": list(orgs), "locations": [], "product": [], "cves": [],
+                "attackers": []}
+
+    @staticmethod
+    def _baseline_counts(posts, entities):
+        """Counts of the tokenize_count_urls implementation which extracted every post of the window."""
+        posts_words, urls = {}, {}
+        for title, url in posts.items():
+            for item in entities[title]["organizations"]:
+                posts_words[item] = posts_words.get(item, 0) + 1
+                urls.setdefault(item, []).append(url)
+        return posts_words, urls
+
+    def _run(self, posts):
+        import threats_watcher.core as core
+        core.posts = dict(posts)
+        core.posts_published = {url: timezone.now() for url in posts.values()}
+        core.tokenize_count_urls()
+        core.record_processed_posts()
+        return core.posts_words, {word[:-len("_url")]: urls.split(', ') for word, urls in core.wordurl.items()}
+
+    @patch('threats_watcher.core.extract_entities_batch')
+    def test_only_new_posts_are_extracted(self, mock_batch):
+        entities = {
+            "Fortinet flaw": self._entities("Fortinet", "Fortinet", "Ivanti"),
+            "Fortinet again": self._entities("Fortinet"),
+            "Long name": self._entities("x" * 300, "Ivanti"),
+        }
+        mock_batch.side_effect = lambda titles: {title: entities[title] for title in titles}
+        first = {"Fortinet flaw": "https://a.com/1", "Long name": "https://c.com/3"}
+        second = {"Fortinet again": "https://b.com/2", "Long name": "https://c.com/3"}
+
+        self.assertEqual(self._run(first), self._baseline_counts(first, entities))
+        self.assertEqual(list(mock_batch.call_args.args[0]), ["Fortinet flaw", "Long name"])
+
+        # Same window again: only the post with a word too long to be stored is extracted again
+        self.assertEqual(self._run(first), self._baseline_counts(first, entities))
+        self.assertEqual(list(mock_batch.call_args.args[0]), ["Long name"])
+
+        # A post which left the feed is no longer counted
+        self.assertEqual(self._run(second), self._baseline_counts(second, entities))
+        self.assertEqual(list(mock_batch.call_args.args[0]), ["Fortinet again", "Long name"])
+        self.assertEqual(mock_batch.call_count, 3)
+
+    @patch('threats_watcher.core.send_threats_watcher_notifications')
+    @patch('threats_watcher.core.reliability_score')
+    @patch('threats_watcher.core.focus_on_top', side_effect=RuntimeError)
+    @patch('threats_watcher.core.fetch_last_posts')
+    @patch('threats_watcher.core.load_feeds')
+    @patch('threats_watcher.core.extract_entities_batch')
+    def test_posts_recorded_after_focus_on_top(self, mock_batch, *mocks):
+        import threats_watcher.core as core
+        mock_batch.side_effect = lambda titles: {title: self._entities("Fortinet") for title in titles}
+        core.posts = {"Fortinet flaw": "https://a.com/1"}
+        core.posts_published = {"https://a.com/1": timezone.now()}
+
+        with self.assertRaises(RuntimeError):
+            core.main_watch()
+        self.assertFalse(ProcessedPost.objects.exists())
+
+        core.record_processed_posts()
+        self.assertEqual(list(PostWord.objects.values_list('word', 'occurrences')), [("Fortinet", 1)])
+
+
+class WordFilterTest(TestCase):
+    """Test the precompiled filter used by remove_banned_words."""
+
+    def test_clean(self):
+        from threats_watcher.word_filter import get_word_filter
+        word_filter = get_word_filter()
+        self.assertEqual(word_filter.clean("the"), "")
+        self.assertEqual(word_filter.clean("les"), "")
+        self.assertEqual(word_filter.clean("https"), "")
+        self.assertEqual(word_filter.clean("1.2.3"), "")
+        self.assertEqual(word_filter.clean("example.com"), "")
+        self.assertEqual(word_filter.clean("#hashtag"), "")
+        self.assertEqual(word_filter.clean("Fortinet!!"), "Fortinet")
+        self.assertEqual(word_filter.clean("O'Reilly"), "OReilly")
+
+    def test_invalidated_on_banned_word_change(self):
+        from threats_watcher.word_filter import get_word_filter
+        self.assertEqual(get_word_filter().clean("Microsoft"), "Microsoft")
+        banned = BannedWord.objects.create(name="Microsoft")
+        self.assertEqual(get_word_filter().clean("Microsoft"), "")
+        banned.delete()
+        self.assertEqual(get_word_filter().clean("Microsoft"), "Microsoft")
@@ -0,0 +1,118 @@
+import logging
+import os
+import re
+import threading
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import BannedWord
+
+logger = logging.getLogger('watcher.threats_watcher')
+
+DATAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datas')
+
+# Words ending with one of these extensions are domain names
+DOMAIN_EXTENSIONS = frozenset((
+    "com", "org", "net", "edu", "gov", "mil", "biz", "info", "name", "pro", "coop", "museum", "aero", "int", "jobs",
+    "mobi", "tel", "travel", "asia", "cat", "eu",
+    # Domaines de premier niveau géographiques (ccTLD)
+    "fr", "uk", "de", "jp", "cn", "it", "us", "es", "ca", "au", "nl", "ru", "br", "pl", "in", "be", "ch", "se", "mx",
+    "at", "dk", "no", "fi", "ie", "nz", "sg", "hk", "my", "za", "ar", "tw", "kr", "vn", "tr", "ua", "gr", "pt", "cz",
+    "hu", "cl", "ro", "id", "il", "co", "ae", "th", "sk", "bg", "ph", "hr", "lt", "si", "lv", "ee", "rs", "is", "ir",
+    "sa", "pe", "ma", "by", "gt", "do", "ng", "cr", "ve", "ec", "py", "sv", "hn", "pa", "bo", "kz", "lu", "uy", "dz",
+    "uz", "ke", "np", "kh", "zm", "ug", "cy", "mm", "et", "ni", "al", "kg", "bd", "tn", "la", "gh", "iq", "bj", "gm",
+    "tg", "lk", "jo", "zw", "sn", "km", "mw", "md", "mr", "bf", "bi", "sc", "er", "sl", "cf", "ss", "td", "cg", "gq",
+    "dj", "rw", "so", "ne", "yt", "re", "pm", "wf", "tf", "gs", "ai", "aw", "bb", "bm", "vg", "ky", "fk", "fo", "gl",
+    "gp", "gg", "gi", "je", "im", "mq", "ms", "nc", "pf", "pn", "sh", "sb", "tc", "tk", "vi", "um", "cx", "cc", "ac",
+    "ad", "ax", "mc", "me", "sm", "va", "ps",
+))
+
+# Trailing special characters
+TRAILING_SPECIAL_CHARACTERS = re.compile(r"[^a-zA-Z0-9]+$")
+# Words which are only a version number
+VERSION_NUMBER = re.compile(r"(\d+\.)?(\d+\.)?(\*|\d+)?(\.\d+)?(\.\d+)")
+# Version numbers in the format x.x.x or vx.x.x inside a word
+EMBEDDED_VERSION_NUMBER = re.compile(r"\b\d+(?:\.\d+){2,}\b|v\d+(?:\.\d+){2,}")
+
+_word_filter = None
+_word_filter_lock = threading.Lock()
+
+
+def load_stopwords(filename):
+    """
+    Load a stopword list from **threats_watcher/datas**.
+
+    :param filename: Name of the file, one word per line.
+    :return: Frozenset of words.
+    """
+    with open(os.path.join(DATAS_DIR, filename), 'r', encoding='utf-8') as stopwords_file:
+        return frozenset(stopwords_file.read().splitlines())
+
+
+class WordFilter:
+    """
+    Cleans the words extracted from posts: BannedWord, english + french common words, version numbers, domain
+    names and special characters. Every lookup is a set membership test and every pattern is compiled once.
+    """
+
+    def __init__(self, banned_words, stopwords):
+        """
+        :param banned_words: Iterable of :model:`threats_watcher.BannedWord` names.
+        :param stopwords: Iterable of common words to drop.
+        """
+        self.excluded = frozenset(banned_words) | frozenset(stopwords) | {"https"}
+
+    def clean(self, word):
+        """
+        Return the cleaned form of word, or an empty string if the word must be dropped.
+
+        :param word: Word extracted from a post title.
+        """
+        if word in self.excluded:
+            return ""
+
+        word = TRAILING_SPECIAL_CHARACTERS.sub('', word)
+        if VERSION_NUMBER.fullmatch(word):
+            return ""
+        # Remove ' and / (sometimes regular expression don't catch these characters)
+        word = word.replace("'", "").replace("/", "")
+
+        # Remove domain name
+        if '.' in word and word.rsplit('.', 1)[1] in DOMAIN_EXTENSIONS:
+            return ""
+
+        # Remove special characters
+        word = word.encode("latin1", errors="ignore").decode("utf-8", errors="ignore")
+        word = EMBEDDED_VERSION_NUMBER.sub('', word)
+
+        if word.startswith("#"):
+            return ""
+        return word
+
+
+def get_word_filter():
+    """
+    Return the process-wide WordFilter, building it on first use or after a BannedWord change.
+    """
+    global _word_filter
+    word_filter = _word_filter
+    if word_filter is None:
+        with _word_filter_lock:
+            if _word_filter is None:
+                _word_filter = WordFilter(
+                    BannedWord.objects.values_list('name', flat=True),
+                    load_stopwords('english.txt') | load_stopwords('french.txt'),
+                )
+                logger.debug(f"Word filter built with {len(_word_filter.excluded)} excluded words")
+            word_filter = _word_filter
+    return word_filter
+
+
+@receiver(post_save, sender=BannedWord)
+@receiver(post_delete, sender=BannedWord)
+def invalidate_word_filter(sender, **kwargs):
+    """
+    Drop the cached WordFilter when a :model:`threats_watcher.BannedWord` is created, updated or deleted.
+    """
+    global _word_filter
+    _word_filter = None
@@ -86,6 +86,33 @@ WORDS_OCCURRENCE = 5
 # Example for a continuous watch : PostsDepth = 3 et WordsOccurrence = 8
 # Example for a Monday morning watch : PostsDepth = 50 et WordsOccurrence = 0
 
+# Feed Fetcher Configuration
+# Number of feeds downloaded in parallel, and at most per host
+THREATS_WATCHER_FETCH_WORKERS = int(os.environ.get('THREATS_WATCHER_FETCH_WORKERS', 16))
+THREATS_WATCHER_FETCH_PER_HOST = int(os.environ.get('THREATS_WATCHER_FETCH_PER_HOST', 2))
+# Timeout of a single feed request, and overall budget (seconds) of the fetch stage
+THREATS_WATCHER_FETCH_TIMEOUT = int(os.environ.get('THREATS_WATCHER_FETCH_TIMEOUT', 10))
+THREATS_WATCHER_FETCH_DEADLINE = int(os.environ.get('THREATS_WATCHER_FETCH_DEADLINE', 300))
+# Maximum number of post urls whose pre-redirect domain is resolved per run, the backlog is resolved over the next runs
+THREATS_WATCHER_PRE_REDIRECT_BATCH = int(os.environ.get('THREATS_WATCHER_PRE_REDIRECT_BATCH', 200))
+
+# NER Configuration
+# Number of titles per forward pass, and torch CPU threads (0 keeps the torch default)
+THREATS_WATCHER_NER_BATCH_SIZE = int(os.environ.get('THREATS_WATCHER_NER_BATCH_SIZE', 32))
+THREATS_WATCHER_NER_THREADS = int(os.environ.get('THREATS_WATCHER_NER_THREADS', 0))
+
+# FLAN-T5 generation: prompts per generate() call, beam search width and maximum summary length in tokens
+THREATS_WATCHER_GENERATION_BATCH_SIZE = int(os.environ.get('THREATS_WATCHER_GENERATION_BATCH_SIZE', 8))
+THREATS_WATCHER_GENERATION_NUM_BEAMS = int(os.environ.get('THREATS_WATCHER_GENERATION_NUM_BEAMS', 5))
+THREATS_WATCHER_GENERATION_MAX_NEW_TOKENS = int(os.environ.get('THREATS_WATCHER_GENERATION_MAX_NEW_TOKENS', 150))
+
+# Hours during which the text extracted from an article is reused by the AI summaries
+THREATS_WATCHER_ARTICLE_TEXT_TTL = int(os.environ.get('THREATS_WATCHER_ARTICLE_TEXT_TTL', 24))
+
+# AI summary queue, drained by the run_summary_worker command
+THREATS_WATCHER_SUMMARY_BATCH_SIZE = int(os.environ.get('THREATS_WATCHER_SUMMARY_BATCH_SIZE', 8))
+THREATS_WATCHER_SUMMARY_POLL_INTERVAL = int(os.environ.get('THREATS_WATCHER_SUMMARY_POLL_INTERVAL', 30))
+
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('SMTP_SERVER', '') 
@@ -122,9 +149,39 @@ HTTPS_PROXY = os.environ.get('HTTPS_PROXY', '')
 
 # CertStream URL
 CERT_STREAM_URL = os.environ.get('CERT_STREAM_URL', 'wss://certstream.calidog.io')
+# CertStream frames are queued between the websocket and a pool of matcher workers.
+# When the queue is full, DNS_FINDER_CERTSTREAM_OVERFLOW is one of: drop_oldest, drop_newest, block
+DNS_FINDER_CERTSTREAM_WORKERS = int(os.environ.get('DNS_FINDER_CERTSTREAM_WORKERS', 4))
+DNS_FINDER_CERTSTREAM_QUEUE_SIZE = int(os.environ.get('DNS_FINDER_CERTSTREAM_QUEUE_SIZE', 10000))
+DNS_FINDER_CERTSTREAM_OVERFLOW = os.environ.get('DNS_FINDER_CERTSTREAM_OVERFLOW', 'drop_oldest')
+# Reconnection backoff of the CertStream listener (seconds), doubled after each failed connection up to the maximum
+DNS_FINDER_CERTSTREAM_RECONNECT_DELAY = int(os.environ.get('DNS_FINDER_CERTSTREAM_RECONNECT_DELAY', 5))
+DNS_FINDER_CERTSTREAM_MAX_RECONNECT_DELAY = int(os.environ.get('DNS_FINDER_CERTSTREAM_MAX_RECONNECT_DELAY', 300))
+# The listener is restarted by the health check when no frame was received for this many seconds
+DNS_FINDER_CERTSTREAM_STALE_TIMEOUT = int(os.environ.get('DNS_FINDER_CERTSTREAM_STALE_TIMEOUT', 600))
+# Number of monitored domains twisted in parallel, DNS resolver threads per domain, and timeout (seconds) of the
+# dnstwist run of one domain
+DNS_FINDER_DNSTWIST_CONCURRENCY = int(os.environ.get('DNS_FINDER_DNSTWIST_CONCURRENCY', 4))
+DNS_FINDER_DNSTWIST_THREADS = int(os.environ.get('DNS_FINDER_DNSTWIST_THREADS', 16))
+DNS_FINDER_DNSTWIST_TIMEOUT = int(os.environ.get('DNS_FINDER_DNSTWIST_TIMEOUT', 1800))
+# Rescan tiers of the dnstwist permutations: registered for less than DNS_FINDER_PERMUTATION_HOT_DAYS days are
+# resolved on every run, the other registered ones and the unregistered ones every N hours
+DNS_FINDER_PERMUTATION_HOT_DAYS = int(os.environ.get('DNS_FINDER_PERMUTATION_HOT_DAYS', 7))
+DNS_FINDER_PERMUTATION_REGISTERED_RESCAN = int(os.environ.get('DNS_FINDER_PERMUTATION_REGISTERED_RESCAN', 24))
+DNS_FINDER_PERMUTATION_UNREGISTERED_RESCAN = int(os.environ.get('DNS_FINDER_PERMUTATION_UNREGISTERED_RESCAN', 168))
 
 # Link to SearxNG Server API
 DATA_LEAK_SEARX_URL = os.environ.get('DATA_LEAK_SEARX_URL', 'http://searxng:8080/')
+# Number of keywords searched in parallel, timeout (seconds) of a SearxNG read, and maximum time (seconds) spent on
+# the search of one keyword
+DATA_LEAK_SEARX_WORKERS = int(os.environ.get('DATA_LEAK_SEARX_WORKERS', 4))
+DATA_LEAK_SEARX_TIMEOUT = int(os.environ.get('DATA_LEAK_SEARX_TIMEOUT', 20))
+DATA_LEAK_SEARX_DEADLINE = int(os.environ.get('DATA_LEAK_SEARX_DEADLINE', 60))
+# Number of pastes downloaded in parallel, maximum requests per second to a same host, and timeout (seconds) of a
+# paste download
+DATA_LEAK_PASTE_WORKERS = int(os.environ.get('DATA_LEAK_PASTE_WORKERS', 8))
+DATA_LEAK_PASTE_RATE = float(os.environ.get('DATA_LEAK_PASTE_RATE', 4))
+DATA_LEAK_PASTE_TIMEOUT = int(os.environ.get('DATA_LEAK_PASTE_TIMEOUT', 15))
 
 # Cyber Watch - External Threat Intelligence APIs
 CYBER_WATCH_CVE_API_URL = os.environ.get('CYBER_WATCH_CVE_API_URL', 'https://cve.circl.lu/api/last')